@@ -1,5 +1,9 @@
 from .video_generator.nodes import (NODE_CLASS_MAPPINGS,
                                     NODE_DISPLAY_NAME_MAPPINGS)
+from .video_generator.preload import preload_from_env
+
+# Start loading FASTVIDEO_PRELOAD_MODELS in the background right away
+preload_from_env()
 
 WEB_DIRECTORY = "./web"
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS', 'WEB_DIRECTORY']
\ No newline at end of file
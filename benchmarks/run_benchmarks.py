@@ -0,0 +1,397 @@
+"""
+Benchmarks for the node layer against the stub FastVideo backend.
+
+Measures the plugin's own overheads (config build, generator cache hits,
+model hot-swaps, job round trips, GPU partitioning, stage pipelining,
+cancellation latency, image decoding and IS_CHANGED) so regressions in the
+Python glue show up without a GPU.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stub_backend  # noqa: E402
+
+# The extended stub by default, so the backend-dependent fast paths are
+# measured; FASTVIDEO_BENCH_BACKEND=released times the released API instead
+SCRATCH = stub_backend.install(extended=os.environ.get(
+    "FASTVIDEO_BENCH_BACKEND", "extended") != "released")
+
+import fastvideo  # noqa: E402
+import folder_paths  # noqa: E402
+from PIL import Image  # noqa: E402
+from video_generator import load_image  # noqa: E402
+from video_generator import \
+    video_generator as video_generator_module  # noqa: E402
+from video_generator.generator_pool import (  # noqa: E402
+    GeneratorPool, get_generator_pool)
+from video_generator.job_queue import (  # noqa: E402
+    JobQueue, get_job_queue, parse_partition_policy)
+from video_generator.pipelining import get_stage_pipeline  # noqa: E402
+from video_generator.video_generator import (  # noqa: E402
+    OFFLOAD_ENCODE, PIPELINE_ENABLED, GenerationCancelledException,
+    VideoGenerator, wait_for_job)
+
+# A local model directory so the pipeline config cache can key on its files
+MODEL_PATH = os.path.join(SCRATCH, "model")
+os.makedirs(MODEL_PATH, exist_ok=True)
+with open(os.path.join(MODEL_PATH, "model_index.json"), "w") as f:
+    json.dump({"_class_name": "StubPipeline"}, f)
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "median": statistics.median(ordered),
+        "p90": ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def _node_kwargs(prompt: str = "a stub video", **overrides: Any) -> dict:
+    kwargs = {
+        "prompt": prompt,
+        "output_path": os.path.join(SCRATCH, "outputs"),
+        "num_gpus": 1,
+        "model_path": MODEL_PATH,
+        "embedded_cfg_scale": 6.0,
+        "sp_size": 1,
+        "tp_size": 1,
+        "vae_precision": "fp16",
+        "vae_tiling": True,
+        "vae_sp": False,
+        "text_encoder_precision": "fp16",
+        "precision": "bf16",
+        "inference_args": {
+            "num_inference_steps": 6,
+            "num_frames": 9,
+            "seed": 1024
+        },
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+def bench_config_build(repeat: int) -> dict[str, float]:
+    node = VideoGenerator()
+    node.prepare_request(**_node_kwargs())
+    return _time(lambda: node.prepare_request(**_node_kwargs()), repeat)
+
+
+def bench_generator_cache_hit(repeat: int) -> dict[str, float]:
+    node = VideoGenerator()
+    request = node.prepare_request(**_node_kwargs())
+    pool = get_generator_pool()
+    factory = fastvideo.VideoGenerator.from_pretrained
+
+    def use() -> None:
+        pool.release(*pool.acquire(request.model_path,
+                                   request.generation_args,
+                                   request.pipeline_config, factory))
+
+    use()
+    return _time(use, repeat)
+
+
+def bench_hot_swap(repeat: int) -> dict[str, Any]:
+    """Alternating between two models: full reloads vs parked restores."""
+    factory = fastvideo.VideoGenerator.from_pretrained
+    models = [MODEL_PATH, os.path.join(SCRATCH, "model_b")]
+    results = {}
+    for label, park_budget in (("reload", 0), ("parked", 1 << 40)):
+        pool = GeneratorPool(capacity=1, park_budget=park_budget)
+
+        def swap() -> None:
+            for model in models:
+                pool.release(*pool.acquire(model, {}, None, factory))
+
+        swap()
+        results[label] = _time(swap, repeat)
+        pool.clear()
+    return results
+
+
+def bench_job_round_trip(repeat: int) -> dict[str, Any]:
+    """Submit-to-result latency of the queue and of a full node call."""
+    node = VideoGenerator()
+    queue = get_job_queue()
+    return {
+        "queue":
+        _time(lambda: queue.submit(lambda job: None).wait(), repeat),
+        "launch_inference":
+        _time(
+            lambda: node.launch_inference(**_node_kwargs(
+                prompt=f"round trip {time.perf_counter_ns()}")), repeat),
+    }
+
+
+def bench_partitions(repeat: int) -> dict[str, Any]:
+    """Wall time of 16 small jobs on 8 fake GPUs for several partitionings."""
+    factory = fastvideo.VideoGenerator.from_pretrained
+    results = {}
+    for policy in ("", "4x2", "8x1"):
+        queue = JobQueue(partitions=parse_partition_policy(policy, 8))
+        pool = GeneratorPool(capacity=1)
+
+        def run(job: Any) -> None:
+            devices = job.partition.devices
+            key, generator = pool.acquire(MODEL_PATH,
+                                          {"num_gpus": len(devices) or 8},
+                                          None,
+                                          factory,
+                                          devices=devices)
+            try:
+                generator.generate_video("partition",
+                                         num_inference_steps=20,
+                                         num_frames=1,
+                                         save_video=False)
+            finally:
+                pool.release(key, generator)
+
+        def batch() -> None:
+            jobs = [queue.submit(run, num_gpus=1) for _ in range(16)]
+            for job in jobs:
+                job.wait()
+
+        batch()  # load one generator per partition
+        results[policy or "1x8"] = _time(batch, max(1, repeat // 10))
+        results[policy or "1x8"]["utilization"] = [
+            p["utilization"] for p in queue.stats()["partitions"]
+        ]
+        pool.clear()
+    return results
+
+
+def bench_pipelining(repeat: int) -> dict[str, Any]:
+    """Wall time of 8 queued jobs as more stages move off the GPU worker."""
+    profile = dataclasses.replace(stub_backend.PROFILE)
+    stub_backend.PROFILE.step_seconds = 0.005
+    stub_backend.PROFILE.encode_seconds = 0.02
+    stub_backend.PROFILE.decode_seconds = 0.04
+    stub_backend.PROFILE.write_seconds = 0.02
+    node = VideoGenerator()
+    steps = 20
+    results = {}
+    try:
+        for label, offload, pipeline in (("sequential", False, False),
+                                         ("offloaded_encode", True, False),
+                                         ("pipelined", True, True)):
+            video_generator_module.OFFLOAD_ENCODE = offload
+            video_generator_module.PIPELINE_ENABLED = pipeline
+
+            def batch() -> None:
+                jobs = [
+                    node.submit(**_node_kwargs(
+                        prompt=f"pipeline {i} {time.perf_counter_ns()}",
+                        inference_args={
+                            "num_inference_steps": steps,
+                            "num_frames": 9
+                        })) for i in range(8)
+                ]
+                for job in jobs:
+                    wait_for_job(job)
+
+            batch()  # load the generator
+            results[label] = _time(batch, max(1, repeat // 10))
+        results["denoise_only"] = 8 * steps * stub_backend.PROFILE.step_seconds
+        results["pipeline"] = get_stage_pipeline().stats()
+    finally:
+        video_generator_module.OFFLOAD_ENCODE = OFFLOAD_ENCODE
+        video_generator_module.PIPELINE_ENABLED = PIPELINE_ENABLED
+        stub_backend.PROFILE = profile
+    return results
+
+
+def bench_cancellation(repeat: int) -> dict[str, Any]:
+    """Time from the interrupt flag to the node raising, and to idle."""
+    node = VideoGenerator()
+    to_raise, to_idle = [], []
+    for i in range(repeat):
+        job = node.submit(**_node_kwargs(
+            prompt=f"cancel {i} {time.perf_counter_ns()}",
+            inference_args={
+                "num_inference_steps": 10000,
+                "num_frames": 1
+            }))
+        while job.started_at is None:
+            time.sleep(0.001)
+        start = time.perf_counter()
+        stub_backend.set_interrupted(True)
+        try:
+            wait_for_job(job)
+        except GenerationCancelledException:
+            pass
+        to_raise.append(time.perf_counter() - start)
+        job.wait()
+        to_idle.append(time.perf_counter() - start)
+        stub_backend.set_interrupted(False)
+    return {"to_raise": _summary(to_raise), "to_idle": _summary(to_idle)}
+
+
+def _write_images() -> dict[str, str]:
+    input_dir = folder_paths.get_input_directory()
+    images = {}
+    for size in (256, 1024):
+        base = Image.linear_gradient("L").resize((size, size)).convert("RGB")
+        for fmt, ext in (("PNG", "png"), ("JPEG", "jpg"), ("WEBP", "webp"),
+                         ("TIFF", "tif")):
+            name = f"bench_{size}.{ext}"
+            base.save(os.path.join(input_dir, name), fmt)
+            images[f"{ext}_{size}"] = name
+        frames = [base.rotate(i * 10) for i in range(16)]
+        name = f"bench_{size}_anim.gif"
+        frames[0].save(os.path.join(input_dir, name),
+                       save_all=True,
+                       append_images=frames[1:])
+        images[f"gif16_{size}"] = name
+    return images
+
+
+def bench_load_image(repeat: int) -> dict[str, Any]:
+    node = load_image.LoadImagePath()
+    results = {}
+    for label, name in _write_images().items():
+
+        def decode(name: str = name) -> None:
+            load_image._decoded_cache.clear()
+            node.load_image(name)
+
+        results[label] = _time(decode, repeat)
+    return results
+
+
+def bench_is_changed(repeat: int) -> dict[str, Any]:
+    input_dir = folder_paths.get_input_directory()
+    name = "bench_is_changed.bin"
+    with open(os.path.join(input_dir, name), "wb") as f:
+        f.write(os.urandom(64 * 1024 * 1024))
+
+    def cold() -> None:
+        load_image._hash_memo.clear()
+        load_image.LoadImagePath.IS_CHANGED(name)
+
+    return {
+        "cold_64mb": _time(cold, max(1, repeat // 10)),
+        "warm_64mb": _time(lambda: load_image.LoadImagePath.IS_CHANGED(name),
+                           repeat),
+    }
+
+
+BENCHMARKS: dict[str, Callable[[int], Any]] = {
+    "config_build": bench_config_build,
+    "generator_cache_hit": bench_generator_cache_hit,
+    "hot_swap": bench_hot_swap,
+    "job_round_trip": bench_job_round_trip,
+    "partitions": bench_partitions,
+    "pipelining": bench_pipelining,
+    "cancellation": bench_cancellation,
+    "load_image": bench_load_image,
+    "is_changed": bench_is_changed,
+}
+
+
+def _medians(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            if "median" in value:
+                flat[f"{prefix}{key}"] = value["median"]
+            else:
+                flat.update(_medians(value, f"{prefix}{key}."))
+    return flat
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any],
+            tolerance: float) -> list[str]:
+    """Names of benchmarks whose median got slower than the tolerance."""
+    current = _medians(results["benchmarks"])
+    previous = _medians(baseline["benchmarks"])
+    regressions = []
+    for name, value in sorted(current.items()):
+        if name not in previous or previous[name] <= 0:
+            continue
+        ratio = value / previous[name]
+        marker = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:45s} {previous[name] * 1e3:10.3f} ms -> "
+              f"{value * 1e3:10.3f} ms ({ratio:5.2f}x) {marker}")
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against saved results")
+    parser.add_argument("--tolerance",
+                        type=float,
+                        default=0.2,
+                        help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--verbose",
+                        action="store_true",
+                        help="Show the nodes' own log output")
+    parser.add_argument("--only",
+                        nargs="*",
+                        choices=sorted(BENCHMARKS),
+                        help="Run a subset of the benchmarks")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": vars(stub_backend.PROFILE),
+        "benchmarks": {},
+    }
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"Running {name}...")
+        log = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+            results["benchmarks"][name] = bench(args.repeat)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results["benchmarks"], indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+"""
+Deterministic stand-ins for FastVideo and the ComfyUI modules the nodes use.
+
+``install()`` registers fake ``fastvideo``, ``comfy`` and ``folder_paths``
+modules in ``sys.modules`` so the node layer can be imported and timed on a
+machine without a GPU, FastVideo or ComfyUI. By default the fake
+``fastvideo`` has the API of the released package; the hooks the nodes only
+use when a backend offers them are opt-in.
+"""
+from __future__ import annotations
+
+import dataclasses
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from typing import Any
+
+import numpy as np
+
+
+@dataclasses.dataclass
+class StubProfile:
+    """Costs the stub backend simulates."""
+    config_seconds: float = 0.002
+    load_seconds: float = 0.05
+    component_seconds: float = 0.005
+    park_seconds: float = 0.002
+    restore_seconds: float = 0.005
+    step_seconds: float = 0.001
+    encode_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    write_seconds: float = 0.0
+    alloc_mb: int = 0
+    frame_height: int = 64
+    frame_width: int = 64
+
+
+PROFILE = StubProfile()
+
+
+@dataclasses.dataclass
+class _StubComponentConfig:
+    prefix: str = ""
+    quant_config: str = ""
+    lora_config: str = ""
+    load_encoder: bool = True
+    load_decoder: bool = True
+    tile_sample_min_height: int = 256
+    tile_sample_min_width: int = 256
+    tile_sample_min_num_frames: int = 16
+    tile_sample_stride_height: int = 192
+    tile_sample_stride_width: int = 192
+    tile_sample_stride_num_frames: int = 12
+    blend_num_frames: int = 0
+    use_tiling: bool = True
+    use_temporal_tiling: bool = True
+    use_parallel_tiling: bool = True
+
+
+@dataclasses.dataclass
+class StubPipelineConfig:
+    model_path: str = ""
+    embedded_cfg_scale: float = 6.0
+    precision: str = "bf16"
+    vae_precision: str = "fp16"
+    vae_tiling: bool = True
+    vae_sp: bool = False
+    text_encoder_precisions: tuple = ("fp16", )
+    dit_config: _StubComponentConfig = dataclasses.field(
+        default_factory=_StubComponentConfig)
+    vae_config: _StubComponentConfig = dataclasses.field(
+        default_factory=_StubComponentConfig)
+    text_encoder_configs: tuple = dataclasses.field(
+        default_factory=lambda: (_StubComponentConfig(), ))
+
+    @classmethod
+    def from_pretrained(cls, model_path: str) -> StubPipelineConfig:
+        time.sleep(PROFILE.config_seconds)
+        return cls(model_path=model_path)
+
+
+class _StubWorker:
+    """
+    A worker with a stand-in process started when its pid is first asked
+    for, so a cancel signal reaches a process of its own and not the caller.
+    ``cat`` on a pipe is cheap to start and exits with its parent.
+    """
+
+    def __init__(self) -> None:
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def pid(self) -> int:
+        if self._process is None:
+            self._process = subprocess.Popen(["cat"],
+                                             stdin=subprocess.PIPE,
+                                             stdout=subprocess.DEVNULL)
+        return self._process.pid
+
+    def is_alive(self) -> bool:
+        return self._process is None or self._process.poll() is None
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._process is not None:
+            self._process.wait(timeout)
+
+    def terminate(self) -> None:
+        if self._process is not None:
+            self._process.stdin.close()
+            if self._process.poll() is None:
+                self._process.terminate()
+
+
+class _StubExecutor:
+
+    def __init__(self, num_gpus: int) -> None:
+        self.workers = [_StubWorker() for _ in range(num_gpus)]
+
+    def shutdown(self) -> None:
+        for worker in self.workers:
+            worker.terminate()
+            worker.join()
+        self.workers = []
+
+
+@dataclasses.dataclass
+class StubSamplingParam:
+    """The fields of the released ``fastvideo.SamplingParam``."""
+    data_type: str = "video"
+    image_path: str | None = None
+    pil_image: Any = None
+    video_path: str | None = None
+    num_frames: int = 9
+    num_frames_round_down: bool = False
+    height: int = 720
+    width: int = 1280
+    fps: int = 24
+    num_inference_steps: int = 6
+    guidance_scale: float = 1.0
+    guidance_rescale: float = 0.0
+    boundary_ratio: float | None = None
+    enable_teacache: bool = False
+    seed: int = 1024
+    num_videos_per_prompt: int = 1
+    prompt: str | None = None
+    negative_prompt: str | None = None
+    prompt_path: str | None = None
+    output_path: str = "outputs/"
+    output_video_name: str | None = None
+    save_video: bool = True
+    return_frames: bool = False
+    return_trajectory_latents: bool = False
+    return_trajectory_decoded: bool = False
+
+
+class StubVideoGenerator:
+    """
+    Sleeps instead of denoising and writes a placeholder video file.
+
+    Mirrors the released ``fastvideo.VideoGenerator``: options go through
+    ``generate_video(prompt, sampling_param=None, **kwargs)`` and only the
+    ``SamplingParam`` fields among them are used. There are no cancel,
+    encode/decode, reconcile or park hooks; see ``ExtendedStubVideoGenerator``.
+    """
+
+    def __init__(self, num_gpus: int = 1) -> None:
+        self.executor = _StubExecutor(num_gpus)
+        # What real worker processes would inherit at spawn time
+        self.visible_devices = os.environ.get("CUDA_VISIBLE_DEVICES")
+        self._cancel = threading.Event()
+        self._weights = bytearray(PROFILE.alloc_mb * 1024 * 1024)
+        self.generate_calls = 0
+        self.decode_calls = 0
+        self.encode_calls = 0
+        self.steps_run = 0
+        self.pipeline_updates = 0
+        self.component_reloads = 0
+
+    @classmethod
+    def from_pretrained(cls,
+                        model_path: str,
+                        pipeline_config: Any = None,
+                        num_gpus: int = 1,
+                        **kwargs: Any) -> StubVideoGenerator:
+        time.sleep(PROFILE.load_seconds)
+        return cls(num_gpus=num_gpus)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+    def generate_video(self,
+                       prompt: str | None = None,
+                       sampling_param: StubSamplingParam | None = None,
+                       **kwargs: Any) -> Any:
+        param = dataclasses.replace(sampling_param or StubSamplingParam())
+        # Like SamplingParam.update, options that are not fields are ignored
+        for name, value in kwargs.items():
+            if hasattr(param, name):
+                setattr(param, name, value)
+        return self._generate(prompt or param.prompt or "",
+                              output_path=param.output_path,
+                              num_inference_steps=param.num_inference_steps,
+                              num_frames=param.num_frames,
+                              return_frames=param.return_frames,
+                              save_video=param.save_video)
+
+    def _generate(self,
+                  prompt: str,
+                  output_path: str,
+                  num_inference_steps: int,
+                  num_frames: int,
+                  return_frames: bool = False,
+                  save_video: bool = True,
+                  return_latents: bool = False,
+                  checkpoint_every: int = 0,
+                  checkpoint_callback: Any = None,
+                  resume_state: Any = None,
+                  output_type: str = "np",
+                  prompt_embeds: Any = None) -> Any:
+        self.generate_calls += 1
+        self._cancel.clear()
+        if prompt_embeds is None:
+            self._encode_prompt(prompt)
+        first_step = resume_state[0] if resume_state is not None else 0
+        for step in range(first_step, num_inference_steps):
+            if self._cancel.is_set():
+                raise RuntimeError("Generation cancelled")
+            if not all(w.is_alive() for w in self.executor.workers):
+                raise RuntimeError("A worker process died")
+            time.sleep(PROFILE.step_seconds)
+            self.steps_run += 1
+            if checkpoint_callback is not None and (step +
+                                                    1) % checkpoint_every == 0:
+                import torch
+                checkpoint_callback(
+                    step + 1, {
+                        "latents": torch.zeros(4, 8, 8),
+                        "scheduler": {
+                            "step_index": step + 1
+                        },
+                        "rng": torch.get_rng_state(),
+                    })
+
+        latents = np.zeros((num_frames, 4, PROFILE.frame_height // 8,
+                            PROFILE.frame_width // 8),
+                           dtype=np.float32)
+        if output_type == "latent":
+            import torch
+            return {"latents": torch.from_numpy(latents)}
+        if return_latents:
+            import torch
+            frames = self._decode_latents(latents,
+                                          output_path=output_path,
+                                          prompt=prompt,
+                                          save_video=save_video,
+                                          return_frames=True)
+            return {"frames": frames, "latents": torch.from_numpy(latents)}
+        return self._decode_latents(latents,
+                                    output_path=output_path,
+                                    prompt=prompt,
+                                    save_video=save_video,
+                                    return_frames=return_frames)
+
+    def _encode_prompt(self, prompt: str, **kwargs: Any) -> Any:
+        time.sleep(PROFILE.encode_seconds)
+        self.encode_calls += 1
+        return {"prompt": prompt}
+
+    def _decode_latents(self,
+                        latents: Any,
+                        output_path: str = "",
+                        prompt: str = "",
+                        save_video: bool = True,
+                        return_frames: bool = False,
+                        **kwargs: Any) -> Any:
+        self.decode_calls += 1
+        time.sleep(PROFILE.decode_seconds)
+        frames = [
+            np.full((PROFILE.frame_height, PROFILE.frame_width, 3),
+                    i % 256,
+                    dtype=np.uint8) for i in range(latents.shape[0])
+        ]
+        if save_video:
+            os.makedirs(output_path, exist_ok=True)
+            time.sleep(PROFILE.write_seconds)
+            with open(os.path.join(output_path, f"{prompt[:100]}.mp4"),
+                      "wb") as f:
+                f.write(b"\0" * 1024)
+        if return_frames:
+            return frames
+        return {"samples": None}
+
+
+class ExtendedStubVideoGenerator(StubVideoGenerator):
+    """
+    The stub with the backend hooks the nodes use when a FastVideo version
+    offers them: cooperative cancel, separate prompt encoding and latent
+    decoding, checkpoints, config reconciling and parking.
+
+    No released FastVideo version has these yet, so they are opt-in
+    (``install(extended=True)``) to keep the default stub honest.
+    """
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def update_pipeline_config(self, fields: dict[str, Any]) -> None:
+        self.pipeline_updates += 1
+
+    def reload_component(self, name: str, pipeline_config: Any) -> None:
+        time.sleep(PROFILE.component_seconds)
+        self.component_reloads += 1
+
+    def park(self) -> int:
+        time.sleep(PROFILE.park_seconds)
+        return len(self._weights)
+
+    def unpark(self) -> None:
+        time.sleep(PROFILE.restore_seconds)
+
+    def generate_video(self,
+                       prompt: str,
+                       output_path: str = "",
+                       num_inference_steps: int = 6,
+                       num_frames: int = 9,
+                       return_frames: bool = False,
+                       save_video: bool = True,
+                       return_latents: bool = False,
+                       checkpoint_every: int = 0,
+                       checkpoint_callback: Any = None,
+                       resume_state: Any = None,
+                       output_type: str = "np",
+                       prompt_embeds: Any = None,
+                       **kwargs: Any) -> Any:
+        return self._generate(prompt,
+                              output_path=output_path,
+                              num_inference_steps=num_inference_steps,
+                              num_frames=num_frames,
+                              return_frames=return_frames,
+                              save_video=save_video,
+                              return_latents=return_latents,
+                              checkpoint_every=checkpoint_every,
+                              checkpoint_callback=checkpoint_callback,
+                              resume_state=resume_state,
+                              output_type=output_type,
+                              prompt_embeds=prompt_embeds)
+
+    def encode_prompt(self, prompt: str, **kwargs: Any) -> Any:
+        return self._encode_prompt(prompt, **kwargs)
+
+    def decode_latents(self, latents: Any, **kwargs: Any) -> Any:
+        return self._decode_latents(latents, **kwargs)
+
+
+class _Interrupt:
+    flag = False
+
+
+def _processing_interrupted() -> bool:
+    return _Interrupt.flag
+
+
+def set_interrupted(value: bool) -> None:
+    """Simulate the user pressing cancel in ComfyUI."""
+    _Interrupt.flag = value
+
+
+def _build_folder_paths(root: str) -> types.ModuleType:
+    module = types.ModuleType("folder_paths")
+    input_dir = os.path.join(root, "input")
+    temp_dir = os.path.join(root, "temp")
+    os.makedirs(input_dir, exist_ok=True)
+    os.makedirs(temp_dir, exist_ok=True)
+    image_exts = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".tif", ".tiff"}
+
+    module.get_input_directory = lambda: input_dir
+    module.get_temp_directory = lambda: temp_dir
+    module.get_annotated_filepath = lambda name: os.path.join(input_dir, name)
+    module.exists_annotated_filepath = lambda name: os.path.exists(
+        os.path.join(input_dir, name))
+    module.filter_files_content_types = lambda files, types_: [
+        f for f in files if os.path.splitext(f)[1].lower() in image_exts
+    ]
+    return module
+
+
+def install(root: str | None = None,
+            profile: StubProfile | None = None,
+            extended: bool = False) -> str:
+    """
+    Register the stub modules and put the node package on ``sys.path``.
+
+    Args:
+        root: Scratch directory for inputs/outputs (a temp dir by default)
+        profile: Simulated backend costs
+        extended: Register ``ExtendedStubVideoGenerator`` instead of the
+            stub of the released API
+
+    Returns:
+        The scratch directory
+    """
+    global PROFILE
+    if profile is not None:
+        PROFILE = profile
+    root = root or tempfile.mkdtemp(prefix="fastvideo-bench-")
+
+    fastvideo = types.ModuleType("fastvideo")
+    fastvideo.VideoGenerator = (ExtendedStubVideoGenerator
+                                if extended else StubVideoGenerator)
+    fastvideo.SamplingParam = StubSamplingParam
+    fastvideo.PipelineConfig = StubPipelineConfig
+
+    comfy = types.ModuleType("comfy")
+    model_management = types.ModuleType("comfy.model_management")
+    model_management.processing_interrupted = _processing_interrupted
+    cli_args = types.ModuleType("comfy.cli_args")
+    cli_args.args = types.SimpleNamespace(default_hashing_function="sha256")
+    comfy.model_management = model_management
+    comfy.cli_args = cli_args
+
+    sys.modules.update({
+        "fastvideo": fastvideo,
+        "comfy": comfy,
+        "comfy.model_management": model_management,
+        "comfy.cli_args": cli_args,
+        "folder_paths": _build_folder_paths(root),
+    })
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+    return root
@@ -0,0 +1,77 @@
+"""
+Runs the tests against the stub backend of ``benchmarks/stub_backend.py``,
+which registers fake ``fastvideo``, ``comfy`` and ``folder_paths`` modules.
+"""
+import os
+import sys
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "benchmarks"))
+
+import pytest  # noqa: E402
+import stub_backend  # noqa: E402
+
+SCRATCH = stub_backend.install(
+    profile=stub_backend.StubProfile(config_seconds=0.0, load_seconds=0.0))
+
+# Keep the on-disk stores out of the home directory
+for name, path in (("FASTVIDEO_LATENT_DIR", "latents"),
+                   ("FASTVIDEO_CHECKPOINT_DIR", "checkpoints"),
+                   ("FASTVIDEO_VAE_TILING_CACHE", "vae_tiling.json")):
+    os.environ.setdefault(name, os.path.join(SCRATCH, path))
+
+from video_generator import video_generator  # noqa: E402
+from video_generator.generator_pool import get_generator_pool  # noqa: E402
+
+
+@pytest.fixture
+def factory():
+    return stub_backend.StubVideoGenerator.from_pretrained
+
+
+@pytest.fixture
+def output_path(tmp_path):
+    return str(tmp_path / "outputs")
+
+
+@pytest.fixture
+def extended_backend(monkeypatch):
+    """Run the nodes on the stub that has every optional backend hook."""
+    # The pool key does not cover the backend class
+    get_generator_pool().clear()
+    monkeypatch.setattr(video_generator, "FastVideoGenerator",
+                        stub_backend.ExtendedStubVideoGenerator)
+    yield stub_backend.ExtendedStubVideoGenerator
+    get_generator_pool().clear()
+
+
+@pytest.fixture
+def node_kwargs(output_path):
+    """Widget values for ``VideoGenerator`` with the given overrides."""
+
+    def build(**overrides):
+        kwargs = {
+            "prompt": "a stub video",
+            "output_path": output_path,
+            "num_gpus": 1,
+            "model_path": "model",
+            "embedded_cfg_scale": 6.0,
+            "sp_size": 1,
+            "tp_size": 1,
+            "vae_precision": "fp16",
+            "vae_tiling": True,
+            "vae_sp": False,
+            "text_encoder_precision": "fp16",
+            "precision": "bf16",
+            "inference_args": {
+                "num_inference_steps": 2,
+                "num_frames": 3,
+                "seed": 1024
+            },
+        }
+        kwargs.update(overrides)
+        return kwargs
+
+    return build
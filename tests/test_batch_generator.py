@@ -0,0 +1,43 @@
+import os
+
+import pytest
+from video_generator.batch_generator import FastVideoBatch, parse_seeds
+from video_generator.manifest import get_output_manifest
+
+
+def test_parse_seeds_expands_ranges():
+    assert parse_seeds("1, 2 5-7") == [1, 2, 5, 6, 7]
+    assert parse_seeds("-3") == [-3]
+    assert parse_seeds("") == []
+
+
+@pytest.mark.parametrize("seeds", ["1-", "5-3", "a", "1-x"])
+def test_parse_seeds_rejects_malformed_tokens(seeds):
+    with pytest.raises(ValueError, match="not a seed or a range"):
+        parse_seeds(seeds)
+
+
+def test_malformed_seeds_fail_validation():
+    assert FastVideoBatch.VALIDATE_INPUTS(seeds="1, 2") is True
+    assert "Invalid seeds: '1-'" in FastVideoBatch.VALIDATE_INPUTS(seeds="1-")
+    assert FastVideoBatch.VALIDATE_INPUTS(seeds=" ") == "No seeds given"
+
+
+def test_batch_records_videos_in_the_output_manifest(node_kwargs):
+    kwargs = node_kwargs()
+    del kwargs["prompt"]
+    video_paths, manifest_path = FastVideoBatch().launch_batch(
+        prompts="a cat\na dog", seeds="1-2", **kwargs)
+    paths = video_paths.splitlines()
+    assert len(paths) == 4
+    assert [p.split(os.sep)[-2][-5:] for p in paths] == [
+        "seed1", "seed2", "seed1", "seed2"
+    ]
+
+    manifest = get_output_manifest(kwargs["output_path"])
+    assert manifest_path == manifest.path
+    entries = manifest.query(limit=10)
+    assert sorted(e["path"] for e in entries) == sorted(paths)
+    assert not any(
+        name.endswith(".jsonl")
+        for _, _, names in os.walk(kwargs["output_path"]) for name in names)
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from stub_backend import ExtendedStubVideoGenerator, StubVideoGenerator
+from video_generator import cancellation
+from video_generator.generator_pool import GeneratorPool, get_generator_pool
+from video_generator.job_queue import JobStatus
+from video_generator.video_generator import (GenerationCancelledException,
+                                             VideoGenerator, wait_for_job)
+
+
+@pytest.fixture
+def no_grace(monkeypatch):
+    monkeypatch.setattr(cancellation, "_SIGNAL_GRACE", 0.0)
+
+
+def test_cancel_hook_is_used_when_present():
+    generator = ExtendedStubVideoGenerator()
+    assert cancellation.request_cancel(generator) == "cooperative"
+    assert not cancellation.signals(generator)
+    assert not cancellation.detaches(generator)
+
+
+def test_without_a_hook_the_workers_are_signalled(no_grace):
+    generator = StubVideoGenerator()
+    assert cancellation.signals(generator)
+    assert cancellation.request_cancel(generator) == "signal"
+    deadline = time.monotonic() + 5
+    while cancellation.workers_healthy(generator):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    generator.shutdown()
+
+
+def test_detaching_is_opt_in(monkeypatch):
+    monkeypatch.setattr(cancellation, "CANCEL_MODE", "detach")
+    generator = StubVideoGenerator()
+    assert cancellation.detaches(generator)
+    assert cancellation.request_cancel(generator) == "detached"
+    assert cancellation.workers_healthy(generator)
+
+
+def test_discarded_generator_is_shut_down_once_unpinned(factory):
+    pool = GeneratorPool(capacity=1)
+    key, generator = pool.acquire("model", {}, None, factory)
+    pool.discard(key, generator)
+    assert key not in pool
+    assert generator.executor.workers
+
+    pool.release(key, generator)
+    deadline = time.monotonic() + 5
+    while pool.stats()["retiring"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert not generator.executor.workers
+
+
+def test_signalled_job_is_cancelled_and_its_generator_evicted(
+        no_grace, node_kwargs):
+    get_generator_pool().clear()
+    job = VideoGenerator().submit(**node_kwargs(
+        prompt=f"cancel {time.perf_counter_ns()}",
+        inference_args={
+            "num_inference_steps": 100000,
+            "num_frames": 1
+        }))
+    _wait_for_steps()
+    job.cancel()
+    with pytest.raises(GenerationCancelledException):
+        wait_for_job(job)
+    assert job.wait(10)
+    assert job.status is JobStatus.CANCELLED
+    assert len(get_generator_pool()) == 0
+
+
+def _wait_for_steps():
+    pool = get_generator_pool()
+    deadline = time.monotonic() + 5
+    while True:
+        assert time.monotonic() < deadline
+        entries = pool.stats()["entries"]
+        generator = pool.peek(entries[0]["key"]) if entries else None
+        if generator is not None and generator.steps_run:
+            return
+        time.sleep(0.001)
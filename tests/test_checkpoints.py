@@ -0,0 +1,50 @@
+import os
+import pickle
+
+import torch
+from video_generator import video_generator
+from video_generator.checkpoints import (CheckpointCallback, CheckpointStore,
+                                         get_checkpoint_store)
+from video_generator.generator_pool import get_generator_pool
+from video_generator.video_generator import VideoGenerator
+
+
+def test_store_keeps_the_latest_state(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.save("key", 2, {"latents": torch.ones(2)})
+    store.save("key", 4, {"latents": torch.full((2, ), 4.0)})
+    step, state = store.load("key")
+    assert step == 4
+    assert torch.equal(state["latents"], torch.full((2, ), 4.0))
+
+    store.finish("key")
+    assert store.load("key") is None
+
+
+def test_callback_pickles_into_worker_processes():
+    store = get_checkpoint_store()
+    callback = pickle.loads(
+        pickle.dumps(CheckpointCallback(store.root, "pickled")))
+    callback(3, {"latents": torch.zeros(2)})
+    assert store.load("pickled")[0] == 3
+    store.finish("pickled")
+
+
+def test_generation_resumes_from_its_checkpoint(extended_backend, node_kwargs,
+                                                monkeypatch):
+    monkeypatch.setattr(video_generator, "CHECKPOINT_STEPS", 2)
+    kwargs = node_kwargs(inference_args={
+        "num_inference_steps": 6,
+        "num_frames": 3,
+        "seed": 7
+    })
+    node = VideoGenerator()
+    key = node.prepare_request(**kwargs).latent_key
+    store = get_checkpoint_store()
+    CheckpointCallback(store.root, key)(4, {"latents": torch.zeros(4, 8, 8)})
+
+    node.launch_inference(**kwargs)
+    pool = get_generator_pool()
+    generator = pool.peek(pool.stats()["entries"][0]["key"])
+    assert generator.steps_run == 2
+    assert not os.path.exists(store.path(key))
@@ -0,0 +1,123 @@
+import threading
+
+from stub_backend import ExtendedStubVideoGenerator, StubPipelineConfig
+from video_generator.generator_pool import GeneratorPool, generator_fingerprint
+from video_generator.node_helpers import AUTO_TUNED_ATTR
+
+
+def test_hit_returns_the_same_generator(factory):
+    pool = GeneratorPool(capacity=2)
+    key, generator = pool.acquire("model", {"num_gpus": 1}, None, factory)
+    pool.release(key, generator)
+    key2, generator2 = pool.acquire("model", {"num_gpus": 1}, None, factory)
+    pool.release(key2, generator2)
+    assert (key2, generator2) == (key, generator)
+    assert (pool.hits, pool.misses) == (1, 1)
+    pool.clear()
+
+
+def test_least_recently_used_is_evicted_at_capacity(factory):
+    pool = GeneratorPool(capacity=2)
+    keys = []
+    for model in ("a", "b", "a", "c"):
+        key, generator = pool.acquire(model, {}, None, factory)
+        pool.release(key, generator)
+        keys.append(key)
+    key_a, key_b, _, key_c = keys
+    assert key_a in pool and key_c in pool
+    assert key_b not in pool
+    assert pool.evictions == 1
+    pool.clear()
+
+
+def test_pinned_generator_is_not_evicted(factory):
+    pool = GeneratorPool(capacity=1)
+    key_a, generator_a = pool.acquire("a", {}, None, factory)
+    acquired = threading.Event()
+
+    def acquire_b():
+        pool.release(*pool.acquire("b", {}, None, factory))
+        acquired.set()
+
+    thread = threading.Thread(target=acquire_b, daemon=True)
+    thread.start()
+    # "a" is still in use, so "b" has to wait for it
+    assert not acquired.wait(0.2)
+    assert key_a in pool
+    pool.release(key_a, generator_a)
+    assert acquired.wait(5)
+    thread.join(5)
+    assert key_a not in pool
+    assert pool.stats()["entries"][0]["pins"] == 0
+    pool.clear()
+
+
+def test_release_after_explicit_evict_is_ignored(factory):
+    pool = GeneratorPool(capacity=1)
+    key, generator = pool.acquire("model", {}, None, factory)
+    assert pool.evict(key)
+    pool.release(key, generator)
+    assert len(pool) == 0
+
+
+def test_fingerprint_is_canonical():
+    config = StubPipelineConfig(model_path="model")
+    key = generator_fingerprint("model", {"num_gpus": 2, "sp_size": 2}, config)
+    assert key == generator_fingerprint("model", {
+        "sp_size": 2,
+        "num_gpus": 2
+    }, StubPipelineConfig(model_path="model"))
+    assert key != generator_fingerprint("model", {
+        "num_gpus": 2,
+        "sp_size": 1
+    }, config)
+    assert key != generator_fingerprint("model", {
+        "num_gpus": 2,
+        "sp_size": 2
+    }, config, devices=(0, 1))
+
+
+def _tuned_config(tile_height):
+    config = StubPipelineConfig(model_path="model")
+    config.vae_config.tile_sample_min_height = tile_height
+    setattr(config.vae_config, AUTO_TUNED_ATTR, ("tile_sample_min_height", ))
+    return config
+
+
+def test_fingerprint_ignores_auto_tuned_vae_fields():
+    # Tiles tuned to the memory of the moment share one generator
+    assert generator_fingerprint("model", {},
+                                 _tuned_config(128)) == generator_fingerprint(
+                                     "model", {}, _tuned_config(256))
+
+    # The same change made by the user is part of the key
+    edited = StubPipelineConfig(model_path="model")
+    edited.vae_config.tile_sample_min_height = 128
+    assert generator_fingerprint("model", {}, edited) != generator_fingerprint(
+        "model", {}, StubPipelineConfig(model_path="model"))
+
+
+def test_changed_tuned_tiling_reloads_the_vae():
+    pool = GeneratorPool(capacity=1)
+    factory = ExtendedStubVideoGenerator.from_pretrained
+    key, generator = pool.acquire("model", {}, _tuned_config(128), factory)
+    pool.release(key, generator)
+    key2, generator2 = pool.acquire("model", {}, _tuned_config(256), factory)
+    pool.release(key2, generator2)
+    assert (key2, generator2) == (key, generator)
+    assert generator.component_reloads == 1
+    assert pool.reconciles == 1
+    pool.clear()
+
+
+def test_tuned_tiling_is_kept_without_a_reload_hook(factory, capsys):
+    pool = GeneratorPool(capacity=1)
+    key, generator = pool.acquire("model", {}, _tuned_config(128), factory)
+    pool.release(key, generator)
+    key2, generator2 = pool.acquire("model", {}, _tuned_config(256), factory)
+    pool.release(key2, generator2)
+    assert generator2 is generator
+    assert pool.reconciles == 0
+    assert "Cannot apply the VAE tiling tuned for this request" in (
+        capsys.readouterr().out)
+    pool.clear()
@@ -0,0 +1,22 @@
+import os
+
+from video_generator.video_generator import VideoGenerator
+
+
+def test_is_changed_is_stable_across_regeneration(node_kwargs):
+    kwargs = node_kwargs(prompt="is changed")
+    node = VideoGenerator()
+    video_path = node.launch_inference(**kwargs)[0]
+    assert VideoGenerator.IS_CHANGED(**kwargs) == ""
+
+    os.remove(video_path)
+    missing = VideoGenerator.IS_CHANGED(**kwargs)
+    assert missing != ""
+    assert VideoGenerator.IS_CHANGED(**kwargs) == missing
+
+    # The run this value triggered must not trigger another one
+    assert node.launch_inference(**kwargs)[0] == video_path
+    assert VideoGenerator.IS_CHANGED(**kwargs) == missing
+
+    os.remove(video_path)
+    assert VideoGenerator.IS_CHANGED(**kwargs) not in ("", missing)
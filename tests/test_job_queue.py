@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+from video_generator.job_queue import JobQueue, JobQueueFullError, JobStatus
+
+
+def _block(queue):
+    """Occupy the queue's only worker until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def run(job):
+        started.set()
+        release.wait(5)
+
+    job = queue.submit(run)
+    assert started.wait(5)
+    return job, release
+
+
+def test_higher_priority_runs_first_then_fifo():
+    queue = JobQueue()
+    blocker, release = _block(queue)
+    order = []
+    jobs = [
+        queue.submit(lambda job, name=name: order.append(name),
+                     priority=priority)
+        for name, priority in (("low", 0), ("high", 5), ("low2", 0))
+    ]
+    release.set()
+    for job in [blocker] + jobs:
+        assert job.wait(5)
+    assert order == ["high", "low", "low2"]
+
+
+def test_cancelled_queued_job_never_runs():
+    queue = JobQueue()
+    blocker, release = _block(queue)
+    ran = []
+    job = queue.submit(lambda job: ran.append(job))
+    job.cancel()
+    release.set()
+    assert job.wait(5) and blocker.wait(5)
+    assert job.status == JobStatus.CANCELLED
+    assert not ran
+
+
+def test_exception_fails_the_job():
+    queue = JobQueue()
+
+    def fail(job):
+        raise RuntimeError("boom")
+
+    job = queue.submit(fail)
+    assert job.wait(5)
+    assert job.status == JobStatus.FAILED
+    assert isinstance(job.exception, RuntimeError)
+
+
+def test_future_result_frees_the_partition():
+    queue = JobQueue()
+    future = Future()
+    deferred = queue.submit(lambda job: future)
+    # The next job runs while the first one is still unfinished
+    assert queue.submit(lambda job: "next").wait(5)
+    assert not deferred.done
+    future.set_result("done")
+    assert deferred.wait(5)
+    assert (deferred.status, deferred.result) == (JobStatus.DONE, "done")
+
+
+def test_full_queue_rejects_jobs():
+    queue = JobQueue(max_depth=1)
+    blocker, release = _block(queue)
+    queue.submit(lambda job: None)
+    with pytest.raises(JobQueueFullError):
+        queue.submit(lambda job: None)
+    release.set()
+    assert blocker.wait(5)
@@ -0,0 +1,36 @@
+import torch
+
+from video_generator.vae_decode import FastVideoDecode
+from video_generator.video_generator import VideoGenerator
+
+
+def test_decode_of_image_conditioned_latents(extended_backend, node_kwargs,
+                                             capsys):
+    image = torch.rand(1, 32, 32, 3)
+    *_, latents = VideoGenerator().launch_inference(**node_kwargs(
+        image=image, return_latents=True))
+    assert latents["fastvideo"]["image_digest"]
+
+    # Only the VAE runs again; the IMAGE is not passed along
+    capsys.readouterr()
+    video_path, *_ = FastVideoDecode().decode(latents,
+                                              node_kwargs()["output_path"],
+                                              vae_tiling=False)
+    assert video_path
+    assert "Decoding stored latents" in capsys.readouterr().out
+
+
+def test_latents_are_rejected_without_backend_support(node_kwargs):
+    assert VideoGenerator.VALIDATE_INPUTS(**node_kwargs(
+        return_latents=False)) is True
+    assert "cannot return latents" in VideoGenerator.VALIDATE_INPUTS(
+        **node_kwargs(return_latents=True))
+    assert "cannot decode latents" in FastVideoDecode.VALIDATE_INPUTS()
+
+
+def test_latents_are_accepted_with_backend_support(extended_backend,
+                                                   node_kwargs):
+    assert VideoGenerator.VALIDATE_INPUTS(**node_kwargs(
+        return_latents=True)) is True
+    assert FastVideoDecode.VALIDATE_INPUTS() is True
+
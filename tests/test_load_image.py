@@ -0,0 +1,41 @@
+import os
+
+import folder_paths
+from PIL import Image
+from video_generator.load_image import LoadImagePath, image_source
+
+
+def _write(name, *colors):
+    frames = [Image.new("RGB", (8, 8), color) for color in colors]
+    path = os.path.join(folder_paths.get_input_directory(), name)
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return path
+
+
+def test_cached_images_are_not_shared():
+    _write("shared.png", "red")
+    node = LoadImagePath()
+    _, first, first_mask = node.load_image("shared.png")
+    first.zero_()
+    first_mask.fill_(1.0)
+    _, second, second_mask = node.load_image("shared.png")
+    assert second[0, 0, 0, 0] == 1.0
+    assert second_mask.max() == 0.0
+    second.zero_()
+    _, third, _ = node.load_image("shared.png")
+    assert third[0, 0, 0, 0] == 1.0
+
+
+def test_image_source_only_for_unchanged_first_frames():
+    path = _write("source.gif", "red", "green")
+    node = LoadImagePath()
+    _, image, _ = node.load_image("source.gif")
+    assert image_source(image) == path
+    # Derived tensors and later frames are not the file's first frame
+    assert image_source(image[1:]) is None
+    assert image_source(node.load_image("source.gif", frame_start=1)[1]) is None
+    # Cache hits keep the tag
+    assert image_source(node.load_image("source.gif")[1]) == path
+
+    os.utime(path, ns=(1, 1))
+    assert image_source(image) is None
@@ -0,0 +1,73 @@
+import itertools
+import json
+import os
+import time
+import types
+
+import pytest
+from video_generator import manifest as manifest_module
+from video_generator.manifest import OutputManifest
+from video_generator.manifest_query import FastVideoManifest
+
+
+@pytest.fixture
+def videos(output_path, monkeypatch):
+    """Three recorded videos, created one second apart."""
+    clock = itertools.count(1000.0)
+    monkeypatch.setattr(manifest_module, "time",
+                        types.SimpleNamespace(time=lambda: next(clock)))
+    os.makedirs(output_path)
+    manifest = OutputManifest(output_path)
+    for i, prompt in enumerate(("a red cat", "a dog", "a black cat")):
+        path = os.path.join(output_path, f"{i}.mp4")
+        with open(path, "wb") as f:
+            f.write(b"\0" * (i + 1))
+        manifest.put(f"key{i}", path, prompt, frame_count=48, fps=24.0)
+    return manifest
+
+
+def test_query_filters_and_orders(videos):
+    assert [e["fingerprint"] for e in videos.query()] == [
+        "key2", "key1", "key0"
+    ]
+    assert [e["fingerprint"] for e in videos.query(prompt="cat")] == [
+        "key2", "key0"
+    ]
+    assert [e["fingerprint"] for e in videos.query(limit=1)] == ["key2"]
+    assert videos.latest()["fingerprint"] == "key2"
+    with pytest.raises(ValueError):
+        videos.query(order_by="path")
+
+
+def test_usage_and_removal(videos):
+    assert videos.total_bytes() == 6
+    videos.touch("key0")
+    assert sorted(e["fingerprint"]
+                  for e in videos.unused_since(1002.5)) == ["key1", "key2"]
+    videos.remove("key1")
+    assert videos.get("key1") is None
+    assert videos.put("key3", os.path.join(videos.output_path,
+                                           "missing.mp4")) is None
+
+
+def test_manifest_node_returns_matching_videos(videos, output_path):
+    node = FastVideoManifest()
+    video_path, video_paths, frame_count, fps, entries = node.query(
+        output_path, prompt_filter="cat")
+    assert video_path.endswith("2.mp4")
+    assert len(video_paths.splitlines()) == 2
+    assert (frame_count, fps) == (48, 24.0)
+    assert json.loads(entries)[0]["duration"] == 2.0
+
+    assert node.query(output_path,
+                      fingerprint="key1")[0].endswith("1.mp4")
+    assert node.query(output_path, fingerprint="nope")[0] == ""
+
+
+def test_manifest_node_notices_new_videos(videos, output_path):
+    before = FastVideoManifest.IS_CHANGED(output_path)
+    assert FastVideoManifest.IS_CHANGED(output_path) == before
+    # File mtimes follow the kernel's coarse clock
+    time.sleep(0.05)
+    videos.remove("key0")
+    assert FastVideoManifest.IS_CHANGED(output_path) != before
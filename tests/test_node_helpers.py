@@ -0,0 +1,25 @@
+from stub_backend import ExtendedStubVideoGenerator, StubVideoGenerator
+from video_generator.node_helpers import accepts_kwarg, is_auto
+
+
+def test_is_auto_accepts_any_widget_value():
+    assert is_auto(-99999)
+    assert is_auto("-99999")
+    assert not is_auto(1)
+    # Precision widgets send strings that are not numbers
+    assert not is_auto("bf16")
+    assert not is_auto(None)
+
+
+def test_accepts_kwarg_on_the_released_api():
+    generate = StubVideoGenerator(1).generate_video
+    assert accepts_kwarg(generate, "save_video")
+    assert accepts_kwarg(generate, "num_frames")
+    assert not accepts_kwarg(generate, "return_latents")
+    assert not accepts_kwarg(generate, "prompt_embeds")
+
+
+def test_accepts_kwarg_on_named_parameters():
+    generate = ExtendedStubVideoGenerator(1).generate_video
+    assert accepts_kwarg(generate, "return_latents")
+    assert accepts_kwarg(generate, "checkpoint_callback")
@@ -0,0 +1,43 @@
+from video_generator.node_helpers import GIB
+from video_generator.parallel_planner import (DeviceInfo, ModelSpec,
+                                              plan_parallelism)
+
+MODEL = ModelSpec(name="13b", dit_params=13e9, text_encoder_params=8e9,
+                  vae_params=0.2e9, hidden_size=3072, num_layers=40,
+                  num_heads=24)
+DEVICES = [DeviceInfo(index=i, total_bytes=80 * GIB) for i in range(8)]
+
+
+def test_long_video_is_split_across_gpus():
+    plan = plan_parallelism(MODEL, DEVICES, 720, 1280, 129, steps=50)
+    assert plan.num_gpus > 1
+    assert plan.sp_size > 1
+    assert MODEL.num_heads % plan.sp_size == 0
+    assert plan.peak_bytes_per_device <= 80 * GIB * 0.9
+
+
+def test_small_job_stays_on_few_gpus():
+    tiny = plan_parallelism(MODEL, DEVICES, 256, 256, 1, steps=4)
+    long = plan_parallelism(MODEL, DEVICES, 720, 1280, 129, steps=50)
+    assert tiny.num_gpus < long.num_gpus
+    assert tiny.predicted_seconds < long.predicted_seconds
+
+
+def test_text_encoder_is_split_when_it_does_not_fit():
+    # 39.5 GiB of weights on one GPU, 32 GiB with the text encoder split
+    budget = 36 * GIB
+    plan = plan_parallelism(MODEL, DEVICES[:2], 256, 256, 1, steps=4,
+                            memory_budget=budget)
+    assert plan.tp_size == 2
+    assert plan.peak_bytes_per_device <= budget
+
+
+def test_fixed_values_are_kept():
+    plan = plan_parallelism(MODEL, DEVICES, 720, 1280, 129,
+                            fixed={"num_gpus": 4, "vae_sp": False})
+    assert (plan.num_gpus, plan.vae_sp) == (4, False)
+
+
+def test_nothing_fits():
+    assert plan_parallelism(MODEL, DEVICES, 720, 1280, 129,
+                            memory_budget=GIB) is None
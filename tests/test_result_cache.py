@@ -0,0 +1,46 @@
+import os
+
+from stub_backend import StubPipelineConfig
+from video_generator.result_cache import ResultCache, request_fingerprint
+
+
+def _fingerprint(**overrides):
+    kwargs = {
+        "model_path": "model",
+        "generation_args": {
+            "num_gpus": 1
+        },
+        "pipeline_config": StubPipelineConfig(model_path="model"),
+        "prompt": "a cat",
+        "inference_args": {
+            "seed": 1,
+            "num_frames": 9
+        },
+    }
+    kwargs.update(overrides)
+    return request_fingerprint(**kwargs)
+
+
+def test_request_fingerprint_covers_every_input():
+    key = _fingerprint()
+    assert key == _fingerprint(inference_args={"num_frames": 9, "seed": 1})
+    assert key != _fingerprint(prompt="a dog")
+    assert key != _fingerprint(inference_args={"seed": 2, "num_frames": 9})
+    assert key != _fingerprint(image_digest="abc")
+    assert _fingerprint(image_digest="abc") != _fingerprint(
+        image_digest="abd")
+
+
+def test_lookup_skips_videos_changed_on_disk(output_path):
+    os.makedirs(output_path)
+    path = os.path.join(output_path, "video.mp4")
+    with open(path, "wb") as f:
+        f.write(b"\0" * 16)
+    cache = ResultCache(output_path)
+    cache.record("key", path, "a cat", 9, 24.0)
+    assert cache.lookup("key") == path
+
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    assert cache.lookup("key") is None
+    assert cache.manifest.get("key") is None
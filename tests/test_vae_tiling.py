@@ -0,0 +1,52 @@
+import pytest
+from stub_backend import StubPipelineConfig
+from video_generator import vae_tiling
+from video_generator.node_helpers import AUTO_TUNED_ATTR, GIB
+from video_generator.vae_tiling import (TilingStore, autotune_vae_tiling,
+                                        plan_tiling)
+
+SHAPE = {"height": 720, "width": 1280, "num_frames": 129}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = TilingStore(str(tmp_path / "vae_tiling.json"))
+    monkeypatch.setattr(vae_tiling, "_store", store)
+    return store
+
+
+def test_small_video_decodes_in_one_tile():
+    plan = plan_tiling(256, 256, 9, 4 * GIB)
+    assert (plan.num_tiles, plan.overlap_overhead) == (1, 0.0)
+
+
+def test_tiles_fit_the_budget_with_little_overlap():
+    plan = plan_tiling(720, 1280, 129, 4 * GIB)
+    assert plan.peak_bytes <= 4 * GIB
+    assert plan.num_tiles == 16
+    assert plan.overlap_overhead < 0.3
+    assert plan_tiling(720, 1280, 129, GIB // 100) is None
+
+
+def test_autotune_sets_and_marks_the_tiling_fields(store, monkeypatch):
+    monkeypatch.setenv("FASTVIDEO_VAE_TILE_BUDGET_GB", "4")
+    monkeypatch.setattr(vae_tiling, "device_memory", lambda: [])
+    vae_config = StubPipelineConfig(model_path="model").vae_config
+    autotune_vae_tiling("model", vae_config, SHAPE)
+    plan = plan_tiling(720, 1280, 129, 4 * GIB)
+    assert vae_config.tile_sample_min_width == plan.tile_width
+    assert vae_config.tile_sample_stride_num_frames == plan.stride_frames
+    assert "tile_sample_min_width" in getattr(vae_config, AUTO_TUNED_ATTR)
+
+    # Later runs reuse the stored choice
+    reloaded = TilingStore(store.path)
+    assert reloaded.get(f"model|1280x720x129|0|{4 * GIB}") == plan
+
+
+def test_autotune_without_gpu_or_budget_keeps_the_config(store, monkeypatch):
+    monkeypatch.delenv("FASTVIDEO_VAE_TILE_BUDGET_GB", raising=False)
+    monkeypatch.setattr(vae_tiling, "device_memory", lambda: [])
+    vae_config = StubPipelineConfig(model_path="model").vae_config
+    autotune_vae_tiling("model", vae_config, SHAPE)
+    assert vae_config.tile_sample_min_width == 256
+    assert not getattr(vae_config, AUTO_TUNED_ATTR, ())
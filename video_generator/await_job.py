@@ -0,0 +1,31 @@
+import json
+
+from .video_generator import wait_for_job
+
+
+class FastVideoAwait:
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "job": ("FASTVIDEO_JOB", ),
+            }
+        }
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, **kwargs):
+        return True
+
+    RETURN_TYPES = ("STRING", "STRING", "IMAGE", "INT", "FLOAT", "STRING",
+                    "LATENT")
+    RETURN_NAMES = ("video_path", "status", "frames", "frame_count", "fps",
+                    "stats", "latents")
+    FUNCTION = "await_job"
+    CATEGORY = "fastvideo"
+
+    def await_job(self, job):
+        result = wait_for_job(job)
+        return (result.video_path, job.status.value, result.frames,
+                result.frame_count, result.fps, json.dumps(result.stats),
+                result.latents)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import uuid
+
+from comfy.model_management import processing_interrupted
+
+from .cancellation import POLL_INTERVAL
+from .job_queue import Job
+from .manifest import get_output_manifest
+from .video_generator import (GenerationCancelledException, GenerationRequest,
+                              VideoGenerator, wait_for_job)
+
+
+def parse_prompts(prompts: str, prompt_file: str = "") -> list[str]:
+    """One prompt per non-empty line, from the widget and/or a text file."""
+    lines = prompts.splitlines()
+    if prompt_file and prompt_file != "-99999":
+        with open(prompt_file, encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return [line.strip() for line in lines if line.strip()]
+
+
+def parse_seeds(seeds: str) -> list[int]:
+    """Comma or whitespace separated seeds; ``a-b`` expands to a range."""
+    result: list[int] = []
+    for token in seeds.replace(",", " ").split():
+        start, sep, end = token.partition("-")
+        try:
+            if sep and start:
+                first, last = int(start), int(end)
+                if last < first:
+                    raise ValueError
+                result.extend(range(first, last + 1))
+            else:
+                result.append(int(token))
+        except ValueError:
+            raise ValueError(f"{token!r} is not a seed or a range such as "
+                             "1000-1003") from None
+    return result
+
+
+class FastVideoBatch(VideoGenerator):
+
+    @classmethod
+    def INPUT_TYPES(s):
+        input_types = super().INPUT_TYPES()
+        del input_types["required"]["prompt"]
+        input_types["required"] = {
+            "prompts": ("STRING", {
+                "multiline": True,
+                "default": ""
+            }),
+            "seeds": ("STRING", {
+                "default": "1024"
+            }),
+            **input_types["required"],
+        }
+        input_types["optional"]["prompt_file"] = ("STRING", {"default": ""})
+        input_types["optional"].pop("return_frames", None)
+        input_types["optional"].pop("return_latents", None)
+        return input_types
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, **kwargs):
+        seeds = kwargs.get("seeds")
+        if seeds is not None:
+            try:
+                if not parse_seeds(seeds):
+                    return "No seeds given"
+            except ValueError as e:
+                return f"Invalid seeds: {e}"
+        return super().VALIDATE_INPUTS(**kwargs)
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return ""
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("video_paths", "manifest_path")
+    FUNCTION = "launch_batch"
+    CATEGORY = "fastvideo"
+
+    def launch_batch(self, prompts, seeds, output_path, prompt_file="",
+                     **kwargs):
+        prompt_list = parse_prompts(prompts, prompt_file)
+        seed_list = parse_seeds(seeds)
+        if not prompt_list:
+            raise ValueError("No prompts given")
+        if not seed_list:
+            raise ValueError("No seeds given")
+
+        batch_dir = os.path.join(output_path, f"batch_{uuid.uuid4().hex[:8]}")
+        os.makedirs(batch_dir, exist_ok=True)
+        # Finished videos are recorded in the output path's manifest, where
+        # FastVideo Manifest and the result cache find them
+        manifest = get_output_manifest(output_path)
+
+        # Config is loaded and overridden once for the whole sweep
+        base = self.prepare_request(prompt=prompt_list[0],
+                                    output_path=batch_dir,
+                                    **kwargs)
+        # Seeds of one prompt run back to back so the embedding cache hits
+        items = [(prompt, seed) for prompt in prompt_list
+                 for seed in seed_list]
+        print(f"Running FastVideo batch of {len(items)} videos "
+              f"({len(prompt_list)} prompts x {len(seed_list)} seeds)")
+
+        # Keep the queue fed without exceeding its depth
+        window = max(1, min(len(items), 8))
+        pending: list[tuple[int, GenerationRequest, Job]] = []
+        video_paths: dict[int, str] = {}
+        failed = 0
+        next_item = 0
+        try:
+            while next_item < len(items) or pending:
+                while next_item < len(items) and len(pending) < window:
+                    prompt, seed = items[next_item]
+                    request = dataclasses.replace(
+                        base,
+                        prompt=prompt,
+                        output_path=os.path.join(
+                            batch_dir, f"{next_item:05d}_seed{seed}"),
+                        inference_args={
+                            **base.inference_args, "seed": seed
+                        })
+                    pending.append(
+                        (next_item, request, self.submit_request(request)))
+                    next_item += 1
+
+                # Partitions finish out of order; take whichever is done
+                finished = [item for item in pending if item[2].done]
+                if not finished:
+                    if processing_interrupted():
+                        print("Video batch interrupted by user")
+                        raise GenerationCancelledException()
+                    pending[0][2].wait(timeout=POLL_INTERVAL)
+                    continue
+                for item in finished:
+                    pending.remove(item)
+                    index, request, job = item
+                    try:
+                        result = wait_for_job(job)
+                    except GenerationCancelledException:
+                        raise
+                    except Exception as e:
+                        failed += 1
+                        print(f"Batch item {index + 1}/{len(items)} failed "
+                              f"(seed {request.inference_args['seed']}): "
+                              f"{e!r}")
+                        continue
+                    video_paths[index] = result.video_path
+                    manifest.put(request.fingerprint, result.video_path,
+                                 request.prompt, result.frame_count,
+                                 result.fps, result.stats)
+                    print(f"Batch item {index + 1}/{len(items)} done: "
+                          f"{result.video_path}")
+        finally:
+            for *_, job in pending:
+                job.cancel()
+
+        if failed:
+            print(f"FastVideo batch finished with {failed} of {len(items)} "
+                  f"videos failed")
+        return ("\n".join(video_paths[i] for i in sorted(video_paths)),
+                manifest.path)
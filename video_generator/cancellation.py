@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+from typing import Any
+
+from .node_helpers import find_hook
+
+# "cooperative": use the backend's cancel hook when it has one, otherwise
+# send SIGINT to the worker processes and evict the generator.
+# "detach": without a cancel hook, let the running generation finish in the
+# background and record its result. "signal" is an alias of "cooperative".
+CANCEL_MODE = os.environ.get("FASTVIDEO_CANCEL_MODE", "cooperative")
+
+# How often the waiting thread checks ComfyUI's interrupt flag
+POLL_INTERVAL = 0.02
+
+# Grace period before SIGINT so workers are inside execute_forward
+_SIGNAL_GRACE = 2.0
+
+# Hook names a backend can expose to stop a generation between steps
+_CANCEL_HOOKS = ("cancel", "abort", "interrupt")
+
+
+def detaches(generator: Any) -> bool:
+    """Whether ``request_cancel`` leaves a running generation to finish."""
+    return (find_hook(generator, _CANCEL_HOOKS) is None
+            and CANCEL_MODE == "detach")
+
+
+def signals(generator: Any) -> bool:
+    """
+    Whether ``request_cancel`` interrupts the workers of ``generator``.
+
+    The generator cannot be trusted afterwards and should be evicted.
+    """
+    return (find_hook(generator, _CANCEL_HOOKS) is None
+            and CANCEL_MODE != "detach")
+
+
+def _signal_workers(generator: Any, started_at: float | None) -> None:
+    if started_at is not None:
+        time.sleep(max(0.0, started_at + _SIGNAL_GRACE - time.monotonic()))
+    try:
+        for worker in getattr(generator.executor, 'workers', []):
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGINT)
+        print("Interrupt signal sent to worker processes")
+    except Exception as e:
+        print(f"Error sending interrupt signal: {e}")
+
+
+def request_cancel(generator: Any, started_at: float | None = None) -> str:
+    """
+    Ask a running generation to stop without tearing down the generator.
+
+    Args:
+        generator: The generator running the job
+        started_at: ``time.monotonic()`` when the job started
+
+    Returns:
+        The action taken: "cooperative", "signal" or "detached"
+    """
+    hook = find_hook(generator, _CANCEL_HOOKS)
+    if hook is not None:
+        try:
+            hook()
+            return "cooperative"
+        except Exception as e:
+            print(f"Error requesting cooperative cancel: {e}")
+    if CANCEL_MODE == "detach":
+        return "detached"
+    # Never block the thread that reported the interrupt
+    threading.Thread(target=_signal_workers,
+                     args=(generator, started_at),
+                     daemon=True).start()
+    return "signal"
+
+
+def workers_healthy(generator: Any) -> bool:
+    """True if every worker process of the generator is still alive."""
+    workers = getattr(getattr(generator, "executor", None), "workers", None)
+    if not workers:
+        return True
+    return all(worker.is_alive() for worker in workers)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from typing import Any
+
+import torch
+
+from .node_helpers import env_int
+
+# Save the denoise state every this many steps; 0 disables checkpointing
+CHECKPOINT_STEPS = env_int("FASTVIDEO_CHECKPOINT_STEPS", 0)
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy of a step's state that the denoise loop can no longer mutate."""
+    if isinstance(value, torch.Tensor):
+        # A device-side copy is cheap; the host copy happens on the writer
+        return value.detach().clone()
+    if isinstance(value, dict):
+        return {k: _snapshot(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_snapshot(v) for v in value)
+    return copy.deepcopy(value)
+
+
+def _to_cpu(value: Any) -> Any:
+    if isinstance(value, torch.Tensor):
+        return value.to("cpu")
+    if isinstance(value, dict):
+        return {k: _to_cpu(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_cpu(v) for v in value)
+    return value
+
+
+class CheckpointStore:
+    """
+    Latest denoise state of unfinished generations, one file per key.
+
+    ``save`` only snapshots the state and returns; a background thread moves
+    it to the host and writes it with ``torch.save``. If the writer falls
+    behind, the pending state of a key is replaced by the newer one, so the
+    denoise loop never waits for the disk. Checkpoints are removed when their
+    generation finishes and pruned after ``max_age`` seconds otherwise.
+    """
+
+    def __init__(self, root: str, max_age: float | None = None) -> None:
+        self.root = root
+        self.max_age = max_age
+        self._pending: dict[str, tuple[int, Any]] = {}
+        self._writing: str | None = None
+        self._cond = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self.saves = 0
+        self.skipped = 0
+        self.resumes = 0
+        self.write_seconds = 0.0
+        self._prune()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.ckpt")
+
+    def save(self, key: str, step: int, state: dict[str, Any]) -> None:
+        """
+        Queue the state after ``step`` for writing.
+
+        Args:
+            key: Denoise fingerprint of the generation
+            step: Number of completed denoising steps
+            state: Latents, scheduler and RNG state as given by the backend
+        """
+        snapshot = _snapshot(state)
+        with self._cond:
+            if key in self._pending:
+                self.skipped += 1
+            self._pending[key] = (step, snapshot)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop,
+                                                name="fastvideo-checkpoints",
+                                                daemon=True)
+                self._writer.start()
+            self._cond.notify_all()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key = next(iter(self._pending))
+                step, state = self._pending.pop(key)
+                self._writing = key
+            start = time.perf_counter()
+            path = self.path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(self.root, exist_ok=True)
+                torch.save({"step": step, "state": _to_cpu(state)}, tmp_path)
+                os.replace(tmp_path, path)
+            except (OSError, RuntimeError) as e:
+                print(f"Error writing checkpoint: {e}")
+            with self._cond:
+                self._writing = None
+                self.saves += 1
+                self.write_seconds += time.perf_counter() - start
+                self._cond.notify_all()
+
+    def flush(self, key: str, timeout: float | None = None) -> None:
+        """Wait until the latest queued state of ``key`` is on disk."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: key not in self._pending and self._writing != key,
+                timeout=timeout)
+
+    def load(self, key: str) -> tuple[int, dict[str, Any]] | None:
+        """
+        Latest checkpoint of ``key``.
+
+        Returns:
+            The number of completed steps and the saved state, or None
+        """
+        self.flush(key)
+        try:
+            checkpoint = torch.load(self.path(key), weights_only=True)
+        except (OSError, RuntimeError) as e:
+            if os.path.exists(self.path(key)):
+                print(f"Ignoring unreadable checkpoint {key[:12]}: {e}")
+            return None
+        with self._cond:
+            self.resumes += 1
+        return checkpoint["step"], checkpoint["state"]
+
+    def finish(self, key: str) -> None:
+        """Drop the checkpoint of a generation that completed."""
+        with self._cond:
+            self._pending.pop(key, None)
+        self.flush(key)
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def _prune(self) -> None:
+        if self.max_age is None or not os.path.isdir(self.root):
+            return
+        cutoff = time.time() - self.max_age
+        for entry in os.scandir(self.root):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "saves": self.saves,
+                "skipped": self.skipped,
+                "resumes": self.resumes,
+                "write_seconds": round(self.write_seconds, 3),
+                "pending": len(self._pending),
+            }
+
+
+class CheckpointCallback:
+    """
+    ``checkpoint_callback`` that saves into the store at ``root``.
+
+    Holds only the directory and the key, so it can be pickled into the
+    backend's worker processes; a worker saves through a store of its own
+    for the same directory.
+    """
+
+    def __init__(self, root: str, key: str) -> None:
+        self.root = root
+        self.key = key
+
+    def __call__(self, step: int, state: dict[str, Any]) -> None:
+        _store_at(self.root).save(self.key, step, state)
+
+
+# One store per directory and process
+_stores: dict[str, CheckpointStore] = {}
+_store_lock = threading.Lock()
+
+
+def _store_at(root: str, max_age: float | None = None) -> CheckpointStore:
+    with _store_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = CheckpointStore(root, max_age=max_age)
+        return store
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """
+    Return the process-wide checkpoint store.
+
+    Configured with ``FASTVIDEO_CHECKPOINT_DIR`` (default
+    ``~/.cache/fastvideo_comfyui/checkpoints``) and
+    ``FASTVIDEO_CHECKPOINT_MAX_AGE_HOURS`` (default 24) for checkpoints of
+    generations that never finished.
+    """
+    root = os.environ.get("FASTVIDEO_CHECKPOINT_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "fastvideo_comfyui", "checkpoints")
+    max_age = env_int("FASTVIDEO_CHECKPOINT_MAX_AGE_HOURS", 24)
+    return _store_at(root, max_age * 3600 if max_age > 0 else None)
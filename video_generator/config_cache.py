@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import copy
+import glob
+import os
+import threading
+from typing import Any
+
+from fastvideo import PipelineConfig
+
+_CONFIG_PATTERNS = ("model_index.json", "*.json", "*/config.json",
+                    "*/*_config.json")
+
+_cache: dict[str, tuple[tuple[tuple[str, int, int], ...], Any]] = {}
+_lock = threading.Lock()
+hits = 0
+misses = 0
+
+
+def _model_root(model_path: str) -> str | None:
+    """Resolve a model id or path to a local directory without downloading."""
+    if os.path.isdir(model_path):
+        return model_path
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return None
+    try:
+        cached = try_to_load_from_cache(model_path, "model_index.json")
+    except Exception:
+        return None
+    if isinstance(cached, str) and os.path.isfile(cached):
+        return os.path.dirname(cached)
+    return None
+
+
+def config_signature(
+        model_path: str) -> tuple[tuple[str, int, int], ...] | None:
+    """
+    Return ``(path, mtime_ns, size)`` for every config file of a model.
+
+    Args:
+        model_path: Model id or local path
+
+    Returns:
+        A sorted tuple of file signatures, or None if the model is not
+        available locally yet
+    """
+    root = _model_root(model_path)
+    if root is None:
+        return None
+    files: set[str] = set()
+    for pattern in _CONFIG_PATTERNS:
+        files.update(glob.glob(os.path.join(root, pattern)))
+    signature = []
+    for path in sorted(files):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(signature) if signature else None
+
+
+def load_pipeline_config(model_path: str) -> Any:
+    """
+    Memoized ``PipelineConfig.from_pretrained``.
+
+    The cached master is invalidated whenever one of the model's config
+    files changes, and callers always receive a deep copy so that applying
+    overrides never mutates the master.
+
+    Args:
+        model_path: Model id or local path
+
+    Returns:
+        A private copy of the pipeline config
+    """
+    global hits, misses
+    signature = config_signature(model_path)
+    with _lock:
+        cached = _cache.get(model_path)
+        if signature is not None and cached is not None and cached[
+                0] == signature:
+            hits += 1
+            return copy.deepcopy(cached[1])
+        misses += 1
+
+    config = PipelineConfig.from_pretrained(model_path)
+    # The first call may have downloaded the model, so resolve again.
+    signature = signature or config_signature(model_path)
+    if signature is not None:
+        with _lock:
+            _cache[model_path] = (signature, copy.deepcopy(config))
+    return config
+
+
+def clear_config_cache() -> None:
+    """Drop every memoized pipeline config."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import torch
+
+from .node_helpers import GIB, canonicalize, env_gib, env_int
+
+
+def embedding_key(prompt: str, negative_prompt: str | None,
+                  encoder_identity: str, text_encoder_precision: Any,
+                  text_encoder_config: dict[str, Any] | None) -> str:
+    """
+    Key for the text encoder outputs of one prompt pair.
+
+    Args:
+        prompt: Positive prompt
+        negative_prompt: Negative prompt, if any
+        encoder_identity: Identifies the encoder weights (model path and
+            encoder architecture)
+        text_encoder_precision: Precision the encoder runs at
+        text_encoder_config: ``TextEncoderConfig`` overrides (prefix,
+            quant_config, lora_config)
+
+    Returns:
+        Hex digest identifying the embeddings
+    """
+    payload = {
+        "prompt": prompt,
+        "negative_prompt": negative_prompt,
+        "encoder": encoder_identity,
+        "precision": canonicalize(text_encoder_precision),
+        "config": canonicalize(text_encoder_config or {}),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, torch.Tensor):
+        return value.element_size() * value.nelement()
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def _to_cpu(value: Any) -> Any:
+    if isinstance(value, torch.Tensor):
+        return value.detach().to("cpu")
+    if isinstance(value, dict):
+        return {k: _to_cpu(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_cpu(v) for v in value)
+    return value
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of text encoder outputs.
+
+    The memory tier is an LRU bounded by entry count and bytes. The optional
+    disk tier stores one ``torch.save`` file per key, loaded back with
+    ``mmap=True`` so a hit only pages in what the pipeline touches, and is
+    trimmed oldest-first to ``disk_budget`` bytes.
+    """
+
+    def __init__(self,
+                 max_entries: int = 64,
+                 max_bytes: int = 2 * GIB,
+                 disk_dir: str | None = None,
+                 disk_budget: int | None = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_budget = disk_budget
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        assert self.disk_dir is not None
+        return os.path.join(self.disk_dir, f"{key}.pt")
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                value = torch.load(path, mmap=True, weights_only=True)
+            except (OSError, RuntimeError):
+                value = None
+            if value is not None:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._remember(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        value = _to_cpu(value)
+        self._remember(key, value)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                torch.save(value, tmp_path)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Error writing embedding cache entry: {e}")
+            self._trim_disk()
+
+    def _remember(self, key: str, value: Any) -> None:
+        size = _nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def _trim_disk(self) -> None:
+        if not self.disk_dir or self.disk_budget is None:
+            return
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and entry.name.endswith(".pt"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_budget:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Return the process-wide embedding cache.
+
+    Configured with ``FASTVIDEO_EMBED_CACHE_ENTRIES``,
+    ``FASTVIDEO_EMBED_CACHE_MEMORY_GB``, ``FASTVIDEO_EMBED_CACHE_DIR`` and
+    ``FASTVIDEO_EMBED_CACHE_DISK_GB``.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(
+                max_entries=env_int("FASTVIDEO_EMBED_CACHE_ENTRIES", 64),
+                max_bytes=env_gib("FASTVIDEO_EMBED_CACHE_MEMORY_GB")
+                or 2 * GIB,
+                disk_dir=os.environ.get("FASTVIDEO_EMBED_CACHE_DIR") or None,
+                disk_budget=env_gib("FASTVIDEO_EMBED_CACHE_DISK_GB"))
+        return _cache
@@ -0,0 +1,61 @@
+from .video_writer import CODECS, CONTAINERS, PIXEL_FORMATS, EncodeSettings
+
+
+class VideoEncodeConfig:
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "optional": {
+                "codec": (CODECS, {
+                    "default": "libx264"
+                }),
+                "crf": ("INT", {
+                    "default": -1,
+                    "min": -1,
+                    "max": 63
+                }),
+                "pix_fmt": (PIXEL_FORMATS, {
+                    "default": "yuv420p"
+                }),
+                "container": (CONTAINERS, {
+                    "default": "mp4"
+                }),
+                "lossless": ([False, True], {
+                    "default": False
+                }),
+            }
+        }
+
+    @classmethod
+    def VALIDATE_INPUTS(cls,
+                        codec="libx264",
+                        crf=-1,
+                        pix_fmt="yuv420p",
+                        container="mp4",
+                        lossless=False):
+        settings = EncodeSettings.from_config(
+            cls().set_args(codec, crf, pix_fmt, container, lossless)[0])
+        return settings.validate() or True
+
+    RETURN_TYPES = ("VIDEO_ENCODE_CONFIG", )
+    RETURN_NAMES = ("encode_config", )
+    FUNCTION = "set_args"
+    CATEGORY = "fastvideo"
+
+    def set_args(self,
+                 codec="libx264",
+                 crf=-1,
+                 pix_fmt="yuv420p",
+                 container="mp4",
+                 lossless=False):
+        args = {
+            "codec": codec,
+            "pix_fmt": pix_fmt,
+            "container": container,
+            "lossless": lossless,
+        }
+        # -1 keeps the encoder's default quality
+        if crf >= 0:
+            args["crf"] = crf
+        return (args, )
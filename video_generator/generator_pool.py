@@ -0,0 +1,740 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import gc
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from .node_helpers import (AUTO_TUNED_ATTR, GIB, canonicalize, env_gib,
+                           env_int, fingerprint_config)
+from .parking import park_generator, restore_generator
+from .reconcile import (ConfigDiff, apply_diff, can_apply, diff_configs,
+                        supports_reconcile)
+
+def generator_fingerprint(model_path: str,
+                          generation_args: dict[str, Any],
+                          pipeline_config: Any,
+                          devices: tuple[int, ...] = ()) -> str:
+    """
+    Compute a stable key for a generator built from the given inputs.
+
+    Args:
+        model_path: Model id or local path passed to ``from_pretrained``
+        generation_args: Keyword arguments passed to ``from_pretrained``
+        pipeline_config: The fully overridden pipeline config
+        devices: GPUs the generator is restricted to (empty for all)
+
+    Returns:
+        Hex digest identifying the generator
+    """
+    payload = {
+        "model_path": model_path,
+        "generation_args": canonicalize(generation_args),
+        "pipeline_config": fingerprint_config(pipeline_config),
+    }
+    if devices:
+        payload["devices"] = list(devices)
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _retiled_fields(old_config: Any, new_config: Any) -> list[str]:
+    """Auto-tuned VAE tiling fields of ``new_config`` that ``old_config``
+    does not share; the fingerprint ignores them."""
+    old_vae = getattr(old_config, "vae_config", None)
+    new_vae = getattr(new_config, "vae_config", None)
+    return [
+        name for name in getattr(new_vae, AUTO_TUNED_ATTR, ())
+        if getattr(old_vae, name, None) != getattr(new_vae, name, None)
+    ]
+
+
+_visible_devices_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def visible_devices(devices: tuple[int, ...]) -> Iterator[None]:
+    """
+    Restrict worker processes spawned inside the block to ``devices``.
+
+    Indices are relative to the GPUs this process can see. The environment
+    is process-wide, so generators for different device groups are built
+    one at a time.
+    """
+    if not devices:
+        yield
+        return
+    with _visible_devices_lock:
+        previous = os.environ.get("CUDA_VISIBLE_DEVICES")
+        visible = previous.split(",") if previous else None
+        os.environ["CUDA_VISIBLE_DEVICES"] = ",".join(
+            visible[i] if visible and i < len(visible) else str(i)
+            for i in devices)
+        try:
+            yield
+        finally:
+            if previous is None:
+                del os.environ["CUDA_VISIBLE_DEVICES"]
+            else:
+                os.environ["CUDA_VISIBLE_DEVICES"] = previous
+
+
+def _process_rss(pid: int) -> int:
+    """Resident set size of a process in bytes (Linux only, 0 elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def device_memory() -> list[tuple[int, int]]:
+    """(free, total) bytes per visible CUDA device, system-wide."""
+    try:
+        import torch
+        if not torch.cuda.is_available():
+            return []
+        return [
+            torch.cuda.mem_get_info(i)
+            for i in range(torch.cuda.device_count())
+        ]
+    except Exception:
+        return []
+
+
+def _device_free_memory() -> list[int]:
+    """Free memory per visible CUDA device, as seen by the whole system."""
+    return [free for free, _ in device_memory()]
+
+
+def _generator_workers(generator: Any) -> list[Any]:
+    executor = getattr(generator, "executor", None)
+    return list(getattr(executor, "workers", None) or [])
+
+
+def worker_memory(generator: Any) -> int:
+    """Resident host bytes of a generator's worker processes."""
+    return sum(
+        _process_rss(w.pid) for w in _generator_workers(generator)
+        if getattr(w, "pid", None))
+
+
+def host_memory(generator: Any = None) -> int:
+    """Resident host bytes of this process plus ``generator``'s workers."""
+    return _process_rss(os.getpid()) + worker_memory(generator)
+
+
+def shutdown_generator(generator: Any, timeout: float = 10.0) -> None:
+    """
+    Release a generator and make sure its worker processes are gone.
+
+    Args:
+        generator: The FastVideo generator to shut down
+        timeout: Seconds to wait for each worker before terminating it
+    """
+    workers = _generator_workers(generator)
+    try:
+        if hasattr(generator, "shutdown"):
+            generator.shutdown()
+        elif hasattr(getattr(generator, "executor", None), "shutdown"):
+            generator.executor.shutdown()
+    except Exception as e:
+        print(f"Error shutting down generator: {e}")
+
+    for worker in workers:
+        try:
+            worker.join(timeout=timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join(timeout=timeout)
+        except Exception as e:
+            print(f"Error stopping worker process: {e}")
+
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+
+@dataclasses.dataclass
+class PoolEntry:
+    key: str
+    model_path: str
+    generator: Any
+    generation_args: dict[str, Any]
+    pipeline_config: Any
+    device_bytes: int = 0
+    host_bytes: int = 0
+    load_seconds: float = 0.0
+    last_used: float = dataclasses.field(default_factory=time.monotonic)
+    uses: int = 0
+    devices: tuple[int, ...] = ()
+    parked: bool = False
+    parked_bytes: int = 0
+    restore_seconds: float = 0.0
+    # Callers between acquire() and release(); pinned entries are never
+    # evicted, parked or reconciled
+    pins: int = 0
+
+
+class _Loading:
+    """A generator build in progress that other callers can wait on."""
+
+    def __init__(self, devices: tuple[int, ...]) -> None:
+        self.devices = devices
+        self.error: BaseException | None = None
+
+
+class GeneratorPool:
+    """
+    LRU pool of FastVideo generators keyed by their config fingerprint.
+
+    Capacity and memory budgets default to the ``FASTVIDEO_POOL_CAPACITY``,
+    ``FASTVIDEO_POOL_VRAM_BUDGET_GB`` and ``FASTVIDEO_POOL_HOST_BUDGET_GB``
+    environment variables. A budget of ``None`` means unlimited. Like the
+    capacity, the budgets apply per device group.
+
+    With a ``park_budget`` (``FASTVIDEO_POOL_PARK_BUDGET_GB``), a generator
+    pushed out by capacity or the VRAM budget is parked instead of shut
+    down: its weights move to pinned host memory and its workers stay
+    alive, so using it again is a host-to-device copy. Parked generators
+    count against the park budget only and are evicted oldest first.
+
+    Generators restricted to a device group (see ``FASTVIDEO_GPU_PARTITIONS``)
+    are keyed by their devices too, and the capacity applies per group.
+
+    ``acquire`` pins the generator it returns until ``release`` is called,
+    so one still decoding on the stage pipeline is not shut down or
+    reconfigured under it; a caller that needs room waits for it instead.
+
+    Generators evicted to make room are shut down on a background thread,
+    outside the pool lock, and keep counting against their group's capacity
+    until their workers are gone.
+
+    On a miss, a pooled generator of the same model whose config differs
+    only in inference-time or component-local fields (see ``reconcile``) is
+    updated in place and re-keyed instead of building a new one.
+    """
+
+    def __init__(self,
+                 capacity: int | None = None,
+                 vram_budget: int | None = None,
+                 host_budget: int | None = None,
+                 park_budget: int | None = None) -> None:
+        self.capacity = max(
+            1, capacity if capacity is not None else env_int(
+                "FASTVIDEO_POOL_CAPACITY", 1))
+        self.vram_budget = (vram_budget if vram_budget is not None
+                            else env_gib("FASTVIDEO_POOL_VRAM_BUDGET_GB"))
+        self.host_budget = (host_budget if host_budget is not None
+                            else env_gib("FASTVIDEO_POOL_HOST_BUDGET_GB"))
+        self.park_budget = (park_budget if park_budget is not None
+                            else env_gib("FASTVIDEO_POOL_PARK_BUDGET_GB"))
+        self._entries: OrderedDict[str, PoolEntry] = OrderedDict()
+        self._loading: dict[str, _Loading] = {}
+        # Evicted generators whose workers are still shutting down
+        self._retiring: dict[int, PoolEntry] = {}
+        self._reaper: ThreadPoolExecutor | None = None
+        self._lock = threading.RLock()
+        self._loaded = threading.Condition(self._lock)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.attaches = 0
+        self.parks = 0
+        self.restores = 0
+        self.restore_seconds = 0.0
+        self.reconciles = 0
+        self._reconcile_unsupported = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Any | None:
+        """Return the generator for ``key`` and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.parked and not self._restore(entry):
+                return None
+            self._entries.move_to_end(key)
+            entry.last_used = time.monotonic()
+            entry.uses += 1
+            return entry.generator
+
+    def peek(self, key: str, pin: bool = False) -> Any | None:
+        """
+        The loaded, unparked generator for ``key``, without using it.
+
+        With ``pin``, the generator is pinned as by ``acquire`` and must be
+        released.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.parked:
+                return None
+            if pin:
+                entry.pins += 1
+            return entry.generator
+
+    def release(self, key: str, generator: Any) -> None:
+        """Unpin a generator returned by ``acquire``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generator is not generator:
+                # Discarded while pinned: the last user shuts it down.
+                # Anything else was evicted explicitly meanwhile
+                entry = next((e for e in self._retiring.values()
+                              if e.generator is generator and e.pins), None)
+                if entry is not None:
+                    entry.pins -= 1
+                    if not entry.pins:
+                        self._reap(entry)
+                return
+            entry.pins -= 1
+            self._loaded.notify_all()
+
+    def acquire(self,
+                model_path: str,
+                generation_args: dict[str, Any],
+                pipeline_config: Any,
+                factory: Callable[..., Any],
+                devices: tuple[int, ...] = ()) -> tuple[str, Any]:
+        """
+        Return a generator for the given inputs, building it on a miss.
+
+        Concurrent calls for the same inputs share one build; the lock is not
+        held while the factory runs.
+
+        Args:
+            model_path: Model id or local path
+            generation_args: Keyword arguments for the factory
+            pipeline_config: The fully overridden pipeline config
+            factory: Called as ``factory(model_path=..., **generation_args,
+                pipeline_config=...)`` to build a new generator
+            devices: GPUs the generator's workers may use (empty for all)
+
+        Returns:
+            The pool key and the generator, pinned until ``release``
+        """
+        key = generator_fingerprint(model_path, generation_args,
+                                    pipeline_config, devices)
+        attached = False
+        retile = None
+        with self._lock:
+            while True:
+                generator = self.get(key)
+                if generator is not None:
+                    self.hits += 1
+                    retile = self._retile(self._entries[key], pipeline_config)
+                    if retile is not None:
+                        break
+                    self._entries[key].pins += 1
+                    return key, generator
+                loading = self._loading.get(key)
+                if loading is None:
+                    break
+                # Someone else is building this generator; wait for it
+                # instead of starting a second load
+                if not attached:
+                    attached = True
+                    self.attaches += 1
+                    print(f"Waiting for generator {key[:12]} that is still "
+                          f"loading")
+                self._loaded.wait()
+                if loading.error is not None:
+                    raise loading.error
+
+            reconcile = retile or self._reconcile(
+                model_path, generation_args, pipeline_config, devices)
+            if reconcile is None:
+                self.misses += 1
+            while reconcile is None and self._occupied(
+                    devices) >= self.capacity:
+                # Generators still shutting down free their slot when they
+                # are gone; only evict if the live ones fill the group
+                if (self._occupied(devices, retiring=False) < self.capacity
+                        or not self._make_room(devices=devices)):
+                    self._loaded.wait()
+            loading = _Loading(devices)
+            self._loading[key] = loading
+
+        if reconcile is not None:
+            return self._apply(key, loading, *reconcile, pipeline_config)
+
+        try:
+            free_before = _device_free_memory()
+            start = time.perf_counter()
+            with visible_devices(devices):
+                generator = factory(model_path=model_path,
+                                    **generation_args,
+                                    pipeline_config=pipeline_config)
+            load_seconds = time.perf_counter() - start
+            free_after = _device_free_memory()
+        except BaseException as e:
+            with self._lock:
+                loading.error = e
+                del self._loading[key]
+                self._loaded.notify_all()
+            raise
+
+        entry = PoolEntry(
+            key=key,
+            model_path=model_path,
+            generator=generator,
+            generation_args=dict(generation_args),
+            pipeline_config=pipeline_config,
+            # Only this group's devices: other partitions may be loading
+            # at the same time
+            device_bytes=sum(
+                max(0, b - a)
+                for i, (b, a) in enumerate(zip(free_before, free_after))
+                if not devices or i in devices),
+            host_bytes=worker_memory(generator),
+            load_seconds=load_seconds,
+            uses=1,
+            devices=devices,
+            pins=1)
+        with self._lock:
+            self._entries[key] = entry
+            del self._loading[key]
+            self._loaded.notify_all()
+            print(f"Loaded generator {key[:12]} for {model_path} in "
+                  f"{load_seconds:.1f}s")
+            self._enforce_budgets(keep=key)
+        return key, generator
+
+    def _reconcile(self, model_path: str, generation_args: dict[str, Any],
+                   pipeline_config: Any, devices: tuple[int, ...]
+                   ) -> tuple[PoolEntry, ConfigDiff] | None:
+        """
+        Take out a live generator of the same model that can be brought to
+        the requested config without a rebuild.
+        """
+        new_args = canonicalize(generation_args)
+        new_config = fingerprint_config(pipeline_config)
+        closest = None
+        for entry in reversed(list(self._entries.values())):
+            if (entry.model_path != model_path or entry.devices != devices
+                    or entry.pins):
+                continue
+            if not supports_reconcile(entry.generator):
+                if not self._reconcile_unsupported:
+                    self._reconcile_unsupported = True
+                    print("FastVideo backend has no update_pipeline_config/"
+                          "reload_component hooks; config changes rebuild "
+                          "the generator")
+                return None
+            diff = diff_configs(canonicalize(entry.generation_args),
+                                fingerprint_config(entry.pipeline_config),
+                                new_args, new_config)
+            if can_apply(entry.generator, diff):
+                if entry.parked and not self._restore(entry):
+                    continue
+                del self._entries[entry.key]
+                return entry, diff
+            if closest is None:
+                closest = diff
+        if closest is not None:
+            print(f"Rebuilding generator for {model_path}, changed: "
+                  f"{', '.join(closest.changed())}")
+        return None
+
+    def _retile(self, entry: PoolEntry, pipeline_config: Any
+                ) -> tuple[PoolEntry, ConfigDiff] | None:
+        """
+        Take out a hit whose VAE tiling differs from the plan tuned for this
+        request, so ``_apply`` can reload its VAE with the new tiles.
+
+        Tuned tiles are left out of the key so one generator serves every
+        output shape; a generator that is busy or cannot reload its VAE keeps
+        the tiles it was loaded with.
+        """
+        fields = _retiled_fields(entry.pipeline_config, pipeline_config)
+        if not fields:
+            return None
+        diff = ConfigDiff(components={"vae": fields})
+        if entry.pins:
+            reason = "it is in use"
+        elif not can_apply(entry.generator, diff):
+            reason = "the backend has no reload_component hook"
+        else:
+            del self._entries[entry.key]
+            return entry, diff
+        print(f"Cannot apply the VAE tiling tuned for this request "
+              f"({', '.join(fields)}) to generator {entry.key[:12]} because "
+              f"{reason}; decoding with the tiles it was loaded with")
+        return None
+
+    def _apply(self, key: str, loading: _Loading, entry: PoolEntry,
+               diff: ConfigDiff, pipeline_config: Any) -> tuple[str, Any]:
+        """Update a generator taken out by ``_reconcile`` and re-key it."""
+        old_key = entry.key
+        start = time.perf_counter()
+        try:
+            apply_diff(entry.generator, diff, pipeline_config)
+        except BaseException as e:
+            # Half-applied: the generator matches neither config any more
+            shutdown_generator(entry.generator)
+            with self._lock:
+                self.evictions += 1
+                loading.error = e
+                del self._loading[key]
+                self._loaded.notify_all()
+            raise
+        entry.key = key
+        entry.pipeline_config = pipeline_config
+        entry.last_used = time.monotonic()
+        entry.uses += 1
+        entry.pins += 1
+        with self._lock:
+            self._entries[key] = entry
+            del self._loading[key]
+            self.reconciles += 1
+            self._loaded.notify_all()
+        print(f"Reconciled generator {old_key[:12]} -> {key[:12]} for "
+              f"{entry.model_path} in {time.perf_counter() - start:.1f}s: "
+              f"{diff.describe()}")
+        return key, entry.generator
+
+    def loading(self, key: str) -> bool:
+        """Whether the generator for ``key`` is being built right now."""
+        with self._lock:
+            return key in self._loading
+
+    def evict(self, key: str) -> bool:
+        """Shut down and remove the generator for ``key`` if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self.evictions += 1
+        print(f"Evicting generator {key[:12]} for {entry.model_path}")
+        shutdown_generator(entry.generator)
+        return True
+
+    def discard(self, key: str, generator: Any) -> None:
+        """
+        Take ``generator`` out of the pool and shut it down once it is
+        unpinned.
+
+        For generators that cannot be trusted any more, e.g. after their
+        workers were interrupted. Unlike ``evict`` this does not wait for
+        the shutdown and never shuts down a generator that is in use.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.generator is generator:
+                self._evict(key)
+
+    def _evict(self, key: str) -> None:
+        """
+        Remove the generator for ``key`` and shut it down in the background,
+        or when its last pin is released.
+
+        Called with the lock held; the shutdown joins worker processes and
+        must not block other callers.
+        """
+        entry = self._entries.pop(key)
+        self.evictions += 1
+        print(f"Evicting generator {key[:12]} for {entry.model_path}")
+        self._retiring[id(entry)] = entry
+        if not entry.pins:
+            self._reap(entry)
+
+    def _reap(self, entry: PoolEntry) -> None:
+        if self._reaper is None:
+            self._reaper = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fastvideo-pool-reaper")
+        self._reaper.submit(self._shutdown_retired, entry)
+
+    def _shutdown_retired(self, entry: PoolEntry) -> None:
+        try:
+            shutdown_generator(entry.generator)
+        finally:
+            with self._lock:
+                del self._retiring[id(entry)]
+                self._loaded.notify_all()
+
+    def clear(self) -> None:
+        """Shut down every pooled generator."""
+        with self._lock:
+            keys = list(self._entries)
+        for key in keys:
+            self.evict(key)
+
+    def _active(self, devices: tuple[int, ...] | None = None) -> list[str]:
+        """Keys of unparked generators, optionally only those on ``devices``."""
+        return [
+            k for k, e in self._entries.items()
+            if not e.parked and (devices is None or e.devices == devices)
+        ]
+
+    def _occupied(self,
+                  devices: tuple[int, ...],
+                  retiring: bool = True) -> int:
+        occupied = len(self._active(devices)) + sum(
+            1 for loading in self._loading.values()
+            if loading.devices == devices)
+        if retiring:
+            occupied += sum(1 for e in self._retiring.values()
+                            if not e.parked and e.devices == devices)
+        return occupied
+
+    def _make_room(self,
+                   keep: str | None = None,
+                   devices: tuple[int, ...] | None = None) -> bool:
+        """Park, or failing that evict, the least recently used idle one."""
+        victims = [
+            k for k in self._active(devices)
+            if k != keep and not self._entries[k].pins
+        ]
+        if not victims:
+            return False
+        if not self._park(victims[0]):
+            self._evict(victims[0])
+        return True
+
+    def _park(self, key: str) -> bool:
+        entry = self._entries[key]
+        if not self.park_budget or entry.device_bytes > self.park_budget:
+            return False
+        start = time.perf_counter()
+        try:
+            parked_bytes = park_generator(entry.generator)
+        except Exception as e:
+            print(f"Error parking generator {key[:12]}: {e}")
+            return False
+        if parked_bytes is None:
+            return False
+        entry.parked = True
+        entry.parked_bytes = parked_bytes or entry.device_bytes
+        self.parks += 1
+        print(f"Parked generator {key[:12]} for {entry.model_path} in host "
+              f"memory ({entry.parked_bytes / GIB:.1f} GiB, "
+              f"{time.perf_counter() - start:.1f}s)")
+        # Least recently used parked generators go first when the host
+        # budget is exceeded
+        while self._total("parked_bytes") > self.park_budget:
+            self._evict(next(k for k, e in self._entries.items() if e.parked))
+        return True
+
+    def _restore(self, entry: PoolEntry) -> bool:
+        while self._occupied(entry.devices) >= self.capacity:
+            if (self._occupied(entry.devices, retiring=False) >= self.capacity
+                    and self._make_room(keep=entry.key,
+                                        devices=entry.devices)):
+                continue
+            if not any(e.devices == entry.devices
+                       for e in self._retiring.values()):
+                break
+            # Let evicted generators free their memory first
+            self._loaded.wait()
+            if self._entries.get(entry.key) is not entry:
+                return False
+        start = time.perf_counter()
+        try:
+            restore_generator(entry.generator)
+        except Exception as e:
+            print(f"Error restoring generator {entry.key[:12]}: {e}")
+            self._evict(entry.key)
+            return False
+        entry.parked = False
+        entry.parked_bytes = 0
+        entry.restore_seconds = time.perf_counter() - start
+        self.restores += 1
+        self.restore_seconds += entry.restore_seconds
+        print(f"Restored parked generator {entry.key[:12]} for "
+              f"{entry.model_path} in {entry.restore_seconds:.2f}s")
+        self._enforce_budgets(keep=entry.key)
+        return True
+
+    def _total(self,
+               attr: str,
+               devices: tuple[int, ...] | None = None) -> int:
+        # Parked generators hold no device memory
+        return sum(
+            getattr(e, attr) for e in self._entries.values()
+            if not (e.parked and attr == "device_bytes") and (
+                devices is None or e.devices == devices))
+
+    def _enforce_budgets(self, keep: str) -> None:
+        """Apply the memory budgets to the device group of ``keep``."""
+        devices = self._entries[keep].devices
+        while (self.vram_budget is not None and
+               self._total("device_bytes", devices) > self.vram_budget):
+            if not self._make_room(keep=keep, devices=devices):
+                break
+        while (self.host_budget is not None
+               and self._total("host_bytes", devices) > self.host_budget):
+            victims = [
+                k for k, e in self._entries.items()
+                if k != keep and e.devices == devices and not e.pins
+            ]
+            if not victims:
+                break
+            self._evict(victims[0])
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and per-entry details for monitoring."""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "attaches": self.attaches,
+                "reconciles": self.reconciles,
+                "parks": self.parks,
+                "restores": self.restores,
+                "restore_seconds": self.restore_seconds,
+                "parked_bytes": self._total("parked_bytes"),
+                "loading": [k for k in self._loading],
+                "retiring": len(self._retiring),
+                "device_bytes": self._total("device_bytes"),
+                "host_bytes": self._total("host_bytes"),
+                "entries": [{
+                    "key": e.key,
+                    "model_path": e.model_path,
+                    "device_bytes": e.device_bytes,
+                    "host_bytes": e.host_bytes,
+                    "load_seconds": e.load_seconds,
+                    "uses": e.uses,
+                    "devices": list(e.devices),
+                    "parked": e.parked,
+                    "restore_seconds": e.restore_seconds,
+                    "pins": e.pins,
+                } for e in self._entries.values()],
+            }
+
+
+_pool: GeneratorPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_generator_pool() -> GeneratorPool:
+    """Return the process-wide generator pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GeneratorPool()
+        return _pool
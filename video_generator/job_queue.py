@@ -0,0 +1,497 @@
+from __future__ import annotations
+
+import enum
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from .generator_pool import device_memory
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job:
+    """A unit of work on the job queue and the handle passed between nodes."""
+
+    def __init__(self,
+                 fn: Callable[[Job], Any],
+                 priority: int = 0,
+                 label: str = "",
+                 num_gpus: int = 0,
+                 affinity: str | None = None,
+                 prepare: Callable[[Job, Partition], None] | None = None
+                 ) -> None:
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        # Run ahead of the job while the one before it is on the GPUs
+        self.prepare = prepare
+        self.prepared = False
+        self.priority = priority
+        self.label = label
+        self.num_gpus = num_gpus
+        self.affinity = affinity
+        # The partition running the job, set when it starts
+        self.partition: Partition | None = None
+        self.status = JobStatus.QUEUED
+        self.result: Any = None
+        self.exception: BaseException | None = None
+        self.submitted_at = time.monotonic()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.cancel_requested_at: float | None = None
+        self.cancel_requested = threading.Event()
+        # Cancelled, but left to finish in the background so its result can
+        # still be recorded
+        self.detached = False
+        self._done = threading.Event()
+        self._cancel_callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Register a callback run when cancellation is requested."""
+        with self._lock:
+            if not self.cancel_requested.is_set():
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        """Request cancellation; queued jobs are skipped, running ones notified."""
+        with self._lock:
+            if self.cancel_requested.is_set() or self.done:
+                return
+            self.cancel_requested_at = time.monotonic()
+            self.cancel_requested.set()
+            callbacks = list(self._cancel_callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancel callback of job {self.id}: {e}")
+
+    @property
+    def cancel_latency(self) -> float | None:
+        """Seconds from the cancel request until the job went idle."""
+        if self.cancel_requested_at is None or self.finished_at is None:
+            return None
+        return max(0.0, self.finished_at - self.cancel_requested_at)
+
+    def _finish(self, status: JobStatus, result: Any = None,
+                exception: BaseException | None = None) -> None:
+        self.status = status
+        self.result = result
+        self.exception = exception
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "priority": self.priority,
+            "status": self.status.value,
+            "partition": self.partition.index if self.partition else None,
+            "queued_seconds": ((self.started_at or time.monotonic()) -
+                               self.submitted_at),
+            "run_seconds": ((self.finished_at or time.monotonic()) -
+                            self.started_at) if self.started_at else 0.0,
+            "cancel_latency": self.cancel_latency,
+            "error": repr(self.exception) if self.exception else None,
+        }
+
+
+def parse_partition_policy(policy: str,
+                           device_count: int) -> list[tuple[int, ...]]:
+    """
+    Split the visible GPUs into groups that each run their own generator.
+
+    Args:
+        policy: ``""`` for one group using every GPU, ``"4x2"`` for four
+            groups of two, or group sizes such as ``"2,2,4"``
+        device_count: Number of visible GPUs
+
+    Returns:
+        Device indices per group; ``[()]`` means one unrestricted group
+
+    Raises:
+        ValueError: If the policy is malformed or needs more GPUs than exist
+    """
+    policy = policy.strip().lower()
+    if not policy:
+        return [()]
+    if "x" in policy:
+        count, size = (int(v) for v in policy.split("x", 1))
+        sizes = [size] * count
+    else:
+        sizes = [int(v) for v in policy.split(",") if v.strip()]
+    if not sizes or min(sizes) < 1:
+        raise ValueError(f"Invalid GPU partition policy {policy!r}")
+    if sum(sizes) > device_count:
+        raise ValueError(f"GPU partition policy {policy!r} needs "
+                         f"{sum(sizes)} GPUs but {device_count} are visible")
+    groups, start = [], 0
+    for size in sizes:
+        groups.append(tuple(range(start, start + size)))
+        start += size
+    return groups
+
+
+class Partition:
+    """A group of GPUs served by its own worker thread and job queue."""
+
+    def __init__(self, index: int, devices: tuple[int, ...]) -> None:
+        self.index = index
+        # Empty means every visible GPU
+        self.devices = devices
+        self.queue: list[tuple[int, int, Job]] = []
+        self.current: Job | None = None
+        self.last_affinity: str | None = None
+        self.jobs_run = 0
+        self.steals = 0
+        self.busy_seconds = 0.0
+        self.created_at = time.monotonic()
+        self.worker: threading.Thread | None = None
+        self.preparer: threading.Thread | None = None
+
+    def fits(self, job: Job) -> bool:
+        return not self.devices or job.num_gpus <= len(self.devices)
+
+    def info(self) -> dict[str, Any]:
+        busy = self.busy_seconds
+        if self.current is not None and self.current.started_at is not None:
+            busy += time.monotonic() - self.current.started_at
+        return {
+            "index": self.index,
+            "devices": list(self.devices),
+            "queued": len(self.queue),
+            "running": self.current.label if self.current else None,
+            "jobs_run": self.jobs_run,
+            "steals": self.steals,
+            "busy_seconds": round(busy, 3),
+            "utilization": round(
+                busy / max(time.monotonic() - self.created_at, 1e-9), 4),
+        }
+
+
+class JobQueue:
+    """
+    Bounded priority queue served by one worker thread per GPU partition.
+
+    By default there is a single partition, which keeps every job on the one
+    warm generator serialised while the ComfyUI executor thread is free to
+    run other nodes. With several partitions (e.g. four groups of two GPUs)
+    jobs run side by side: each job is placed on a partition it fits, one
+    that last ran the same generator if possible, and an idle partition
+    steals the most urgent fitting job from a busy one. Higher ``priority``
+    values run first; equal priorities run in FIFO order.
+
+    While a partition runs a job, the ``prepare`` step of the job queued next
+    on it runs on a helper thread. A job function can also return a
+    ``Future`` to release its partition before the job is finished.
+    """
+
+    def __init__(self,
+                 max_depth: int = 64,
+                 history: int = 256,
+                 partitions: list[tuple[int, ...]] | None = None) -> None:
+        self.max_depth = max_depth
+        self.history = history
+        self.partitions = [
+            Partition(i, tuple(devices))
+            for i, devices in enumerate(partitions or [()])
+        ]
+        self._counter = itertools.count()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._queued = 0
+
+    def max_partition_size(self) -> int | None:
+        """GPUs in the largest partition, or None if one spans every GPU."""
+        if any(not p.devices for p in self.partitions):
+            return None
+        return max(len(p.devices) for p in self.partitions)
+
+    def submit(self,
+               fn: Callable[[Job], Any],
+               priority: int = 0,
+               label: str = "",
+               num_gpus: int = 0,
+               affinity: str | None = None,
+               prepare: Callable[[Job, Partition], None] | None = None
+               ) -> Job:
+        """
+        Enqueue ``fn`` and return its job handle immediately.
+
+        Args:
+            fn: Called with the job on a worker thread; its return value
+                becomes the job result. If it returns a ``Future`` the
+                partition moves on to the next job and this one finishes
+                when the future does
+            priority: Higher values are scheduled first
+            label: Free-form description shown in status output
+            num_gpus: GPUs the job needs (0 = any partition will do)
+            affinity: Identifies the generator the job uses, so it is placed
+                where that generator is likely still loaded
+            prepare: Called with the job and its partition on a helper
+                thread while the job ahead of it runs, e.g. to encode its
+                prompt
+
+        Raises:
+            JobQueueFullError: If ``max_depth`` jobs are already waiting
+            ValueError: If no partition has ``num_gpus`` GPUs
+        """
+        job = Job(fn,
+                  priority=priority,
+                  label=label,
+                  num_gpus=num_gpus,
+                  affinity=affinity,
+                  prepare=prepare)
+        with self._lock:
+            if self._queued >= self.max_depth:
+                raise JobQueueFullError(
+                    f"FastVideo job queue is full ({self.max_depth} jobs "
+                    "waiting)")
+            candidates = [p for p in self.partitions if p.fits(job)]
+            if not candidates:
+                raise ValueError(
+                    f"Job needs {num_gpus} GPUs but the largest partition "
+                    f"has {self.max_partition_size()}")
+            partition = min(
+                candidates,
+                key=lambda p: (affinity is None or p.last_affinity !=
+                               affinity, len(p.queue) +
+                               (p.current is not None), p.index))
+            heapq.heappush(partition.queue,
+                           (-priority, next(self._counter), job))
+            self._queued += 1
+            self._jobs[job.id] = job
+            self._trim_history()
+            self._ensure_workers()
+            self._work_available.notify_all()
+        return job
+
+    def add_completed(self, result: Any, label: str = "") -> Job:
+        """Register a job whose result is already known, e.g. a cache hit."""
+        job = Job(lambda job: result, label=label)
+        job.started_at = job.submitted_at
+        job._finish(JobStatus.DONE, result=result)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_history()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self) -> dict[str, Any]:
+        counts = {status.value: 0 for status in JobStatus}
+        latencies = []
+        for job in self.jobs():
+            counts[job.status.value] += 1
+            if job.cancel_latency is not None:
+                latencies.append(job.cancel_latency)
+        latencies.sort()
+        with self._lock:
+            partitions = [p.info() for p in self.partitions]
+        return {
+            "depth": self._queued,
+            "max_depth": self.max_depth,
+            **counts,
+            "cancel_latency_p50":
+            latencies[len(latencies) // 2] if latencies else None,
+            "cancel_latency_max": latencies[-1] if latencies else None,
+            "partitions": partitions,
+        }
+
+    def _trim_history(self) -> None:
+        while len(self._jobs) > self.history:
+            oldest = next(iter(self._jobs.values()))
+            if not oldest.done:
+                break
+            self._jobs.popitem(last=False)
+
+    def _ensure_workers(self) -> None:
+        for partition in self.partitions:
+            if partition.worker is None or not partition.worker.is_alive():
+                partition.worker = threading.Thread(
+                    target=self._work,
+                    args=(partition, ),
+                    name=f"fastvideo-job-queue-{partition.index}",
+                    daemon=True)
+                partition.worker.start()
+
+    def _next_job(self, partition: Partition) -> Job | None:
+        if partition.queue:
+            return heapq.heappop(partition.queue)[2]
+        # Steal the most urgent job this partition fits from a busy one
+        best = None
+        for other in self.partitions:
+            if other is partition or other.current is None:
+                continue
+            for entry in other.queue:
+                if partition.fits(entry[2]) and (best is None
+                                                 or entry < best[0]):
+                    best = (entry, other)
+        if best is None:
+            return None
+        entry, other = best
+        other.queue.remove(entry)
+        heapq.heapify(other.queue)
+        partition.steals += 1
+        return entry[2]
+
+    def _work(self, partition: Partition) -> None:
+        while True:
+            with self._lock:
+                job = self._next_job(partition)
+                while job is None:
+                    self._work_available.wait()
+                    job = self._next_job(partition)
+                self._queued -= 1
+                partition.current = job
+                preparer = partition.preparer
+            if preparer is not None:
+                # Most likely preparing this very job; let it finish first
+                preparer.join()
+            with self._lock:
+                self._prepare_next(partition)
+            job.partition = partition
+            start = time.monotonic()
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    partition.current = None
+                    partition.jobs_run += 1
+                    partition.busy_seconds += time.monotonic() - start
+                    if job.affinity is not None:
+                        partition.last_affinity = job.affinity
+                    # Jobs left on a busy partition can be stolen now
+                    self._work_available.notify_all()
+
+    def _prepare_next(self, partition: Partition) -> None:
+        """Start preparing the job that will run after the current one."""
+        if not partition.queue:
+            return
+        job = partition.queue[0][2]
+        if job.prepare is None or job.prepared:
+            return
+        job.prepared = True
+
+        def prepare() -> None:
+            try:
+                job.prepare(job, partition)
+            except Exception as e:
+                # The job does the work itself when it runs
+                print(f"Error preparing job {job.id}: {e}")
+
+        partition.preparer = threading.Thread(
+            target=prepare,
+            name=f"fastvideo-prepare-{partition.index}",
+            daemon=True)
+        partition.preparer.start()
+
+    @staticmethod
+    def _run(job: Job) -> None:
+        if job.cancel_requested.is_set():
+            job._finish(JobStatus.CANCELLED)
+            return
+        job.status = JobStatus.RUNNING
+        job.started_at = time.monotonic()
+        try:
+            result = job.fn(job)
+        except BaseException as e:
+            status = (JobStatus.CANCELLED
+                      if job.cancel_requested.is_set() else JobStatus.FAILED)
+            job._finish(status, exception=e)
+            return
+        if isinstance(result, Future):
+            # The rest of the job runs on stage threads
+            result.add_done_callback(JobQueue._finish_deferred(job))
+            return
+        job._finish(JobStatus.CANCELLED if job.detached else JobStatus.DONE,
+                    result=result)
+
+    @staticmethod
+    def _finish_deferred(job: Job) -> Callable[[Future], None]:
+
+        def finish(future: Future) -> None:
+            exception = future.exception()
+            if exception is None:
+                job._finish(
+                    JobStatus.CANCELLED if job.detached else JobStatus.DONE,
+                    result=future.result())
+            elif job.cancel_requested.is_set():
+                job._finish(JobStatus.CANCELLED, exception=exception)
+            else:
+                job._finish(JobStatus.FAILED, exception=exception)
+
+        return finish
+
+
+_job_queue: JobQueue | None = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Return the process-wide job queue.
+
+    ``FASTVIDEO_QUEUE_DEPTH`` bounds it and ``FASTVIDEO_GPU_PARTITIONS``
+    splits the GPUs into independently scheduled groups.
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            try:
+                depth = int(os.environ.get("FASTVIDEO_QUEUE_DEPTH", 64))
+            except ValueError:
+                depth = 64
+            try:
+                partitions = parse_partition_policy(
+                    os.environ.get("FASTVIDEO_GPU_PARTITIONS", ""),
+                    len(device_memory()))
+            except ValueError as e:
+                print(f"Ignoring FASTVIDEO_GPU_PARTITIONS: {e}")
+                partitions = [()]
+            _job_queue = JobQueue(max_depth=max(1, depth),
+                                  partitions=partitions)
+        return _job_queue
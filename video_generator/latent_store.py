@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+import torch
+
+from .node_helpers import GIB, canonicalize, env_gib
+from .result_cache import request_fingerprint
+
+# Settings that only affect decoding, so changing them reuses the latents
+VAE_FIELDS = ("vae_config", "vae_precision", "vae_tiling", "vae_sp")
+DECODE_ONLY_ARGS = ("fps", )
+
+
+def latent_key(model_path: str, generation_args: dict[str, Any],
+               pipeline_config: Any, prompt: str,
+               inference_args: dict[str, Any],
+               image_digest: str | None = None) -> str:
+    """
+    Content address of a denoise: the request fingerprint minus VAE settings.
+
+    Args:
+        model_path: Model id or local path
+        generation_args: Keyword arguments passed to ``from_pretrained``
+        pipeline_config: The fully overridden pipeline config
+        prompt: Text prompt
+        inference_args: Arguments from the ``InferenceArgs`` node
+        image_digest: Content hash of the conditioning image tensor, if any
+
+    Returns:
+        Hex digest identifying the denoised latents
+    """
+    config = canonicalize(pipeline_config)
+    if isinstance(config, dict):
+        config = {k: v for k, v in config.items() if k not in VAE_FIELDS}
+    args = {
+        k: v
+        for k, v in inference_args.items() if k not in DECODE_ONLY_ARGS
+    }
+    return request_fingerprint(model_path, generation_args, config, prompt,
+                               args, image_digest)
+
+
+class LatentStore:
+    """
+    Denoised latents on disk, one ``torch.save`` file per key.
+
+    Entries are loaded with ``mmap=True`` so handing latents between nodes
+    and to the decoder does not copy them into memory up front. The store
+    is trimmed least recently used first to ``max_bytes``.
+    """
+
+    def __init__(self, root: str, max_bytes: int | None = None) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.pt")
+
+    def get(self, key: str) -> torch.Tensor | None:
+        path = self.path(key)
+        try:
+            latents = torch.load(path, mmap=True, weights_only=True)
+        except (OSError, RuntimeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return latents
+
+    def put(self, key: str, latents: torch.Tensor) -> torch.Tensor:
+        """Store ``latents`` and return them memory-mapped from disk."""
+        latents = latents.detach().to("cpu").contiguous()
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            torch.save(latents, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing latents: {e}")
+            return latents
+        self._trim(keep=path)
+        return self.get(key) if os.path.exists(path) else latents
+
+    def _trim(self, keep: str) -> None:
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.root):
+                if entry.is_file() and entry.name.endswith(".pt"):
+                    st = entry.stat()
+                    files.append((st.st_mtime, st.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_store: LatentStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_latent_store() -> LatentStore:
+    """
+    Return the process-wide latent store.
+
+    Configured with ``FASTVIDEO_LATENT_DIR`` (default
+    ``~/.cache/fastvideo_comfyui/latents``) and ``FASTVIDEO_LATENT_STORE_GB``
+    (default 50).
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            root = os.environ.get("FASTVIDEO_LATENT_DIR") or os.path.join(
+                os.path.expanduser("~"), ".cache", "fastvideo_comfyui",
+                "latents")
+            max_bytes = env_gib("FASTVIDEO_LATENT_STORE_GB")
+            _store = LatentStore(root,
+                                 max_bytes=max_bytes
+                                 if max_bytes is not None else 50 * GIB)
+        return _store
+
+
+def decode_latents(generator: Any, latents: torch.Tensor, output_path: str,
+                   prompt: str, save_video: bool, return_frames: bool,
+                   fps: float) -> Any:
+    """
+    Run only the VAE (and muxing) of a generator on stored latents.
+
+    Needs a backend with a ``decode_latents`` hook; it receives the same
+    ``output_path``/``prompt`` as ``generate_video`` so the video ends up
+    where a full generation would have written it.
+    """
+    decode = getattr(generator, "decode_latents", None)
+    if not callable(decode):
+        raise RuntimeError(
+            "This FastVideo version cannot decode latents separately")
+    return decode(latents,
+                  output_path=output_path,
+                  prompt=prompt,
+                  save_video=save_video,
+                  return_frames=return_frames,
+                  fps=fps)
+
+
+def latent_output(latents: torch.Tensor, **meta: Any) -> dict[str, Any]:
+    """Wrap latents in ComfyUI's ``LATENT`` dict with what decoding needs."""
+    return {"samples": latents, "fastvideo": meta}
@@ -1,12 +1,191 @@
 import hashlib
 import os
+import threading
+from collections import OrderedDict
+from typing import Any
 
 import folder_paths
 import numpy as np
 import torch
-from PIL import Image, ImageOps, ImageSequence
+from PIL import Image, ImageOps
 
-from .node_helpers import pillow
+from .node_helpers import fast_hasher, hash_file, hasher, pillow
+
+# "sha256" (default), "comfy" for ComfyUI's --default-hashing-function, or
+# "fast" for a non-cryptographic hash
+IMAGE_HASH = os.environ.get("FASTVIDEO_IMAGE_HASH", "sha256")
+
+_hash_memo: OrderedDict[tuple, str] = OrderedDict()
+_hash_memo_lock = threading.Lock()
+_HASH_MEMO_SIZE = 1024
+
+
+def _hash_function():
+    if IMAGE_HASH == "comfy":
+        return hasher()
+    if IMAGE_HASH == "fast":
+        return fast_hasher()
+    return hashlib.sha256
+
+
+def file_digest(path: str) -> str:
+    """Hash of a file, memoized on (path, size, mtime_ns, inode)."""
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns, st.st_ino, IMAGE_HASH)
+    with _hash_memo_lock:
+        digest = _hash_memo.get(key)
+        if digest is not None:
+            _hash_memo.move_to_end(key)
+            return digest
+    digest = hash_file(path, _hash_function())
+    with _hash_memo_lock:
+        _hash_memo[key] = digest
+        while len(_hash_memo) > _HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return digest
+
+
+class _InputListing:
+    """
+    Cached image listing of the input directory.
+
+    The listing is rebuilt only when the directory mtime changes (or an
+    inotify event arrives, when ``inotify_simple`` is installed). Entries
+    come from ``os.scandir`` and content-type classification is remembered
+    per filename, so only newly added files are classified.
+    """
+
+    def __init__(self) -> None:
+        self.directory: str | None = None
+        self.mtime_ns: int | None = None
+        self.files: list[str] = []
+        self.is_image: dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self._inotify = None
+
+    def _watch(self, directory: str) -> None:
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return
+        try:
+            self._inotify = INotify(nonblocking=True)
+            self._inotify.add_watch(
+                directory, flags.CREATE | flags.DELETE | flags.MOVED_TO
+                | flags.MOVED_FROM | flags.CLOSE_WRITE)
+        except OSError:
+            self._inotify = None
+
+    def _changed_since_scan(self, directory: str, mtime_ns: int) -> bool:
+        if directory != self.directory or mtime_ns != self.mtime_ns:
+            return True
+        if self._inotify is not None:
+            try:
+                return bool(self._inotify.read(timeout=0))
+            except OSError:
+                return True
+        return False
+
+    def list_images(self, directory: str) -> list[str]:
+        with self._lock:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            if not self._changed_since_scan(directory, mtime_ns):
+                return self.files
+
+            if directory != self.directory:
+                self.is_image = {}
+                if self._inotify is not None:
+                    self._inotify.close()
+                    self._inotify = None
+                self._watch(directory)
+
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+            new_names = [name for name in names if name not in self.is_image]
+            if new_names:
+                images = set(
+                    folder_paths.filter_files_content_types(
+                        new_names, ["image"]))
+                for name in new_names:
+                    self.is_image[name] = name in images
+            for name in set(self.is_image) - names:
+                del self.is_image[name]
+
+            self.directory = directory
+            self.mtime_ns = mtime_ns
+            self.files = sorted(name for name in names if self.is_image[name])
+            return self.files
+
+
+_input_listing = _InputListing()
+
+# Set on IMAGE outputs whose first frame is exactly what a loader of the
+# file decodes: (path, size, mtime_ns) of that file
+_SOURCE_ATTR = "_fastvideo_source"
+
+
+def image_source(image: Any) -> str | None:
+    """
+    The file an IMAGE tensor was decoded from by ``Load Image Path``.
+
+    Only set while the tensor's first frame is the file's first frame as
+    decoded with EXIF orientation applied, and only returned while the file
+    is unchanged; any other tensor, including one derived from it, gives
+    None.
+    """
+    source = getattr(image, _SOURCE_ATTR, None)
+    if source is None:
+        return None
+    path, size, mtime_ns = source
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+        return None
+    return path
+
+
+# Decoded (image, mask, source) triples, bounded by FASTVIDEO_IMAGE_CACHE_MB
+_decoded_cache: OrderedDict[tuple, tuple[torch.Tensor, torch.Tensor,
+                                         tuple | None]] = OrderedDict()
+_decoded_cache_bytes = 0
+_decoded_cache_lock = threading.Lock()
+_DECODED_CACHE_LIMIT = int(
+    float(os.environ.get("FASTVIDEO_IMAGE_CACHE_MB", 512)) * 1024 * 1024)
+
+
+def _decoded_cache_get(
+        key: tuple) -> tuple[torch.Tensor, torch.Tensor, tuple | None] | None:
+    with _decoded_cache_lock:
+        cached = _decoded_cache.get(key)
+        if cached is None:
+            return None
+        _decoded_cache.move_to_end(key)
+    # Downstream nodes may modify their inputs in place; the cached tensors
+    # are never handed out
+    image, mask, source = cached
+    return image.clone(), mask.clone(), source
+
+
+def _decoded_cache_put(
+        key: tuple, value: tuple[torch.Tensor, torch.Tensor,
+                                 tuple | None]) -> None:
+    global _decoded_cache_bytes
+    size = sum(t.element_size() * t.nelement() for t in value[:2])
+    if size > _DECODED_CACHE_LIMIT:
+        return
+    # The caller keeps the originals
+    value = (value[0].clone(), value[1].clone(), value[2])
+    with _decoded_cache_lock:
+        if key in _decoded_cache:
+            return
+        _decoded_cache[key] = value
+        _decoded_cache_bytes += size
+        while _decoded_cache_bytes > _DECODED_CACHE_LIMIT:
+            _, evicted = _decoded_cache.popitem(last=False)
+            _decoded_cache_bytes -= sum(t.element_size() * t.nelement()
+                                        for t in evicted[:2])
 
 
 class LoadImagePath:
@@ -14,17 +193,23 @@ class LoadImagePath:
     @classmethod
     def INPUT_TYPES(s):
         input_dir = folder_paths.get_input_directory()
-        files = [
-            f for f in os.listdir(input_dir)
-            if os.path.isfile(os.path.join(input_dir, f))
-        ]
-        files = folder_paths.filter_files_content_types(files, ["image"])
+        files = _input_listing.list_images(input_dir)
         return {
             "required": {
-                "image": (sorted(files), {
+                "image": (list(files), {
                     "image_upload": True
                 })
             },
+            "optional": {
+                "frame_start": ("INT", {
+                    "default": 0,
+                    "min": 0
+                }),
+                "frame_count": ("INT", {
+                    "default": 0,
+                    "min": 0
+                }),
+            },
         }
 
     CATEGORY = "fastvideo"
@@ -33,70 +218,100 @@ class LoadImagePath:
     RETURN_NAMES = ("image_path", "IMAGE", "MASK")
     FUNCTION = "load_image"
 
-    def load_image(self, image):
+    def load_image(self, image, frame_start=0, frame_count=0):
         image_path = folder_paths.get_annotated_filepath(image)
 
-        img = pillow(Image.open, image_path)
+        st = os.stat(image_path)
+        cache_key = (image_path, st.st_size, st.st_mtime_ns, st.st_ino,
+                     frame_start, frame_count)
+        cached = _decoded_cache_get(cache_key)
+        if cached is not None:
+            output_image, output_mask, source = cached
+            if source is not None:
+                setattr(output_image, _SOURCE_ATTR, source)
+            return (image_path, output_image, output_mask)
 
-        output_images: list[torch.Tensor] = []
-        output_masks: list[torch.Tensor] = []
-        w, h = None, None
+        img = pillow(Image.open, image_path)
 
         excluded_formats = ['MPO']
 
-        for i in ImageSequence.Iterator(img):
-            processed_image = pillow(ImageOps.exif_transpose, i)
+        # Count frames up front so the output can be allocated once
+        n_frames = getattr(img, "n_frames", 1)
+        if img.format in excluded_formats:
+            n_frames = 1
+        start = min(max(frame_start, 0), n_frames - 1)
+        stop = n_frames if frame_count <= 0 else min(n_frames,
+                                                     start + frame_count)
+
+        output_image: torch.Tensor | None = None
+        output_mask: torch.Tensor | None = None
+        count = 0
+        # Whether frame 0 of the output is the file's first frame unchanged
+        exact = start == 0
+        w, h = None, None
+
+        for index in range(start, stop):
+            img.seek(index)
+            processed_image = pillow(ImageOps.exif_transpose, img)
             if processed_image is None:
                 continue
 
             if processed_image.mode == 'I':
+                exact = exact and count > 0
                 processed_image = processed_image.point(lambda i: i * (1 / 255))
-            image = processed_image.convert("RGB")
+            rgb_image = processed_image.convert("RGB")
 
-            if len(output_images) == 0:
-                w = image.size[0]
-                h = image.size[1]
+            if output_image is None:
+                w = rgb_image.size[0]
+                h = rgb_image.size[1]
+                output_image = torch.empty((stop - start, h, w, 3),
+                                           dtype=torch.float32)
 
-            if image.size[0] != w or image.size[1] != h:
+            if rgb_image.size[0] != w or rgb_image.size[1] != h:
                 continue
+            if count == 0 and index != 0:
+                exact = False
+
+            # Assigning into the float32 view casts uint8 without a temporary
+            output_image[count].numpy()[...] = np.asarray(rgb_image)
 
-            image = np.array(image).astype(np.float32) / 255.0
-            image = torch.from_numpy(image)[
-                None,
-            ]
+            alpha = None
             if 'A' in processed_image.getbands():
-                mask = np.array(processed_image.getchannel('A')).astype(
-                    np.float32) / 255.0
-                mask = 1. - torch.from_numpy(mask)
+                alpha = processed_image.getchannel('A')
             elif processed_image.mode == 'P' and 'transparency' in processed_image.info:
-                mask = np.array(
-                    processed_image.convert('RGBA').getchannel('A')).astype(
-                        np.float32) / 255.0
-                mask = 1. - torch.from_numpy(mask)
-            else:
-                mask = torch.zeros((64, 64), dtype=torch.float32, device="cpu")
-            output_images.append(image)
-            output_masks.append(mask.unsqueeze(0))
-
-        if len(output_images) > 1 and img.format not in excluded_formats:
-            output_image = torch.cat(output_images, dim=0)
-            output_mask = torch.cat(output_masks, dim=0)
+                alpha = processed_image.convert('RGBA').getchannel('A')
+            if alpha is not None:
+                if output_mask is None:
+                    # Frames without alpha end up as 0 after the inversion
+                    output_mask = torch.full((stop - start, h, w), 255.0)
+                output_mask[count].numpy()[...] = np.asarray(alpha)
+            count += 1
+
+        if output_image is None:
+            raise ValueError(f"No frames could be decoded from {image_path}")
+
+        # Single vectorized uint8 -> [0, 1] conversion over all frames
+        output_image = output_image[:count].mul_(1.0 / 255.0)
+        if output_mask is not None:
+            output_mask = output_mask[:count].mul_(-1.0 / 255.0).add_(1.0)
         else:
-            output_image = output_images[0]
-            output_mask = output_masks[0]
+            output_mask = torch.zeros((count, 64, 64),
+                                      dtype=torch.float32,
+                                      device="cpu")
 
+        source = (image_path, st.st_size, st.st_mtime_ns) if exact else None
+        _decoded_cache_put(cache_key, (output_image, output_mask, source))
+        if source is not None:
+            setattr(output_image, _SOURCE_ATTR, source)
         return (image_path, output_image, output_mask)
 
     @classmethod
-    def IS_CHANGED(s, image):
+    def IS_CHANGED(s, image, **kwargs):
         image_path = folder_paths.get_annotated_filepath(image)
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        return m.digest().hex()
+        return file_digest(image_path)
 
     @classmethod
-    def VALIDATE_INPUTS(s, image):
+    def VALIDATE_INPUTS(s, image, **kwargs):
         if not folder_paths.exists_annotated_filepath(image):
             return "Invalid image file: {}".format(image)
 
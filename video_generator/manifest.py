@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+MANIFEST_NAME = ".fastvideo_manifest.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    fingerprint TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    prompt TEXT,
+    frame_count INTEGER,
+    fps REAL,
+    duration REAL,
+    stats TEXT,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outputs_created ON outputs (created);
+CREATE INDEX IF NOT EXISTS outputs_last_used ON outputs (last_used);
+"""
+
+_COLUMNS = ("fingerprint", "path", "size", "mtime_ns", "prompt",
+            "frame_count", "fps", "duration", "stats", "created", "last_used")
+
+
+def _entry(row: tuple) -> dict[str, Any]:
+    entry = dict(zip(_COLUMNS, row))
+    entry["stats"] = json.loads(entry["stats"]) if entry["stats"] else {}
+    return entry
+
+
+class OutputManifest:
+    """
+    SQLite index of the videos written under one output path.
+
+    One row per generation fingerprint with the exact file written, its size
+    and mtime, the prompt, frame count, fps, duration and stage timings.
+    Lookups by fingerprint and "most recent" queries use indexes, so they
+    stay fast however many videos the directory holds. Other processes and
+    nodes can read the same file.
+    """
+
+    def __init__(self, output_path: str) -> None:
+        self.output_path = output_path
+        self.path = os.path.join(output_path, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if not self._ready:
+                os.makedirs(self.output_path, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._ready = True
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM outputs "
+                "WHERE fingerprint = ?", (fingerprint, )).fetchone()
+        return _entry(row) if row else None
+
+    def put(self,
+            fingerprint: str,
+            path: str,
+            prompt: str = "",
+            frame_count: int = 0,
+            fps: float = 0.0,
+            stats: dict[str, Any] | None = None) -> dict[str, Any] | None:
+        """
+        Record the video written for ``fingerprint``.
+
+        Returns:
+            The stored entry, or None if ``path`` does not exist
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        now = time.time()
+        entry = {
+            "fingerprint": fingerprint,
+            "path": path,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "prompt": prompt,
+            "frame_count": frame_count,
+            "fps": fps,
+            "duration": frame_count / fps if fps else 0.0,
+            "stats": json.dumps(stats or {}),
+            "created": now,
+            "last_used": now,
+        }
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO outputs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [entry[c] for c in _COLUMNS])
+        entry["stats"] = stats or {}
+        return entry
+
+    def touch(self, fingerprint: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outputs SET last_used = ? WHERE fingerprint = ?",
+                (time.time(), fingerprint))
+
+    def remove(self, fingerprint: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM outputs WHERE fingerprint = ?",
+                         (fingerprint, ))
+
+    def query(self,
+              prompt: str = "",
+              limit: int = 50,
+              order_by: str = "created DESC") -> list[dict[str, Any]]:
+        """
+        Entries, newest first by default.
+
+        Args:
+            prompt: Only entries whose prompt contains this text
+            limit: Maximum number of entries
+            order_by: ``created`` or ``last_used``, ``ASC`` or ``DESC``
+        """
+        if order_by not in ("created DESC", "created ASC", "last_used DESC",
+                            "last_used ASC"):
+            raise ValueError(f"Unsupported order {order_by!r}")
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM outputs"
+        params: list[Any] = []
+        if prompt:
+            sql += " WHERE instr(prompt, ?) > 0"
+            params.append(prompt)
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [_entry(row) for row in rows]
+
+    def latest(self) -> dict[str, Any] | None:
+        entries = self.query(limit=1)
+        return entries[0] if entries else None
+
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM outputs").fetchone()[0]
+
+    def unused_since(self, cutoff: float) -> list[dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM outputs "
+                "WHERE last_used < ?", (cutoff, )).fetchall()
+        return [_entry(row) for row in rows]
+
+
+_manifests: dict[str, OutputManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_output_manifest(output_path: str) -> OutputManifest:
+    """Return the manifest of an output directory."""
+    output_path = os.path.abspath(output_path)
+    with _manifests_lock:
+        manifest = _manifests.get(output_path)
+        if manifest is None:
+            manifest = OutputManifest(output_path)
+            _manifests[output_path] = manifest
+        return manifest
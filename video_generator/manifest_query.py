@@ -0,0 +1,65 @@
+import json
+import os
+
+from .manifest import get_output_manifest
+
+
+class FastVideoManifest:
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "output_path": ("STRING", {
+                    "default": "/workspace/ComfyUI/outputs_video/"
+                }),
+            },
+            "optional": {
+                "prompt_filter": ("STRING", {
+                    "default": ""
+                }),
+                "fingerprint": ("STRING", {
+                    "default": ""
+                }),
+                "limit": ("INT", {
+                    "default": 10,
+                    "min": 1,
+                    "max": 1000
+                }),
+            }
+        }
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, **kwargs):
+        return True
+
+    @classmethod
+    def IS_CHANGED(cls, output_path, **kwargs):
+        # Any write to the manifest touches the database or its WAL file
+        manifest = get_output_manifest(output_path)
+        stamps = []
+        for path in (manifest.path, f"{manifest.path}-wal"):
+            try:
+                stamps.append(str(os.stat(path).st_mtime_ns))
+            except OSError:
+                stamps.append("missing")
+        return ":".join(stamps)
+
+    RETURN_TYPES = ("STRING", "STRING", "INT", "FLOAT", "STRING")
+    RETURN_NAMES = ("video_path", "video_paths", "frame_count", "fps",
+                    "entries")
+    FUNCTION = "query"
+    CATEGORY = "fastvideo"
+
+    def query(self, output_path, prompt_filter="", fingerprint="", limit=10):
+        manifest = get_output_manifest(output_path)
+        if fingerprint:
+            entry = manifest.get(fingerprint)
+            entries = [entry] if entry is not None else []
+        else:
+            entries = manifest.query(prompt=prompt_filter, limit=limit)
+        latest = entries[0] if entries else {}
+        return (latest.get("path", ""),
+                "\n".join(entry["path"] for entry in entries),
+                latest.get("frame_count") or 0, latest.get("fps") or 0.0,
+                json.dumps(entries))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from .generator_pool import device_memory, get_generator_pool, host_memory
+from .job_queue import get_job_queue
+
+# FASTVIDEO_METRICS=0 swaps every timer for a no-op
+ENABLED = os.environ.get("FASTVIDEO_METRICS", "1") != "0"
+METRICS_FILE = os.environ.get("FASTVIDEO_METRICS_FILE", "")
+
+
+class StageTimer:
+    """Wall-clock time per stage plus peak memory sampled at stage edges."""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+        self.peak_device_bytes: dict[int, int] = {}
+        self.peak_host_bytes = 0
+        self._generator: Any = None
+
+    def attach(self, generator: Any) -> None:
+        """Include the generator's worker processes in host memory samples."""
+        self._generator = generator
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+            self.sample_memory()
+
+    def sample_memory(self) -> None:
+        for i, (free, total) in enumerate(device_memory()):
+            used = total - free
+            if used > self.peak_device_bytes.get(i, 0):
+                self.peak_device_bytes[i] = used
+        self.peak_host_bytes = max(self.peak_host_bytes,
+                                   host_memory(self._generator))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {k: round(v, 6)
+                       for k, v in self.stages.items()},
+            "peak_device_bytes": dict(self.peak_device_bytes),
+            "peak_host_bytes": self.peak_host_bytes,
+        }
+
+
+class NullTimer:
+    """Drop-in for StageTimer when metrics are disabled."""
+
+    def attach(self, generator: Any) -> None:
+        pass
+
+    def add(self, name: str, seconds: float) -> None:
+        pass
+
+    def stage(self, name: str) -> contextlib.nullcontext:
+        return contextlib.nullcontext()
+
+    def sample_memory(self) -> None:
+        pass
+
+    def as_dict(self) -> dict[str, Any]:
+        return {}
+
+
+_NULL_TIMER = NullTimer()
+
+
+def new_timer() -> StageTimer | NullTimer:
+    return StageTimer() if ENABLED else _NULL_TIMER
+
+
+class MetricsRegistry:
+    """
+    Process-wide aggregates written in the Prometheus text format.
+
+    The file is rewritten atomically after every job, which is what the
+    node-exporter textfile collector expects.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._stage_sum: dict[str, float] = {}
+        self._stage_count: dict[str, int] = {}
+        self._stage_last: dict[str, float] = {}
+        self._jobs: dict[str, int] = {}
+        self._peak_device: dict[int, int] = {}
+        self._peak_host = 0
+
+    def observe(self, status: str, stats: dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[status] = self._jobs.get(status, 0) + 1
+            for stage, seconds in stats.get("stages", {}).items():
+                self._stage_sum[stage] = self._stage_sum.get(stage,
+                                                             0.0) + seconds
+                self._stage_count[stage] = self._stage_count.get(stage, 0) + 1
+                self._stage_last[stage] = seconds
+            for device, used in stats.get("peak_device_bytes", {}).items():
+                self._peak_device[device] = max(
+                    self._peak_device.get(device, 0), used)
+            self._peak_host = max(self._peak_host,
+                                  stats.get("peak_host_bytes", 0))
+            if self.path:
+                self._write()
+
+    def render(self, extra: dict[str, float] | None = None) -> str:
+        lines = [
+            "# HELP fastvideo_jobs_total Finished FastVideo jobs by status.",
+            "# TYPE fastvideo_jobs_total counter",
+        ]
+        lines += [
+            f'fastvideo_jobs_total{{status="{status}"}} {count}'
+            for status, count in sorted(self._jobs.items())
+        ]
+        lines += [
+            "# HELP fastvideo_stage_seconds Time spent per pipeline stage.",
+            "# TYPE fastvideo_stage_seconds summary",
+        ]
+        for stage in sorted(self._stage_sum):
+            lines.append(f'fastvideo_stage_seconds_sum{{stage="{stage}"}} '
+                         f"{self._stage_sum[stage]:.6f}")
+            lines.append(f'fastvideo_stage_seconds_count{{stage="{stage}"}} '
+                         f"{self._stage_count[stage]}")
+        lines += [
+            "# HELP fastvideo_stage_last_seconds Duration of the last run "
+            "of each stage.",
+            "# TYPE fastvideo_stage_last_seconds gauge",
+        ]
+        lines += [
+            f'fastvideo_stage_last_seconds{{stage="{stage}"}} {seconds:.6f}'
+            for stage, seconds in sorted(self._stage_last.items())
+        ]
+        lines += [
+            "# HELP fastvideo_peak_device_bytes Peak used memory per GPU.",
+            "# TYPE fastvideo_peak_device_bytes gauge",
+        ]
+        lines += [
+            f'fastvideo_peak_device_bytes{{device="{device}"}} {used}'
+            for device, used in sorted(self._peak_device.items())
+        ]
+        lines += [
+            "# HELP fastvideo_peak_host_bytes Peak resident host memory.",
+            "# TYPE fastvideo_peak_host_bytes gauge",
+            f"fastvideo_peak_host_bytes {self._peak_host}",
+        ]
+        for name, value in sorted((extra or {}).items()):
+            lines.append(f"fastvideo_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _write(self) -> None:
+        pool = get_generator_pool().stats()
+        extra = {
+            "generator_pool_hits_total": pool["hits"],
+            "generator_pool_misses_total": pool["misses"],
+            "generator_pool_evictions_total": pool["evictions"],
+            "generator_pool_reconciles_total": pool["reconciles"],
+            "generator_pool_parks_total": pool["parks"],
+            "generator_pool_restores_total": pool["restores"],
+            "generator_pool_restore_seconds_total": pool["restore_seconds"],
+            "generator_pool_parked_bytes": pool["parked_bytes"],
+        }
+        for partition in get_job_queue().stats()["partitions"]:
+            label = f'{{partition="{partition["index"]}"}}'
+            extra[f"partition_utilization{label}"] = partition["utilization"]
+            extra[f"partition_jobs_total{label}"] = partition["jobs_run"]
+            extra[f"partition_steals_total{label}"] = partition["steals"]
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                        exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.render(extra))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error writing FastVideo metrics: {e}")
+
+
+_registry = MetricsRegistry(METRICS_FILE)
+
+
+def observe_job(status: str, stats: dict[str, Any]) -> None:
+    """Fold one job's stats into the process-wide metrics."""
+    if ENABLED:
+        _registry.observe(status, stats)
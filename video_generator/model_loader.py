@@ -0,0 +1,38 @@
+from .preload import WARMUP, preload
+from .video_generator import VideoGenerator, wait_for_job
+
+
+class FastVideoLoader(VideoGenerator):
+
+    @classmethod
+    def INPUT_TYPES(s):
+        input_types = super().INPUT_TYPES()
+        # Only the inputs that select the generator matter here
+        del input_types["required"]["prompt"]
+        del input_types["required"]["output_path"]
+        for name in ("image", "save_video", "return_frames",
+                     "return_latents", "encode_config"):
+            del input_types["optional"][name]
+        input_types["optional"]["warmup"] = ([True, False], {
+            "default": WARMUP
+        })
+        input_types["optional"]["wait"] = ([False, True], {
+            "default": False
+        })
+        return input_types
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return ""
+
+    RETURN_TYPES = ("STRING", )
+    RETURN_NAMES = ("model_path", )
+    FUNCTION = "load_model"
+    CATEGORY = "fastvideo"
+
+    def load_model(self, warmup=WARMUP, wait=False, **kwargs):
+        job = preload(kwargs, warmup=warmup)
+        if wait:
+            wait_for_job(job)
+        # Wiring this into Video Generator's model_path orders the two nodes
+        return (kwargs["model_path"], )
@@ -1,13 +1,88 @@
+import dataclasses
+import enum
+import functools
 import hashlib
+import inspect
+import os
 from collections.abc import Callable
 from typing import Any, TypeVar
 
+import numpy as np
 import torch
 from comfy.cli_args import args
-from PIL import ImageFile, UnidentifiedImageError
+from PIL import Image, ImageFile, UnidentifiedImageError
 
 T = TypeVar('T')
 
+GIB = 1024**3
+
+# Set on a VAE config to the tiling fields ``vae_tiling`` picked for one
+# request; they are left out of fingerprints
+AUTO_TUNED_ATTR = "_auto_tuned_fields"
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def env_gib(name: str) -> int | None:
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        return int(float(value) * GIB)
+    except ValueError:
+        return None
+
+
+def canonicalize(obj: Any, depth: int = 0) -> Any:
+    """Turn a (possibly nested) config object into JSON-serialisable data."""
+    if depth > 16:
+        return repr(obj)
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, enum.Enum):
+        return f"{type(obj).__name__}.{obj.name}"
+    if isinstance(obj, dict):
+        return {
+            str(k): canonicalize(v, depth + 1)
+            for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))
+        }
+    if isinstance(obj, (list, tuple)):
+        return [canonicalize(v, depth + 1) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted(str(canonicalize(v, depth + 1)) for v in obj)
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        return f"{getattr(obj, '__module__', '')}.{obj.__qualname__}"
+    if dataclasses.is_dataclass(obj):
+        return {
+            f.name: canonicalize(getattr(obj, f.name, None), depth + 1)
+            for f in dataclasses.fields(obj)
+        }
+    if hasattr(obj, "__dict__"):
+        return {
+            k: canonicalize(v, depth + 1)
+            for k, v in sorted(vars(obj).items()) if not k.startswith("_")
+        }
+    return str(obj)
+
+
+def fingerprint_config(pipeline_config: Any) -> Any:
+    """Canonical pipeline config for fingerprints, without tuned tiling."""
+    config = canonicalize(pipeline_config)
+    tuned = getattr(getattr(pipeline_config, "vae_config", None),
+                    AUTO_TUNED_ATTR, ())
+    if tuned and isinstance(config, dict) and isinstance(
+            config.get("vae_config"), dict):
+        config["vae_config"] = {
+            k: v
+            for k, v in config["vae_config"].items() if k not in tuned
+        }
+    return config
+
 
 def conditioning_set_values(conditioning: list[Any],
                             values: dict[str, Any] | None = None) -> list[Any]:
@@ -48,6 +123,89 @@ def hasher() -> Callable[[], Any]:
     return hashfuncs[args.default_hashing_function]
 
 
+def is_auto(value: Any) -> bool:
+    """True for the -99999 sentinel the 'auto' widgets send."""
+    try:
+        return int(value) == -99999
+    except (TypeError, ValueError):
+        return False
+
+
+def find_hook(generator: Any, names: tuple[str, ...]) -> Any:
+    """
+    First callable named in ``names`` on the generator, then its executor.
+
+    Optional backend features (cancel, park, reconcile) are detected this
+    way; returns None if the backend has none of them.
+    """
+    for owner in (generator, getattr(generator, "executor", None)):
+        for name in names:
+            hook = getattr(owner, name, None)
+            if callable(hook):
+                return hook
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _sampling_param_fields() -> frozenset[str] | None:
+    """Fields of FastVideo's ``SamplingParam``, or None if unavailable."""
+    try:
+        from fastvideo import SamplingParam
+    except ImportError:
+        return None
+    if not dataclasses.is_dataclass(SamplingParam):
+        return None
+    return frozenset(f.name for f in dataclasses.fields(SamplingParam))
+
+
+def accepts_kwarg(fn: Callable[..., Any], name: str) -> bool:
+    """
+    True if ``fn`` takes a keyword argument called ``name``.
+
+    FastVideo's ``generate_video(prompt, sampling_param=None, **kwargs)``
+    takes its options through ``**kwargs`` and applies the ones that are
+    ``SamplingParam`` fields, so for a function with ``**kwargs`` ``name``
+    counts if it is such a field (or always, if ``SamplingParam`` cannot be
+    imported).
+    """
+    try:
+        parameters = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    if name in parameters:
+        return True
+    if not any(p.kind is inspect.Parameter.VAR_KEYWORD
+               for p in parameters.values()):
+        return False
+    fields = _sampling_param_fields()
+    return fields is None or name in fields
+
+
+def fast_hasher() -> Callable[[], Any]:
+    """A fast non-cryptographic hash (xxhash if installed, else blake2b)."""
+    try:
+        import xxhash
+        return xxhash.xxh3_128
+    except ImportError:
+        return hashlib.blake2b
+
+
+def hash_file(path: str,
+              hash_fn: Callable[[], Any],
+              chunk_size: int = 1 << 20) -> str:
+    """Hash a file in fixed-size chunks without reading it into memory."""
+    m = hash_fn()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            m.update(view[:n])
+    return m.hexdigest()
+
+
 def string_to_torch_dtype(string: str) -> torch.dtype | None:
     if string == "fp32":
         return torch.float32
@@ -66,3 +224,50 @@ def image_alpha_fix(destination: torch.Tensor,
         destination = torch.nn.functional.pad(destination, (0, 1))
         destination[..., -1] = 1.0
     return destination, source
+
+
+def frames_to_image_tensor(frames: Any) -> torch.Tensor:
+    """
+    Convert decoded video frames to a ComfyUI IMAGE tensor in one pass.
+
+    Args:
+        frames: A sequence of (H, W, C) uint8 arrays or tensors, or a single
+            (N, H, W, C) array or tensor
+
+    Returns:
+        A float32 tensor of shape (N, H, W, 3) in [0, 1]
+    """
+    if isinstance(frames, (np.ndarray, torch.Tensor)) and frames.ndim == 4:
+        frames = list(frames)
+    first = frames[0]
+    height, width = first.shape[0], first.shape[1]
+    output = torch.empty((len(frames), height, width, 3), dtype=torch.float32)
+    for i, frame in enumerate(frames):
+        if isinstance(frame, np.ndarray):
+            frame = torch.from_numpy(frame)
+        # copy_ converts uint8 to float32 without an intermediate array
+        output[i].copy_(frame[..., :3])
+    if first.dtype in (np.uint8, torch.uint8):
+        output.mul_(1.0 / 255.0)
+    return output
+
+
+def image_tensor_to_uint8(image: torch.Tensor) -> torch.Tensor:
+    """First frame of a ComfyUI IMAGE tensor as a contiguous (H, W, 3) uint8."""
+    if image.ndim == 4:
+        image = image[0]
+    return (image[..., :3].clamp(0, 1) * 255).round().to(
+        torch.uint8).contiguous()
+
+
+def image_tensor_digest(image: torch.Tensor) -> str:
+    """Content hash of a ComfyUI IMAGE tensor."""
+    m = hashlib.sha256()
+    m.update(str(tuple(image.shape)).encode("ascii"))
+    m.update(np.ascontiguousarray(image.detach().cpu().numpy()))
+    return m.hexdigest()
+
+
+def image_tensor_to_pil(image: torch.Tensor) -> Image.Image:
+    """First frame of a ComfyUI IMAGE tensor as an RGB PIL image."""
+    return Image.fromarray(image_tensor_to_uint8(image).cpu().numpy(), "RGB")
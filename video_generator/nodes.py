@@ -1,8 +1,15 @@
+from .await_job import FastVideoAwait
+from .batch_generator import FastVideoBatch
 from .dit_config import DITConfig
+from .encode_config import VideoEncodeConfig
 from .inference_args import InferenceArgs
 from .load_image import LoadImagePath
+from .manifest_query import FastVideoManifest
+from .model_loader import FastVideoLoader
+from .submit_job import FastVideoSubmit
 from .text_encoder_config import TextEncoderConfig
 from .vae_config import VAEConfig
+from .vae_decode import FastVideoDecode
 from .video_generator import VideoGenerator
 
 NODE_CLASS_MAPPINGS = {
@@ -11,7 +18,14 @@ NODE_CLASS_MAPPINGS = {
     "VAEConfig": VAEConfig,
     "TextEncoderConfig": TextEncoderConfig,
     "DITConfig": DITConfig,
-    "LoadImagePath": LoadImagePath
+    "LoadImagePath": LoadImagePath,
+    "FastVideoSubmit": FastVideoSubmit,
+    "FastVideoAwait": FastVideoAwait,
+    "FastVideoBatch": FastVideoBatch,
+    "FastVideoLoader": FastVideoLoader,
+    "FastVideoDecode": FastVideoDecode,
+    "VideoEncodeConfig": VideoEncodeConfig,
+    "FastVideoManifest": FastVideoManifest
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -20,5 +34,12 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "VAEConfig": "VAE Config",
     "TextEncoderConfig": "Text Encoder Config",
     "DITConfig": "DIT Config",
-    "LoadImagePath": "Load Image Path"
+    "LoadImagePath": "Load Image Path",
+    "FastVideoSubmit": "FastVideo Submit",
+    "FastVideoAwait": "FastVideo Await",
+    "FastVideoBatch": "FastVideo Batch",
+    "FastVideoLoader": "FastVideo Loader",
+    "FastVideoDecode": "FastVideo Decode",
+    "VideoEncodeConfig": "Video Encode Config",
+    "FastVideoManifest": "FastVideo Manifest"
 }
\ No newline at end of file
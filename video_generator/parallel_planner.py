@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import glob
+import json
+import os
+import threading
+from typing import Any
+
+from .generator_pool import device_memory
+from .node_helpers import GIB, env_gib
+
+BYTES_PER_PARAM = 2
+# Fraction of peak throughput a DiT step actually reaches, and the tokens a
+# rank needs before it gets there
+COMPUTE_EFFICIENCY = 0.4
+SATURATION_TOKENS = 4096
+# Latency of one collective, paid regardless of message size
+COLLECTIVE_LATENCY = 50e-6
+# Plans within this fraction of the fastest count as equally fast
+TIE_TOLERANCE = 0.01
+# Activation bytes kept per token and hidden unit during a DiT step
+ACTIVATION_FACTOR = 24
+# Bytes of VAE decoder activations per output pixel without tiling, and the
+# fraction left when spatial/temporal tiling is on
+VAE_BYTES_PER_PIXEL = 384
+VAE_TILED_FRACTION = 0.125
+VAE_FLOPS_PER_PIXEL = 2.5e6
+TEXT_TOKENS = 512
+# Share of a device's total memory a plan may use by default; the rest is
+# left to the CUDA context, NCCL buffers and allocator fragmentation. Plans
+# use total rather than free memory so they do not change once a model is
+# loaded
+USABLE_MEMORY_FRACTION = 0.9
+
+
+@dataclasses.dataclass(frozen=True)
+class DeviceInfo:
+    """One GPU as seen by the planner; synthetic instances work on CPU."""
+    index: int
+    total_bytes: int
+    flops: float = 300e12
+    link_bandwidth: float = 100e9
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelSpec:
+    """The parts of a model's size the cost model needs."""
+    name: str
+    dit_params: float
+    text_encoder_params: float = 0.0
+    vae_params: float = 0.0
+    hidden_size: int = 3072
+    num_layers: int = 40
+    num_heads: int = 24
+
+
+@dataclasses.dataclass
+class ParallelPlan:
+    num_gpus: int
+    sp_size: int
+    tp_size: int
+    vae_sp: bool
+    predicted_seconds: float
+    peak_bytes_per_device: int
+    explanation: str = ""
+
+    def generation_args(self) -> dict[str, Any]:
+        return {
+            "num_gpus": self.num_gpus,
+            "sp_size": self.sp_size,
+            "tp_size": self.tp_size,
+        }
+
+
+@functools.lru_cache(maxsize=1)
+def detect_devices() -> tuple[DeviceInfo, ...]:
+    """Visible CUDA devices, or an empty tuple without CUDA."""
+    return tuple(
+        DeviceInfo(index=i, total_bytes=total)
+        for i, (_, total) in enumerate(device_memory()))
+
+
+def _safetensors_bytes(root: str, component: str) -> int:
+    return sum(
+        os.path.getsize(path)
+        for path in glob.glob(os.path.join(root, component, "*.safetensors")))
+
+
+@functools.lru_cache(maxsize=32)
+def model_spec_from_path(model_path: str) -> ModelSpec | None:
+    """
+    Estimate a model's size from its local diffusers-style checkpoint.
+
+    Args:
+        model_path: Model id or local path
+
+    Returns:
+        The estimate, or None if the model is not available locally
+    """
+    # Imported here so the planner itself runs without FastVideo installed
+    from .config_cache import _model_root
+    root = _model_root(model_path)
+    if root is None:
+        return None
+    dit_bytes = _safetensors_bytes(root, "transformer")
+    if dit_bytes == 0:
+        return None
+
+    hidden_size, num_layers, num_heads = 3072, 40, 24
+    try:
+        with open(os.path.join(root, "transformer", "config.json"),
+                  encoding="utf-8") as f:
+            config = json.load(f)
+        if "hidden_size" in config:
+            hidden_size = int(config["hidden_size"])
+        elif "num_attention_heads" in config and "attention_head_dim" in config:
+            hidden_size = int(config["num_attention_heads"] *
+                              config["attention_head_dim"])
+        num_layers = int(
+            config.get("num_layers", config.get("num_hidden_layers",
+                                                num_layers)))
+        num_heads = int(config.get("num_attention_heads", num_heads))
+    except (OSError, ValueError, TypeError):
+        pass
+
+    text_bytes = sum(
+        _safetensors_bytes(root, d) for d in ("text_encoder", "text_encoder_2",
+                                              "image_encoder"))
+    return ModelSpec(name=model_path,
+                     dit_params=dit_bytes / BYTES_PER_PARAM,
+                     text_encoder_params=text_bytes / BYTES_PER_PARAM,
+                     vae_params=_safetensors_bytes(root, "vae") /
+                     BYTES_PER_PARAM,
+                     hidden_size=hidden_size,
+                     num_layers=num_layers,
+                     num_heads=num_heads)
+
+
+def _tokens(height: int, width: int, num_frames: int) -> int:
+    # 4x temporal / 8x spatial VAE compression, 2x2 spatial patches
+    latent_frames = (max(num_frames, 1) - 1) // 4 + 1
+    return latent_frames * max(height // 16, 1) * max(width // 16, 1)
+
+
+def _divisors(n: int) -> list[int]:
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+
+def _evaluate(model: ModelSpec, devices: list[DeviceInfo], height: int,
+              width: int, num_frames: int, steps: int, num_gpus: int,
+              sp_size: int, tp_size: int, vae_sp: bool,
+              vae_tiling: bool) -> tuple[float, int]:
+    group = devices[:num_gpus]
+    flops = min(d.flops for d in group) * COMPUTE_EFFICIENCY
+    bandwidth = min(d.link_bandwidth for d in group)
+    tokens = _tokens(height, width, num_frames)
+    hidden = model.hidden_size
+
+    # DiT: linear layers plus full attention, sequence split across SP ranks.
+    # Short per-rank sequences leave the GPU underutilized.
+    step_flops = (2 * model.dit_params * tokens +
+                  4 * tokens * tokens * hidden * model.num_layers)
+    utilization = min(1.0, tokens / sp_size / SATURATION_TOKENS)
+    compute = step_flops / (sp_size * flops * utilization)
+    # Four all-to-alls per layer, each moving (sp-1)/sp of the activations
+    comm = 0.0
+    if sp_size > 1:
+        comm = 4 * model.num_layers * (
+            COLLECTIVE_LATENCY + tokens * hidden * BYTES_PER_PARAM *
+            (sp_size - 1) / sp_size / bandwidth)
+    denoise = steps * (compute + comm)
+
+    text = (2 * model.text_encoder_params * TEXT_TOKENS) / (tp_size * flops)
+    if tp_size > 1:
+        text += 2 * model.num_layers * COLLECTIVE_LATENCY
+
+    pixels = height * width * num_frames
+    vae_ranks = num_gpus if vae_sp else 1
+    vae = pixels * VAE_FLOPS_PER_PIXEL / (vae_ranks * flops)
+    if vae_sp and num_gpus > 1:
+        vae += pixels * 3 * BYTES_PER_PARAM / bandwidth
+
+    vae_activation = pixels * VAE_BYTES_PER_PIXEL / vae_ranks
+    if vae_tiling:
+        vae_activation *= VAE_TILED_FRACTION
+    weights = (model.dit_params + model.text_encoder_params / tp_size +
+               model.vae_params) * BYTES_PER_PARAM
+    activations = tokens / sp_size * hidden * ACTIVATION_FACTOR
+    peak = int(weights + max(activations, vae_activation))
+    return denoise + text + vae, peak
+
+
+_plans: dict[tuple, ParallelPlan | None] = {}
+_plans_lock = threading.Lock()
+
+
+def plan_parallelism(model: ModelSpec,
+                     devices: list[DeviceInfo],
+                     height: int,
+                     width: int,
+                     num_frames: int,
+                     steps: int = 50,
+                     memory_budget: int | None = None,
+                     vae_tiling: bool = True,
+                     fixed: dict[str, Any] | None = None) -> ParallelPlan | None:
+    """
+    Pick the fastest SP/TP split and VAE parallel mode that fits in memory.
+
+    Args:
+        model: Size of the model to run
+        devices: Candidate devices; the first ``num_gpus`` of them are used
+        height: Output height in pixels
+        width: Output width in pixels
+        num_frames: Number of output frames
+        steps: Denoising steps
+        memory_budget: Bytes each device may use (default: a fixed share of
+            its total memory)
+        vae_tiling: Whether the VAE decodes in tiles
+        fixed: Values the user set explicitly (num_gpus, sp_size, tp_size,
+            vae_sp); only the others are searched
+
+    Returns:
+        The best plan, or None if no configuration fits
+    """
+    fixed = fixed or {}
+    key = (model, tuple(devices), height, width, num_frames, steps,
+           memory_budget, vae_tiling, tuple(sorted(fixed.items())))
+    with _plans_lock:
+        if key in _plans:
+            return _plans[key]
+
+    candidates = []
+    gpu_counts = ([fixed["num_gpus"]] if "num_gpus" in fixed else range(
+        1, len(devices) + 1))
+    for num_gpus in gpu_counts:
+        if num_gpus > len(devices):
+            continue
+        budget = memory_budget or int(
+            min(d.total_bytes for d in devices[:num_gpus]) *
+            USABLE_MEMORY_FRACTION)
+        for sp_size in _divisors(num_gpus):
+            # Ulysses attention splits heads across the SP group
+            if (fixed.get("sp_size", sp_size) != sp_size
+                    or model.num_heads % sp_size):
+                continue
+            for tp_size in _divisors(num_gpus):
+                if fixed.get("tp_size", tp_size) != tp_size:
+                    continue
+                for vae_sp in (False, True):
+                    if fixed.get("vae_sp", vae_sp) != vae_sp:
+                        continue
+                    seconds, peak = _evaluate(model, devices, height, width,
+                                              num_frames, steps, num_gpus,
+                                              sp_size, tp_size, vae_sp,
+                                              vae_tiling)
+                    if peak <= budget:
+                        candidates.append((seconds, num_gpus, sp_size,
+                                           tp_size, vae_sp, peak))
+
+    plan = None
+    if candidates:
+        # Among the (near-)fastest, prefer fewer GPUs and smaller groups
+        fastest = min(c[0] for c in candidates)
+        candidates.sort(key=lambda c: (c[0] > fastest * (1 + TIE_TOLERANCE),
+                                       c[1], c[3], c[2], c[0]))
+        seconds, num_gpus, sp_size, tp_size, vae_sp, peak = candidates[0]
+        runner_up = (f"; next best {candidates[1][0]:.1f}s with "
+                     f"{candidates[1][1]} GPUs, sp={candidates[1][2]}, "
+                     f"tp={candidates[1][3]}, vae_sp={candidates[1][4]}"
+                     if len(candidates) > 1 else "")
+        plan = ParallelPlan(
+            num_gpus=num_gpus,
+            sp_size=sp_size,
+            tp_size=tp_size,
+            vae_sp=vae_sp,
+            predicted_seconds=seconds,
+            peak_bytes_per_device=peak,
+            explanation=(
+                f"{model.name}: {width}x{height}x{num_frames}, {steps} steps "
+                f"-> {num_gpus} GPUs, sp={sp_size}, tp={tp_size}, "
+                f"vae_sp={vae_sp}, predicted {seconds:.1f}s, peak "
+                f"{peak / GIB:.1f} GiB per device out of "
+                f"{len(candidates)} configurations that fit{runner_up}"))
+        print(f"FastVideo parallel plan: {plan.explanation}")
+    else:
+        print(f"FastVideo parallel plan: no configuration of {model.name} "
+              f"fits in memory on {len(devices)} devices; using defaults")
+
+    with _plans_lock:
+        _plans[key] = plan
+    return plan
+
+
+def auto_plan(model_path: str,
+              inference_args: dict[str, Any] | None,
+              vae_tiling: bool = True,
+              fixed: dict[str, Any] | None = None,
+              max_gpus: int | None = None) -> ParallelPlan | None:
+    """
+    Plan the auto-valued parallelism settings of one node call.
+
+    ``max_gpus`` caps the plan at the size of the largest GPU partition.
+
+    Returns None when there are no CUDA devices or the model's size cannot
+    be estimated, in which case FastVideo's own defaults apply.
+    """
+    devices = detect_devices()[:max_gpus]
+    if not devices:
+        return None
+    model = model_spec_from_path(model_path)
+    if model is None:
+        return None
+    inference_args = inference_args or {}
+    # Memoized per model, shape and device set
+    return plan_parallelism(
+        model,
+        list(devices),
+        height=int(inference_args.get("height", 720)),
+        width=int(inference_args.get("width", 1280)),
+        num_frames=int(inference_args.get("num_frames", 45)),
+        steps=int(inference_args.get("num_inference_steps", 50)),
+        memory_budget=env_gib("FASTVIDEO_PLAN_MEMORY_BUDGET_GB"),
+        vae_tiling=vae_tiling,
+        fixed=fixed)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .node_helpers import find_hook
+
+# Hook names a backend can expose to move its weights off and back on the
+# GPU while keeping its worker processes alive
+_PARK_HOOKS = ("park", "offload_to_cpu", "sleep")
+_RESTORE_HOOKS = ("unpark", "restore", "wake_up")
+
+
+def _local_modules(generator: Any) -> list[Any]:
+    """torch modules of an in-process pipeline, if the generator has one."""
+    try:
+        import torch
+    except ImportError:
+        return []
+    pipeline = getattr(generator, "pipeline", None)
+    modules = getattr(pipeline, "modules", None)
+    if not isinstance(modules, dict):
+        return []
+    return [m for m in modules.values() if isinstance(m, torch.nn.Module)]
+
+
+def _tensors(module: Any) -> list[Any]:
+    return list(module.parameters()) + list(module.buffers())
+
+
+def _park_local(modules: list[Any]) -> int:
+    import torch
+    parked = 0
+    for module in modules:
+        # id(tensor) -> device, so restore can put each tensor back
+        devices = {}
+        for tensor in _tensors(module):
+            if tensor.device.type != "cuda":
+                continue
+            host = torch.empty(tensor.shape,
+                               dtype=tensor.dtype,
+                               device="cpu",
+                               pin_memory=True)
+            host.copy_(tensor.data, non_blocking=True)
+            devices[id(tensor)] = tensor.device
+            tensor.data = host
+            parked += host.numel() * host.element_size()
+        module._fastvideo_parked = devices
+    torch.cuda.synchronize()
+    torch.cuda.empty_cache()
+    return parked
+
+
+def _restore_local(modules: list[Any]) -> None:
+    import torch
+    for module in modules:
+        devices = getattr(module, "_fastvideo_parked", None) or {}
+        for tensor in _tensors(module):
+            device = devices.get(id(tensor))
+            if device is not None:
+                tensor.data = tensor.data.to(device, non_blocking=True)
+        module._fastvideo_parked = {}
+    torch.cuda.synchronize()
+
+
+def park_generator(generator: Any) -> int | None:
+    """
+    Move a generator's weights to pinned host memory, keeping its workers.
+
+    Args:
+        generator: An idle generator
+
+    Returns:
+        Bytes moved to the host (0 if the backend does not report it), or
+        None if the generator cannot be parked and has to be evicted instead
+    """
+    hook = find_hook(generator, _PARK_HOOKS)
+    if hook is not None and find_hook(generator, _RESTORE_HOOKS) is not None:
+        result = hook()
+        return result if isinstance(result, int) else 0
+    modules = _local_modules(generator)
+    if modules:
+        return _park_local(modules)
+    return None
+
+
+def restore_generator(generator: Any) -> None:
+    """Copy a parked generator's weights back to the GPU."""
+    hook = find_hook(generator, _RESTORE_HOOKS)
+    if hook is not None and find_hook(generator, _PARK_HOOKS) is not None:
+        hook()
+        return
+    _restore_local(_local_modules(generator))
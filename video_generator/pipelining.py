@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from .node_helpers import env_int
+from .job_queue import Job
+
+# FASTVIDEO_PIPELINE=1 also overlaps the stages that use the generator
+# (encoding the next prompt, decoding) with denoising; video encoding runs
+# on the pipeline either way
+ENABLED = os.environ.get("FASTVIDEO_PIPELINE", "0") == "1"
+
+# Stages that run on the GPU get one thread per partition, so a partition
+# decodes one video at a time; the others share a CPU pool, whose threads
+# mostly wait on ffmpeg processes
+GPU_STAGES = ("decode", )
+
+Stage = tuple[str, Callable[[Any], Any]]
+
+
+class StagePipeline:
+    """
+    Runs the stages after denoising on their own threads.
+
+    A job's worker hands its denoised output to ``handoff`` and is free to
+    start denoising the next job while this one is decoded and muxed. At
+    most ``depth`` jobs can be past denoising at once; ``handoff`` blocks
+    when that many are in flight, so a slow muxer throttles the GPU worker
+    instead of piling up decoded frames.
+    """
+
+    def __init__(self, depth: int = 2, mux_workers: int = 2) -> None:
+        self.depth = max(1, depth)
+        self.mux_workers = max(1, mux_workers)
+        self._slots = threading.BoundedSemaphore(self.depth)
+        self._lock = threading.Lock()
+        self._gpu: dict[tuple[str, int], ThreadPoolExecutor] = {}
+        self._cpu = ThreadPoolExecutor(max_workers=self.mux_workers,
+                                       thread_name_prefix="fastvideo-mux")
+        self._in_flight = 0
+        self.handoffs = 0
+        self.backpressure_waits = 0
+        self.backpressure_seconds = 0.0
+
+    def _executor(self, stage: str, job: Job) -> ThreadPoolExecutor:
+        if stage not in GPU_STAGES:
+            return self._cpu
+        index = job.partition.index if job.partition else 0
+        with self._lock:
+            executor = self._gpu.get((stage, index))
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix=f"fastvideo-{stage}-{index}")
+                self._gpu[(stage, index)] = executor
+            return executor
+
+    def handoff(self, job: Job, value: Any, stages: list[Stage]) -> Future:
+        """
+        Run ``stages`` on ``value`` in order, off the calling thread.
+
+        Args:
+            job: The job the stages belong to
+            value: Input of the first stage
+            stages: ``(name, fn)`` pairs; each ``fn`` gets the previous
+                stage's return value. Stages named in ``GPU_STAGES`` run one
+                at a time per partition
+
+        Returns:
+            A future with the last stage's return value
+        """
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            self._slots.acquire()
+            with self._lock:
+                self.backpressure_waits += 1
+                self.backpressure_seconds += time.perf_counter() - start
+        with self._lock:
+            self.handoffs += 1
+            self._in_flight += 1
+        future: Future = Future()
+        self._next(job, value, stages, future)
+        return future
+
+    def _next(self, job: Job, value: Any, stages: list[Stage],
+              future: Future) -> None:
+        if not stages:
+            self._release()
+            future.set_result(value)
+            return
+        (name, fn), rest = stages[0], stages[1:]
+
+        def run() -> None:
+            try:
+                output = fn(value)
+            except BaseException as e:
+                self._release()
+                future.set_exception(e)
+                return
+            self._next(job, output, rest, future)
+
+        self._executor(name, job).submit(run)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "in_flight": self._in_flight,
+                "handoffs": self.handoffs,
+                "backpressure_waits": self.backpressure_waits,
+                "backpressure_seconds": round(self.backpressure_seconds, 3),
+            }
+
+
+_pipeline: StagePipeline | None = None
+_pipeline_lock = threading.Lock()
+
+
+def get_stage_pipeline() -> StagePipeline:
+    """
+    Return the process-wide stage pipeline.
+
+    ``FASTVIDEO_PIPELINE_DEPTH`` (default 2) bounds the jobs between denoise
+    and a finished video; ``FASTVIDEO_MUX_WORKERS`` (default 2) sizes the
+    CPU pool that encodes videos.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = StagePipeline(
+                depth=env_int("FASTVIDEO_PIPELINE_DEPTH", 2),
+                mux_workers=env_int("FASTVIDEO_MUX_WORKERS", 2))
+        return _pipeline
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import time
+from typing import Any
+
+import folder_paths
+
+from .generator_pool import get_generator_pool
+from .job_queue import Job, get_job_queue
+from .node_helpers import accepts_kwarg
+from .video_generator import FastVideoGenerator, VideoGenerator
+
+PRELOAD_MODELS = os.environ.get("FASTVIDEO_PRELOAD_MODELS", "")
+WARMUP = os.environ.get("FASTVIDEO_PRELOAD_WARMUP", "1") != "0"
+
+# A generation small enough to be cheap on any model; overridable per model
+WARMUP_ARGS = {
+    "num_inference_steps": 2,
+    "num_frames": 5,
+    "height": 256,
+    "width": 256,
+}
+
+# Pool keys of generators that already ran a warm-up generation
+_warmed: set[str] = set()
+
+
+def default_node_kwargs() -> dict[str, Any]:
+    """The Video Generator node's widget defaults as keyword arguments."""
+    input_types = VideoGenerator.INPUT_TYPES()
+    kwargs = {}
+    for section in ("required", "optional"):
+        for name, spec in input_types.get(section, {}).items():
+            if len(spec) > 1 and "default" in spec[1]:
+                kwargs[name] = spec[1]["default"]
+    kwargs["output_path"] = os.path.join(folder_paths.get_temp_directory(),
+                                         "fastvideo_warmup")
+    kwargs["prompt"] = "warm-up"
+    return kwargs
+
+
+def parse_preload_spec(value: str) -> list[dict[str, Any]]:
+    """
+    Parse ``FASTVIDEO_PRELOAD_MODELS``.
+
+    Args:
+        value: Comma separated model paths, a JSON list, or the path of a JSON
+            file with a list. JSON entries are objects of Video Generator
+            inputs (``model_path``, ``num_gpus``, ``inference_args``, ...)
+
+    Returns:
+        One dict of node inputs per model
+    """
+    value = value.strip()
+    if not value:
+        return []
+    if os.path.isfile(value):
+        with open(value, encoding="utf-8") as f:
+            specs = json.load(f)
+    elif value.startswith("["):
+        specs = json.loads(value)
+    else:
+        specs = [{
+            "model_path": path.strip()
+        } for path in value.split(",") if path.strip()]
+    return [spec if isinstance(spec, dict) else {"model_path": spec}
+            for spec in specs]
+
+
+def warm_up(generator: Any, inference_args: dict[str, Any],
+            output_path: str) -> float:
+    """Run one tiny generation so kernels and allocators are initialized."""
+    args = dict(inference_args)
+    args.update(WARMUP_ARGS)
+    extra_args = {}
+    if accepts_kwarg(generator.generate_video, "save_video"):
+        extra_args["save_video"] = False
+    start = time.perf_counter()
+    generator.generate_video(prompt="warm-up",
+                             output_path=output_path,
+                             **args,
+                             **extra_args)
+    return time.perf_counter() - start
+
+
+def _preload(node_kwargs: dict[str, Any], warmup: bool,
+             job: Job) -> dict[str, Any]:
+    """Job queue function that loads one generator and warms it up"""
+    request = VideoGenerator().prepare_request(**node_kwargs)
+    pool = get_generator_pool()
+    start = time.perf_counter()
+    key, generator = pool.acquire(
+        request.model_path,
+        request.generation_args,
+        request.pipeline_config,
+        FastVideoGenerator.from_pretrained,
+        devices=job.partition.devices if job.partition else ())
+    stats = {
+        "model_path": request.model_path,
+        "key": key,
+        "acquire_seconds": round(time.perf_counter() - start, 3),
+    }
+    try:
+        if warmup and key not in _warmed:
+            stats["warmup_seconds"] = round(
+                warm_up(generator, request.inference_args,
+                        request.output_path), 3)
+            _warmed.add(key)
+    except Exception as e:
+        # The generator is loaded either way; a failed warm-up (e.g. an I2V
+        # model without an image) only costs the first job some time
+        print(f"Warm-up generation for {request.model_path} failed: {e}")
+    finally:
+        pool.release(key, generator)
+    print(f"Preloaded {request.model_path}: {stats}")
+    return stats
+
+
+def preload(node_kwargs: dict[str, Any],
+            warmup: bool = WARMUP,
+            priority: int = 0) -> Job:
+    """
+    Queue loading (and optionally warming up) a generator.
+
+    The load runs on the job queue, so a generation queued afterwards for the
+    same settings waits for it and reuses the generator instead of loading
+    the model a second time.
+
+    Args:
+        node_kwargs: Video Generator inputs; missing ones use the node
+            defaults. They must match the later generations' inputs for the
+            generator to be reused.
+        warmup: Run a tiny generation once the model is loaded
+        priority: Job queue priority
+
+    Returns:
+        The preload job
+    """
+    kwargs = default_node_kwargs()
+    kwargs.update(node_kwargs)
+    num_gpus = kwargs.get("num_gpus")
+    return get_job_queue().submit(
+        functools.partial(_preload, kwargs, warmup),
+        priority=priority,
+        label=f"preload {kwargs['model_path']}",
+        num_gpus=num_gpus if isinstance(num_gpus, int) and num_gpus > 0 else 0)
+
+
+def preload_from_env() -> list[Job]:
+    """Start loading the models listed in ``FASTVIDEO_PRELOAD_MODELS``."""
+    try:
+        specs = parse_preload_spec(PRELOAD_MODELS)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring FASTVIDEO_PRELOAD_MODELS: {e}")
+        return []
+    jobs = []
+    for spec in specs:
+        print(f"Preloading FastVideo model {spec.get('model_path')}")
+        try:
+            jobs.append(preload(spec))
+        except ValueError as e:
+            print(f"Cannot preload {spec.get('model_path')}: {e}")
+    return jobs
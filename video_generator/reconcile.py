@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from .node_helpers import find_hook
+
+# Pipeline config fields the pipeline reads per request, so a live
+# generator can take new values without reloading anything
+INFERENCE_FIELDS = ("embedded_cfg_scale", "flow_shift")
+
+# Pipeline config fields that only affect one component, which can be
+# reloaded on its own while the DiT stays on the GPU
+COMPONENT_FIELDS = {
+    "vae_config": "vae",
+    "vae_precision": "vae",
+    "vae_tiling": "vae",
+    "vae_sp": "vae",
+    "text_encoder_configs": "text_encoder",
+    "text_encoder_precisions": "text_encoder",
+    "text_encoder_precision": "text_encoder",
+}
+
+# Hook names a backend can expose to apply a reconciled config
+_UPDATE_HOOKS = ("update_pipeline_config", )
+_RELOAD_HOOKS = ("reload_component", )
+
+
+@dataclasses.dataclass
+class ConfigDiff:
+    """Differences between a live generator's config and a requested one."""
+    inference: dict[str, Any] = dataclasses.field(default_factory=dict)
+    components: dict[str, list[str]] = dataclasses.field(default_factory=dict)
+    structural: list[str] = dataclasses.field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.inference or self.components or self.structural)
+
+    def changed(self) -> list[str]:
+        names = list(self.inference) + self.structural
+        for fields in self.components.values():
+            names.extend(fields)
+        return sorted(names)
+
+    def describe(self) -> str:
+        parts = []
+        if self.inference:
+            parts.append(f"applied {', '.join(sorted(self.inference))}")
+        for component, fields in sorted(self.components.items()):
+            parts.append(f"reloaded {component} ({', '.join(fields)})")
+        if self.structural:
+            parts.append(f"rebuilt ({', '.join(self.structural)})")
+        return "; ".join(parts) or "unchanged"
+
+
+def _fields(config: Any) -> dict[str, Any]:
+    return config if isinstance(config, dict) else {"": config}
+
+
+def diff_configs(old_args: dict[str, Any], old_config: Any,
+                 new_args: dict[str, Any], new_config: Any) -> ConfigDiff:
+    """
+    Classify what changed between two generators' inputs.
+
+    All arguments are canonicalized (see ``node_helpers.canonicalize``).
+
+    Args:
+        old_args: Generation arguments of the live generator
+        old_config: Pipeline config of the live generator
+        new_args: Requested generation arguments
+        new_config: Requested pipeline config
+
+    Returns:
+        The changed fields, split into inference-time, per component and
+        structural (generation arguments are always structural)
+    """
+    diff = ConfigDiff()
+    for name in sorted(set(old_args) | set(new_args)):
+        if old_args.get(name) != new_args.get(name):
+            diff.structural.append(name)
+    old_fields, new_fields = _fields(old_config), _fields(new_config)
+    for name in sorted(set(old_fields) | set(new_fields)):
+        if old_fields.get(name) == new_fields.get(name):
+            continue
+        if name in INFERENCE_FIELDS:
+            diff.inference[name] = new_fields.get(name)
+        elif name in COMPONENT_FIELDS:
+            diff.components.setdefault(COMPONENT_FIELDS[name],
+                                       []).append(name)
+        else:
+            diff.structural.append(name)
+    return diff
+
+
+def supports_reconcile(generator: Any) -> bool:
+    """
+    Whether the backend of ``generator`` exposes any reconcile hook.
+
+    Released FastVideo versions expose neither hook, so live updates only
+    happen with backends that add them (such as the benchmark stub).
+    """
+    return (find_hook(generator, _UPDATE_HOOKS) is not None
+            or find_hook(generator, _RELOAD_HOOKS) is not None)
+
+
+def can_apply(generator: Any, diff: ConfigDiff) -> bool:
+    """Whether ``diff`` can be applied to ``generator`` without a rebuild."""
+    if diff.structural:
+        return False
+    if diff.inference and find_hook(generator, _UPDATE_HOOKS) is None:
+        return False
+    if diff.components and find_hook(generator, _RELOAD_HOOKS) is None:
+        return False
+    return True
+
+
+def apply_diff(generator: Any, diff: ConfigDiff, pipeline_config: Any) -> None:
+    """
+    Bring a live generator to ``pipeline_config``; see ``can_apply``.
+
+    Inference-time fields go to the backend's ``update_pipeline_config`` hook,
+    and each changed component is reloaded through ``reload_component``.
+    """
+    if diff.inference:
+        find_hook(generator, _UPDATE_HOOKS)(dict(diff.inference))
+    for component in sorted(diff.components):
+        find_hook(generator, _RELOAD_HOOKS)(component, pipeline_config)
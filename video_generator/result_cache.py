@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any
+
+from .node_helpers import canonicalize, env_gib, fingerprint_config
+from .manifest import get_output_manifest
+
+ENABLED = os.environ.get("FASTVIDEO_RESULT_CACHE", "1") != "0"
+VERIFY = os.environ.get("FASTVIDEO_RESULT_CACHE_VERIFY", "1") != "0"
+
+
+def request_fingerprint(model_path: str, generation_args: dict[str, Any],
+                        pipeline_config: Any, prompt: str,
+                        inference_args: dict[str, Any],
+                        image_digest: str | None = None) -> str:
+    """
+    Content address of a generation: everything that determines the output.
+
+    Args:
+        model_path: Model id or local path
+        generation_args: Keyword arguments passed to ``from_pretrained``
+        pipeline_config: The fully overridden pipeline config
+        prompt: Text prompt
+        inference_args: Arguments from the ``InferenceArgs`` node
+        image_digest: Content hash of the conditioning image tensor or file,
+            if any
+
+    Returns:
+        Hex digest identifying the generation
+    """
+    payload = {
+        "model_path": model_path,
+        "generation_args": canonicalize(generation_args),
+        "pipeline_config": fingerprint_config(pipeline_config),
+        "prompt": prompt,
+        "inference_args": canonicalize(inference_args),
+        "image": image_digest,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """
+    Reuses finished videos recorded in an output path's manifest.
+
+    Entries live in the ``OutputManifest`` of the output directory. Each
+    keeps the file's size and mtime so a video that was later overwritten or
+    edited is not returned.
+    """
+
+    def __init__(self,
+                 output_path: str,
+                 max_age: float | None = None,
+                 max_bytes: int | None = None) -> None:
+        self.output_path = output_path
+        self.manifest = get_output_manifest(output_path)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _valid(entry: dict[str, Any]) -> bool:
+        try:
+            st = os.stat(entry["path"])
+        except OSError:
+            return False
+        return (st.st_size == entry["size"]
+                and st.st_mtime_ns == entry["mtime_ns"])
+
+    def lookup(self, key: str, verify: bool = VERIFY) -> str | None:
+        """Path of the cached video for ``key``, or None."""
+        entry = self.manifest.get(key)
+        if entry is None:
+            return None
+        if verify and not self._valid(entry):
+            self.manifest.remove(key)
+            return None
+        self.manifest.touch(key)
+        return entry["path"]
+
+    def record(self,
+               key: str,
+               path: str,
+               prompt: str = "",
+               frame_count: int = 0,
+               fps: float = 0.0,
+               stats: dict[str, Any] | None = None) -> None:
+        """Record ``path`` as the finished video for ``key``."""
+        with self._lock:
+            if self.manifest.put(key, path, prompt, frame_count, fps,
+                                 stats) is not None:
+                self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        if self.max_age is not None:
+            for entry in self.manifest.unused_since(time.time() -
+                                                    self.max_age):
+                if entry["fingerprint"] != keep:
+                    self._remove(entry)
+
+        if self.max_bytes is None:
+            return
+        total = self.manifest.total_bytes()
+        if total <= self.max_bytes:
+            return
+        for entry in self.manifest.query(limit=-1, order_by="last_used ASC"):
+            if total <= self.max_bytes:
+                break
+            if entry["fingerprint"] == keep:
+                continue
+            total -= entry["size"]
+            self._remove(entry)
+
+    def _remove(self, entry: dict[str, Any]) -> None:
+        self.manifest.remove(entry["fingerprint"])
+        # Only delete the file if it is still the one we recorded
+        if self._valid(entry):
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+
+
+_caches: dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(output_path: str) -> ResultCache:
+    """
+    Return the result cache for an output directory.
+
+    Eviction is configured with ``FASTVIDEO_RESULT_CACHE_MAX_AGE_DAYS`` and
+    ``FASTVIDEO_RESULT_CACHE_MAX_GB``; both are off by default.
+    """
+    output_path = os.path.abspath(output_path)
+    with _caches_lock:
+        cache = _caches.get(output_path)
+        if cache is None:
+            try:
+                max_age = float(
+                    os.environ["FASTVIDEO_RESULT_CACHE_MAX_AGE_DAYS"]) * 86400
+            except (KeyError, ValueError):
+                max_age = None
+            cache = ResultCache(output_path,
+                                max_age=max_age,
+                                max_bytes=env_gib(
+                                    "FASTVIDEO_RESULT_CACHE_MAX_GB"))
+            _caches[output_path] = cache
+        return cache
@@ -0,0 +1,29 @@
+from .video_generator import VideoGenerator
+
+
+class FastVideoSubmit(VideoGenerator):
+
+    @classmethod
+    def INPUT_TYPES(s):
+        input_types = super().INPUT_TYPES()
+        input_types["optional"]["priority"] = ("INT", {
+            "default": 0,
+            "min": -100,
+            "max": 100
+        })
+        return input_types
+
+    @classmethod
+    def IS_CHANGED(cls, priority=0, **kwargs):
+        # The priority only orders the queue; it is not a generation input
+        return super().IS_CHANGED(**kwargs)
+
+    RETURN_TYPES = ("FASTVIDEO_JOB", )
+    RETURN_NAMES = ("job", )
+    FUNCTION = "submit_job"
+    CATEGORY = "fastvideo"
+
+    def submit_job(self, priority=0, **kwargs):
+        job = self.submit(priority=priority, **kwargs)
+        print(f"Queued FastVideo job {job.id} with priority {priority}")
+        return (job, )
@@ -40,6 +40,9 @@ class VAEConfig:
                 "use_parallel_tiling": ([True, False], {
                     "default": True
                 }),
+                "auto_tune": ([False, True], {
+                    "default": False
+                }),
             }
         }
 
@@ -66,6 +69,7 @@ class VAEConfig:
         use_tiling,
         use_temporal_tiling,
         use_parallel_tiling,
+        auto_tune=False,
     ):
         raw_args = {
             "load_encoder": load_encoder,
@@ -85,4 +89,8 @@ class VAEConfig:
         # Filter out any value explicitly set to -99999
         args = {k: v for k, v in raw_args.items() if str(int(v)) != str(-99999)}
 
+        # Tile sizes are picked per request once the output shape is known
+        if auto_tune:
+            args["auto_tune"] = True
+
         return (args, )
@@ -0,0 +1,106 @@
+import copy
+import json
+import os
+
+from .latent_store import get_latent_store
+from .node_helpers import is_auto
+from .vae_tiling import autotune_vae_tiling
+from .video_generator import (GenerationRequest, VideoGenerator,
+                              can_decode_latents, update_config_from_args,
+                              wait_for_job)
+
+
+class FastVideoDecode(VideoGenerator):
+
+    @classmethod
+    def INPUT_TYPES(s):
+        generator_inputs = super().INPUT_TYPES()["optional"]
+        return {
+            "required": {
+                "latents": ("LATENT", ),
+                "output_path": ("STRING", {
+                    "default": "/workspace/ComfyUI/outputs_video/"
+                }),
+            },
+            "optional": {
+                name: generator_inputs[name]
+                for name in ("vae_config", "vae_precision", "vae_tiling",
+                             "vae_sp", "encode_config", "save_video",
+                             "return_frames")
+            }
+        }
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, **kwargs):
+        if not can_decode_latents():
+            return ("This FastVideo version cannot decode latents separately "
+                    "(its VideoGenerator has no decode_latents)")
+        return True
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return ""
+
+    RETURN_TYPES = ("STRING", "IMAGE", "INT", "FLOAT", "STRING")
+    RETURN_NAMES = ("video_path", "frames", "frame_count", "fps", "stats")
+    FUNCTION = "decode"
+    CATEGORY = "fastvideo"
+
+    def decode(self,
+               latents,
+               output_path,
+               vae_config=None,
+               vae_precision=None,
+               vae_tiling=None,
+               vae_sp=None,
+               encode_config=None,
+               save_video=True,
+               return_frames=False):
+        meta = latents.get("fastvideo")
+        if not meta:
+            raise ValueError(
+                "These latents were not produced by a FastVideo node")
+
+        # Same denoise settings, only the VAE ones replaced
+        pipeline_config = copy.deepcopy(meta["pipeline_config"])
+        if vae_config is not None:
+            update_config_from_args(pipeline_config.vae_config, vae_config)
+            if vae_config.get("auto_tune"):
+                autotune_vae_tiling(meta["model_path"],
+                                    pipeline_config.vae_config,
+                                    meta["inference_args"])
+        update_config_from_args(
+            pipeline_config, {
+                k: v
+                for k, v in (("vae_precision", vae_precision),
+                             ("vae_tiling", vae_tiling), ("vae_sp", vae_sp))
+                if not is_auto(v)
+            })
+
+        request = GenerationRequest(
+            model_path=meta["model_path"],
+            generation_args=meta["generation_args"],
+            pipeline_config=pipeline_config,
+            prompt=meta["prompt"],
+            output_path=output_path,
+            inference_args=meta["inference_args"],
+            text_encoder_config=meta.get("text_encoder_config", {}),
+            encode_config=dict(encode_config or {}),
+            save_video=save_video,
+            return_frames=return_frames,
+            return_latents=True,
+            # The IMAGE itself is not part of the latents
+            known_image_digest=meta.get("image_digest"))
+        if request.latent_key != meta["key"]:
+            raise ValueError("Latent settings changed; only VAE settings "
+                             "can be overridden when decoding")
+
+        store = get_latent_store()
+        if not os.path.exists(store.path(request.latent_key)):
+            # Trimmed from the store since; the workflow still holds them
+            store.put(request.latent_key, latents["samples"])
+
+        print(f"Decoding FastVideo latents {meta['key'][:12]}")
+        result = wait_for_job(self.submit_request(request))
+        return (result.video_path, result.frames, result.frame_count,
+                result.fps, json.dumps(result.stats))
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import threading
+from typing import Any
+
+from .generator_pool import device_memory
+from .node_helpers import AUTO_TUNED_ATTR, GIB, env_gib
+
+# Decoder activation bytes per output pixel of one tile
+VAE_BYTES_PER_PIXEL = 384
+# Fixed cost of a tile (launches, halo handling) in output pixels
+TILE_OVERHEAD_PIXELS = 64 * 64 * 4
+# Smallest overlap that still blends seams away
+SPATIAL_OVERLAP = 64
+TEMPORAL_OVERLAP = 4
+SPATIAL_STEP = 64
+TEMPORAL_STEP = 4
+MIN_SPATIAL_TILE = 128
+MIN_TEMPORAL_TILE = 8
+# Share of the first GPU's total memory the decoder may use when no budget
+# is set. Total rather than free memory, so the choice does not change once
+# a model is loaded; the rest is left to the resident DiT and text encoder
+DEFAULT_BUDGET_FRACTION = 0.25
+
+CACHE_FILE = os.environ.get("FASTVIDEO_VAE_TILING_CACHE") or os.path.join(
+    os.path.expanduser("~"), ".cache", "fastvideo_comfyui", "vae_tiling.json")
+
+
+@dataclasses.dataclass
+class TilingPlan:
+    tile_height: int
+    tile_width: int
+    tile_frames: int
+    stride_height: int
+    stride_width: int
+    stride_frames: int
+    num_tiles: int
+    overlap_overhead: float
+    peak_bytes: int
+
+    def config_args(self) -> dict[str, Any]:
+        """Values for the VAE config's tiling fields."""
+        return {
+            "tile_sample_min_height": self.tile_height,
+            "tile_sample_min_width": self.tile_width,
+            "tile_sample_min_num_frames": self.tile_frames,
+            "tile_sample_stride_height": self.stride_height,
+            "tile_sample_stride_width": self.stride_width,
+            "tile_sample_stride_num_frames": self.stride_frames,
+            "blend_num_frames": self.tile_frames - self.stride_frames,
+        }
+
+
+def _axis(length: int, tile: int, stride: int) -> tuple[int, int]:
+    """Number of tiles along one axis and the extent they decode in total."""
+    if tile >= length:
+        return 1, length
+    count = -(-(length - tile) // stride) + 1
+    return count, sum(min(tile, length - i * stride) for i in range(count))
+
+
+def _sizes(length: int, step: int, minimum: int, overlap: int) -> list[tuple]:
+    """Candidate (tile, stride) pairs along one axis, untiled included."""
+    sizes = [(length, length)]
+    tile = minimum
+    while tile < length:
+        sizes.append((tile, tile - overlap))
+        tile += step
+    return sizes
+
+
+def plan_tiling(height: int, width: int, num_frames: int,
+                budget: int) -> TilingPlan | None:
+    """
+    Pick the tiling with the least redundant work whose tiles fit in memory.
+
+    Args:
+        height: Output height in pixels
+        width: Output width in pixels
+        num_frames: Number of output frames
+        budget: Bytes the decoder may use for one tile's activations
+
+    Returns:
+        The best tiling, or None if even the smallest tile does not fit
+    """
+    volume = height * width * num_frames
+    heights = [(_axis(height, t, s), t, s) for t, s in _sizes(
+        height, SPATIAL_STEP, MIN_SPATIAL_TILE, SPATIAL_OVERLAP)]
+    widths = [(_axis(width, t, s), t, s) for t, s in _sizes(
+        width, SPATIAL_STEP, MIN_SPATIAL_TILE, SPATIAL_OVERLAP)]
+    frames = [(_axis(num_frames, t, s), t, s) for t, s in _sizes(
+        num_frames, TEMPORAL_STEP, MIN_TEMPORAL_TILE, TEMPORAL_OVERLAP)]
+
+    best = None
+    for (nh, eh), th, sh in heights:
+        for (nw, ew), tw, sw in widths:
+            for (nf, ef), tf, sf in frames:
+                peak = (min(th, height) * min(tw, width) * min(tf, num_frames)
+                        * VAE_BYTES_PER_PIXEL)
+                if peak > budget:
+                    continue
+                tiles = nh * nw * nf
+                work = eh * ew * ef + tiles * TILE_OVERHEAD_PIXELS
+                # Least work first; larger tiles break ties
+                score = (work, -peak)
+                if best is None or score < best[0]:
+                    best = (score, th, tw, tf, sh, sw, sf, tiles, eh * ew * ef,
+                            peak)
+    if best is None:
+        return None
+    _, th, tw, tf, sh, sw, sf, tiles, decoded, peak = best
+    return TilingPlan(tile_height=th,
+                      tile_width=tw,
+                      tile_frames=tf,
+                      stride_height=sh,
+                      stride_width=sw,
+                      stride_frames=sf,
+                      num_tiles=tiles,
+                      overlap_overhead=decoded / volume - 1,
+                      peak_bytes=peak)
+
+
+class TilingStore:
+    """Chosen tilings persisted as JSON so later runs skip the search."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._plans: dict[str, dict[str, Any]] | None = None
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._plans is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._plans = json.load(f)
+            except (OSError, ValueError):
+                self._plans = {}
+        return self._plans
+
+    def get(self, key: str) -> TilingPlan | None:
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        try:
+            return TilingPlan(**entry)
+        except TypeError:
+            return None
+
+    def put(self, key: str, plan: TilingPlan) -> None:
+        with self._lock:
+            self._load()[key] = dataclasses.asdict(plan)
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._plans, f, indent=1, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving VAE tiling choices: {e}")
+
+
+_store = TilingStore(CACHE_FILE)
+
+
+def autotune_vae_tiling(model_path: str, vae_config: Any,
+                        inference_args: dict[str, Any] | None) -> None:
+    """
+    Overwrite the tiling fields of ``vae_config`` for the requested shape.
+
+    The budget is ``FASTVIDEO_VAE_TILE_BUDGET_GB``, or a quarter of the
+    first GPU's total memory. Without a GPU and without a budget the config
+    is left unchanged. The fields set here are recorded on the config (see
+    ``AUTO_TUNED_ATTR``) and left out of the pool key: a generator built for
+    one output shape is reused for another, and the pool reloads its VAE with
+    the new tiles when the backend allows it.
+    """
+    inference_args = inference_args or {}
+    height = int(inference_args.get("height", 720))
+    width = int(inference_args.get("width", 1280))
+    num_frames = int(inference_args.get("num_frames", 45))
+
+    memory = device_memory()
+    total_gib = memory[0][1] // GIB if memory else 0
+    budget = env_gib("FASTVIDEO_VAE_TILE_BUDGET_GB")
+    if budget is None:
+        if not memory:
+            return
+        budget = int(memory[0][1] * DEFAULT_BUDGET_FRACTION) // GIB * GIB
+
+    key = f"{model_path}|{width}x{height}x{num_frames}|{total_gib}|{budget}"
+    plan = _store.get(key)
+    if plan is None:
+        plan = plan_tiling(height, width, num_frames, budget)
+        if plan is None:
+            print(f"VAE tiling: no tile of {width}x{height}x{num_frames} "
+                  f"fits in {budget / GIB:.1f} GiB; keeping the config")
+            return
+        _store.put(key, plan)
+        print(f"VAE tiling for {width}x{height}x{num_frames}: "
+              f"{plan.tile_width}x{plan.tile_height}x{plan.tile_frames} "
+              f"tiles, stride {plan.stride_width}x{plan.stride_height}x"
+              f"{plan.stride_frames}, {plan.num_tiles} tiles, "
+              f"{plan.overlap_overhead:.1%} overlap, predicted peak "
+              f"{plan.peak_bytes / GIB:.2f} GiB")
+
+    tuned = []
+    for name, value in plan.config_args().items():
+        if hasattr(vae_config, name):
+            setattr(vae_config, name, value)
+            tuned.append(name)
+    setattr(vae_config, AUTO_TUNED_ATTR, tuple(tuned))
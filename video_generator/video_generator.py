@@ -1,18 +1,49 @@
 from __future__ import annotations
 
-import glob
+import dataclasses
+import functools
+import json
 import os
-import signal
 import sys
-import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from typing import Any
 
+import folder_paths
 from comfy.model_management import processing_interrupted
 
-from fastvideo import PipelineConfig
 from fastvideo import VideoGenerator as FastVideoGenerator
 
+from .cancellation import (POLL_INTERVAL, detaches, request_cancel, signals,
+                           workers_healthy)
+from .checkpoints import (CHECKPOINT_STEPS, CheckpointCallback,
+                          get_checkpoint_store)
+from .config_cache import load_pipeline_config
+from .embedding_cache import embedding_key, get_embedding_cache
+from .generator_pool import (GeneratorPool, generator_fingerprint,
+                             get_generator_pool)
+from .job_queue import Job, JobStatus, Partition, get_job_queue
+from .latent_store import (decode_latents, get_latent_store, latent_key,
+                           latent_output)
+from .load_image import file_digest, image_source
+from .manifest import get_output_manifest
+from .metrics import NullTimer, StageTimer, new_timer, observe_job
+from .node_helpers import (accepts_kwarg, canonicalize,
+                           frames_to_image_tensor, image_tensor_digest,
+                           image_tensor_to_pil, image_tensor_to_uint8, is_auto)
+from .parallel_planner import auto_plan
+from .pipelining import ENABLED as PIPELINE_ENABLED
+from .pipelining import Stage, get_stage_pipeline
+from .result_cache import ENABLED as RESULT_CACHE_ENABLED
+from .result_cache import get_result_cache, request_fingerprint
+from .vae_tiling import autotune_vae_tiling
+from .video_writer import (EncodeSettings, backend_video_path, video_path,
+                           write_video, writer_available)
+
+# Encode videos on the CPU encoder pool instead of inside generate_video
+OFFLOAD_ENCODE = os.environ.get("FASTVIDEO_OFFLOAD_ENCODE", "1") != "0"
+
 sys.path.insert(
     0,
     os.path.dirname(
@@ -34,6 +65,80 @@ class GenerationCancelledException(Exception):
         super().__init__(self.message)
 
 
+@dataclasses.dataclass
+class GenerationRequest:
+    model_path: str
+    generation_args: dict[str, Any]
+    pipeline_config: Any
+    prompt: str
+    output_path: str
+    inference_args: dict[str, Any]
+    text_encoder_config: dict[str, Any] = dataclasses.field(
+        default_factory=dict)
+    encode_config: dict[str, Any] = dataclasses.field(default_factory=dict)
+    save_video: bool = True
+    return_frames: bool = False
+    return_latents: bool = False
+    image: Any = None
+    # Digest of an image that is not passed along, e.g. when decoding the
+    # stored latents of an image-to-video generation
+    known_image_digest: str | None = None
+    timer: StageTimer | NullTimer = dataclasses.field(init=False,
+                                                      repr=False,
+                                                      default_factory=new_timer)
+
+    @functools.cached_property
+    def image_digest(self) -> str | None:
+        if self.known_image_digest is not None:
+            return self.known_image_digest
+        if self.image is not None:
+            return image_tensor_digest(self.image)
+        image_path = self.inference_args.get('image_path')
+        if not image_path:
+            return None
+        # The file can be replaced under the same name
+        try:
+            return f"file:{file_digest(image_path)}"
+        except OSError:
+            return None
+
+    @functools.cached_property
+    def fingerprint(self) -> str:
+        inference_args = self.inference_args
+        if self.encode_config:
+            # Same frames, different file
+            inference_args = {**inference_args, "encode": self.encode_config}
+        return request_fingerprint(self.model_path, self.generation_args,
+                                   self.pipeline_config, self.prompt,
+                                   inference_args, self.image_digest)
+
+    @functools.cached_property
+    def latent_key(self) -> str:
+        return latent_key(self.model_path, self.generation_args,
+                          self.pipeline_config, self.prompt,
+                          self.inference_args, self.image_digest)
+
+
+def can_return_latents() -> bool:
+    """Whether the installed FastVideo can hand out denoised latents."""
+    return accepts_kwarg(FastVideoGenerator.generate_video, "return_latents")
+
+
+def can_decode_latents() -> bool:
+    """Whether the installed FastVideo can run the VAE on its own."""
+    return callable(getattr(FastVideoGenerator, "decode_latents", None))
+
+
+@dataclasses.dataclass
+class GenerationResult:
+    video_path: str
+    frames: Any = None
+    frame_count: int = 0
+    fps: float = 0.0
+    stats: dict[str, Any] = dataclasses.field(default_factory=dict)
+    latents: Any = None
+
+
 def update_config_from_args(config: Any, args_dict: dict[str, Any]) -> None:
     """
     Update configuration object from arguments dictionary.
@@ -78,6 +183,7 @@ class VideoGenerator:
             },
             "optional": {
                 "inference_args": ("INFERENCE_ARGS", ),
+                "image": ("IMAGE", ),
                 "embedded_cfg_scale": ("FLOAT", {
                     "default": 6.0
                 }),
@@ -108,85 +214,415 @@ class VideoGenerator:
                 "dit_cpu_offload": ([True, False], {
                     "default": False
                 }),
+                "save_video": ([True, False], {
+                    "default": True
+                }),
+                "return_frames": ([True, False], {
+                    "default": False
+                }),
+                "return_latents": ([True, False], {
+                    "default": False
+                }),
+                "encode_config": ("VIDEO_ENCODE_CONFIG", ),
             }
         }
 
     @classmethod
     def VALIDATE_INPUTS(cls, **kwargs):
+        if kwargs.get("return_latents") and not can_return_latents():
+            return ("This FastVideo version cannot return latents (its "
+                    "generate_video has no return_latents option); disable "
+                    "return_latents")
         return True
 
-    RETURN_TYPES = ("STRING", )
-    RETURN_NAMES = ("video_path", )
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # ComfyUI already re-runs the node when any input changes; this only
+        # reports the video of the last run going missing or being replaced.
+        # It must stay cheap, and ComfyUI passes only the widget values here
+        return _video_state(_widget_key(kwargs))
+
+    RETURN_TYPES = ("STRING", "IMAGE", "INT", "FLOAT", "STRING", "LATENT")
+    RETURN_NAMES = ("video_path", "frames", "frame_count", "fps", "stats",
+                    "latents")
     FUNCTION = "launch_inference"
     CATEGORY = "fastvideo"
 
-    generator: FastVideoGenerator | None = None
-    _interrupt_thread: threading.Thread | None = None
-    _generation_active: bool = False
-    _generation_interrupted: bool = False
-    _interrupt_event: threading.Event = threading.Event()
-    _generation_thread: threading.Thread | None = None
-    _generation_result: str | None = None
-    _generation_exception: Exception | None = None
-
-    def _monitor_for_interruption(self):
-        """Background thread that monitors for interruption requests"""
-        time.sleep(2)  # Give the generation thread time to send execute_forward
-
-        while self._generation_active and not self._interrupt_event.is_set():
-            if processing_interrupted():
-                print("Video generation interrupted by user")
-                self._generation_interrupted = True
-
-                # Try to send interrupt signal to worker processes
-                if self.generator is not None and hasattr(
-                        self.generator, 'executor'):
-                    try:
-                        # The MultiprocExecutor has a workers attribute
-                        if hasattr(self.generator.executor, 'workers'):
-                            for worker in self.generator.executor.workers:
-                                if worker.is_alive():
-                                    os.kill(worker.pid, signal.SIGINT)
-                            print("Interrupt signal sent to worker processes")
-                    except Exception as e:
-                        print(f"Error sending interrupt signal: {e}")
-
-                # Set the interrupt event to notify other threads
-                self._interrupt_event.set()
-                break
-            time.sleep(0.5)
-
-    def _run_generation(self, prompt: str, output_path: str,
-                        inference_args: dict[str, Any]) -> None:
-        """Thread function to run the generation"""
+    def _run_generation(self, request: GenerationRequest,
+                        job: Job) -> GenerationResult | Future:
+        """Job queue function to run the generation"""
+        timer = request.timer
+        if job.started_at is not None:
+            timer.add("queue_wait", job.started_at - job.submitted_at)
         try:
-            if self.generator is not None:
-                self.generator.generate_video(prompt=prompt,
-                                              output_path=output_path,
-                                              **inference_args)
-                self._generation_result = os.path.join(output_path,
-                                                       f"{prompt[:100]}.mp4")
+            result = self._generate(request, job)
+        except BaseException:
+            self._observe_failure(request, job)
+            raise
+        if not isinstance(result, Future):
+            return self._observe(request, result)
+
+        # Decoding and muxing continue on the stage pipeline
+        observed: Future = Future()
+
+        def finish(future: Future) -> None:
+            if future.exception() is not None:
+                self._observe_failure(request, job)
+                observed.set_exception(future.exception())
             else:
-                raise RuntimeError("Generator is not initialized")
-        except Exception as e:
-            self._generation_exception = e
-            self._interrupt_event.set()
-
-    def load_output_video(self, output_dir):
-        video_extensions = ["*.mp4", "*.avi", "*.mov", "*.mkv"]
-        video_files = []
+                observed.set_result(self._observe(request, future.result()))
+
+        result.add_done_callback(finish)
+        return observed
+
+    def _observe(self, request: GenerationRequest,
+                 result: GenerationResult) -> GenerationResult:
+        result.stats = request.timer.as_dict()
+        observe_job("done", result.stats)
+        if request.save_video and result.video_path:
+            get_result_cache(request.output_path).record(
+                request.fingerprint, result.video_path, request.prompt,
+                result.frame_count, result.fps, result.stats)
+        return result
+
+    def _observe_failure(self, request: GenerationRequest, job: Job) -> None:
+        observe_job("cancelled" if job.cancel_requested.is_set() else "failed",
+                    request.timer.as_dict())
+
+    def _generate(self, request: GenerationRequest,
+                  job: Job) -> GenerationResult | Future:
+        timer = request.timer
+        stored = None
+        if request.return_latents:
+            stored = get_latent_store().get(request.latent_key)
+            if stored is not None and not (request.save_video
+                                           or request.return_frames):
+                # The denoised latents are all that was asked for
+                print(f"Reusing stored latents {request.latent_key[:12]}")
+                return self._result(request, None, stored)
+
+        pool = get_generator_pool()
+        print('generation_args', request.generation_args)
+        with timer.stage("generator_acquire"):
+            key, generator = pool.acquire(
+                request.model_path,
+                request.generation_args,
+                request.pipeline_config,
+                FastVideoGenerator.from_pretrained,
+                devices=job.partition.devices if job.partition else ())
+        timer.attach(generator)
+        print('generator_pool', {
+            k: v
+            for k, v in pool.stats().items() if k != "entries"
+        })
+        try:
+            result = self._generate_on(pool, key, generator, request, job,
+                                       stored)
+        except BaseException:
+            pool.release(key, generator)
+            raise
+        if isinstance(result, Future):
+            # Stages on the pipeline may still decode with the generator
+            result.add_done_callback(
+                lambda _: pool.release(key, generator))
+        else:
+            pool.release(key, generator)
+        return result
+
+    def _generate_on(self, pool: GeneratorPool, key: str,
+                     generator: FastVideoGenerator, request: GenerationRequest,
+                     job: Job, stored: Any) -> GenerationResult | Future:
+        """Run a request on a generator pinned by ``_generate``"""
+        timer = request.timer
+        # Checked first: a cancel hook or signal must only reach a generator
+        # that goes on to run this job
+        if job.cancel_requested.is_set():
+            raise GenerationCancelledException()
+        job.on_cancel(lambda: print(
+            "Cancel requested, action:",
+            request_cancel(generator, job.started_at)))
+
+        if stored is not None and callable(
+                getattr(generator, "decode_latents", None)):
+            # Same denoise as a previous run: only the VAE has to run again
+            print(f"Decoding stored latents {request.latent_key[:12]}")
+            mux = self._plugin_writes(request)
+            with timer.stage("decode"):
+                output = decode_latents(
+                    generator, stored, request.output_path, request.prompt,
+                    request.save_video and not mux, request.return_frames
+                    or mux, float(request.inference_args.get('fps', 24)))
+            if mux:
+                return get_stage_pipeline().handoff(job, output, [
+                    self._mux_stage(request, job),
+                    ("result",
+                     functools.partial(self._result, request,
+                                       latents=stored))
+                ])
+            return self._result(request, output, stored)
+
+        print('inference_args', request.inference_args)
+        inference_args = dict(request.inference_args)
+        with timer.stage("text_encode"):
+            extra_args = self._prompt_embeddings(generator, request)
+        if request.image is not None:
+            # The IMAGE input replaces InferenceArgs.image_path
+            inference_args.pop('image_path', None)
+            extra_args.update(self._conditioning_image(generator, request))
+        if request.return_frames:
+            extra_args['return_frames'] = True
+        if not request.save_video:
+            extra_args['save_video'] = False
+        if request.return_latents:
+            if not accepts_kwarg(generator.generate_video, "return_latents"):
+                raise RuntimeError(
+                    "This FastVideo version cannot return latents; disable "
+                    "return_latents")
+            extra_args['return_latents'] = True
+        extra_args.update(self._checkpointing(generator, request))
+        stages = self._post_stages(generator, request, job, extra_args)
+        try:
+            with timer.stage("generate"):
+                output = generator.generate_video(
+                    prompt=request.prompt,
+                    output_path=request.output_path,
+                    **inference_args,
+                    **extra_args)
+        finally:
+            if job.cancel_requested.is_set():
+                if signals(generator) or not workers_healthy(generator):
+                    # Interrupted workers may be left in any state; drop the
+                    # generator once this job lets go of it so the next job
+                    # starts cleanly
+                    pool.discard(key, generator)
+                print(f"Cancelled job {job.id} went idle after "
+                      f"{time.monotonic() - job.cancel_requested_at:.3f}s")
+        if job.cancel_requested.is_set():
+            if not detaches(generator):
+                raise GenerationCancelledException()
+            # The generation ran to completion anyway: finish it so the
+            # result cache returns it when the request is queued again
+            job.detached = True
+            print(f"Recording the result of detached job {job.id}")
+        if 'checkpoint_callback' in extra_args:
+            get_checkpoint_store().finish(request.latent_key)
+
+        latents = None
+        if request.return_latents:
+            latents = output.get('latents') if isinstance(output,
+                                                          dict) else None
+            if latents is None:
+                raise RuntimeError("The pipeline did not return latents")
+            with timer.stage("latent_store"):
+                latents = get_latent_store().put(request.latent_key, latents)
+        if stages is not None:
+            # The partition can start denoising the next job meanwhile
+            return get_stage_pipeline().handoff(
+                job, output, stages +
+                [("result",
+                  functools.partial(self._result, request,
+                                    latents=latents))])
+        return self._result(request, output, latents)
+
+    def _post_stages(self, generator: FastVideoGenerator,
+                     request: GenerationRequest, job: Job,
+                     extra_args: dict[str, Any]) -> list[Stage] | None:
+        """
+        Split decoding and video encoding off the denoise call.
+
+        Adjusts ``extra_args`` so ``generate_video`` stops after denoising
+        (with pipelining and a backend that can decode separately) or after
+        decoding, and returns the stages that finish the job, or None to let
+        the backend write the video itself.
+        """
+        timer = request.timer
+        mux = self._plugin_writes(request)
+        if (PIPELINE_ENABLED
+                and callable(getattr(generator, "decode_latents", None))
+                and accepts_kwarg(generator.generate_video, "output_type")
+                and accepts_kwarg(generator.generate_video,
+                                  "return_latents")):
+            extra_args.update(output_type="latent",
+                              return_latents=True,
+                              save_video=False)
+            extra_args.pop('return_frames', None)
+
+            def decode(output: Any) -> Any:
+                self._check_cancel(job)
+                with timer.stage("decode"):
+                    return decode_latents(
+                        generator, output['latents'], request.output_path,
+                        request.prompt, request.save_video and not mux,
+                        request.return_frames or mux,
+                        float(request.inference_args.get('fps', 24)))
+
+            return [("decode", decode)] + ([self._mux_stage(request, job)]
+                                           if mux else [])
+        if mux and accepts_kwarg(generator.generate_video, "save_video"):
+            extra_args.update(return_frames=True, save_video=False)
+            return [self._mux_stage(request, job)]
+        if request.encode_config:
+            raise RuntimeError("Video Encode Config needs imageio-ffmpeg and "
+                               "a FastVideo version that can skip saving")
+        return None
+
+    def _plugin_writes(self, request: GenerationRequest) -> bool:
+        """Whether the video is encoded here rather than by FastVideo"""
+        if not request.save_video or not writer_available():
+            return False
+        return OFFLOAD_ENCODE or bool(request.encode_config)
+
+    def _mux_stage(self, request: GenerationRequest, job: Job) -> Stage:
+        """Encode the decoded frames on the CPU encoder pool"""
+        settings = EncodeSettings.from_config(request.encode_config)
+
+        def write(output: Any) -> Any:
+            self._check_cancel(job)
+            frames = output
+            if isinstance(output, dict):
+                frames = output.get('frames', output.get('samples'))
+            with request.timer.stage("mux"):
+                path = write_video(
+                    frames,
+                    video_path(request.output_path, request.prompt,
+                               request.fingerprint, settings),
+                    float(request.inference_args.get('fps', 24)), settings)
+            if isinstance(output, dict):
+                return {**output, 'video_path': path}
+            return {'frames': output, 'video_path': path}
+
+        return ("mux", write)
+
+    @staticmethod
+    def _check_cancel(job: Job) -> None:
+        if job.cancel_requested.is_set() and not job.detached:
+            raise GenerationCancelledException()
 
-        for ext in video_extensions:
-            video_files.extend(glob.glob(os.path.join(output_dir, ext)))
+    def _result(self,
+                request: GenerationRequest,
+                output: Any,
+                latents: Any = None) -> GenerationResult:
+        """Turn the pipeline output into the node's outputs"""
+        result = GenerationResult(
+            video_path="",
+            frame_count=request.inference_args.get('num_frames', 0),
+            fps=float(request.inference_args.get('fps', 24)))
+        if request.save_video:
+            result.video_path = self._written_path(request, output)
+        if request.return_frames:
+            if isinstance(output, dict):
+                output = output.get('frames', output.get('samples'))
+            with request.timer.stage("frames_to_tensor"):
+                result.frames = frames_to_image_tensor(output)
+            result.frame_count = result.frames.shape[0]
+        if latents is not None:
+            result.latents = latent_output(
+                latents,
+                key=request.latent_key,
+                model_path=request.model_path,
+                generation_args=request.generation_args,
+                pipeline_config=request.pipeline_config,
+                prompt=request.prompt,
+                inference_args=request.inference_args,
+                text_encoder_config=request.text_encoder_config,
+                image_digest=request.image_digest)
+        return result
+
+    def _prompt_embeddings(self, generator: FastVideoGenerator,
+                           request: GenerationRequest) -> dict[str, Any]:
+        """Cached text encoder outputs as extra generate_video arguments"""
+        # Only backends that can encode separately and accept precomputed
+        # embeddings can skip the text encoder
+        encode = getattr(generator, "encode_prompt", None)
+        if encode is None or not accepts_kwarg(generator.generate_video,
+                                               "prompt_embeds"):
+            return {}
+
+        config = request.pipeline_config
+        negative_prompt = request.inference_args.get("negative_prompt")
+        key = embedding_key(
+            request.prompt, negative_prompt,
+            f"{request.model_path}:"
+            f"{canonicalize(getattr(config, 'text_encoder_configs', None))}",
+            getattr(config, "text_encoder_precisions", None),
+            request.text_encoder_config)
+        cache = get_embedding_cache()
+        embeddings = cache.get(key)
+        if embeddings is None:
+            embeddings = encode(request.prompt,
+                                negative_prompt=negative_prompt)
+            cache.put(key, embeddings)
+        print('embedding_cache', cache.stats())
+        return {"prompt_embeds": embeddings}
+
+    def _checkpointing(self, generator: FastVideoGenerator,
+                       request: GenerationRequest) -> dict[str, Any]:
+        """Periodic denoise checkpoints and resuming from the latest one"""
+        if CHECKPOINT_STEPS <= 0:
+            return {}
+        if not (accepts_kwarg(generator.generate_video, "checkpoint_callback")
+                and accepts_kwarg(generator.generate_video, "resume_state")):
+            print("This FastVideo version cannot checkpoint generations")
+            return {}
+        store = get_checkpoint_store()
+        key = request.latent_key
+        extra_args = {
+            "checkpoint_every": CHECKPOINT_STEPS,
+            # Picklable, for backends that run the denoise loop in workers
+            "checkpoint_callback": CheckpointCallback(store.root, key),
+        }
+        checkpoint = store.load(key)
+        if checkpoint is not None:
+            print(f"Resuming generation {key[:12]} after step "
+                  f"{checkpoint[0]}")
+            extra_args["resume_state"] = checkpoint
+        return extra_args
+
+    def _conditioning_image(self, generator: FastVideoGenerator,
+                            request: GenerationRequest) -> dict[str, Any]:
+        """Hand an IMAGE input to the pipeline for I2V"""
+        if accepts_kwarg(generator.generate_video, "pil_image"):
+            return {"pil_image": image_tensor_to_pil(request.image)}
+        if accepts_kwarg(generator.generate_video, "image"):
+            # Shared memory so worker processes map the pixels, not copy them
+            return {"image": image_tensor_to_uint8(request.image).share_memory_()}
+
+        # The backend only takes a path. An IMAGE loaded from a file as is
+        # can use that file; anything else is written once per content
+        source = image_source(request.image)
+        if source is not None:
+            return {"image_path": source}
+        image_dir = os.path.join(folder_paths.get_temp_directory(),
+                                 "fastvideo_images")
+        image_path = os.path.join(image_dir, f"{request.image_digest}.png")
+        if not os.path.exists(image_path):
+            os.makedirs(image_dir, exist_ok=True)
+            tmp_path = f"{image_path}.{os.getpid()}.tmp.png"
+            image_tensor_to_pil(request.image).save(tmp_path, compress_level=1)
+            os.replace(tmp_path, image_path)
+        return {"image_path": image_path}
+
+    def _written_path(self, request: GenerationRequest, output: Any) -> str:
+        """The file the video of ``request`` was written to"""
+        if isinstance(output, dict) and isinstance(output.get('video_path'),
+                                                   str):
+            return output['video_path']
+        # FastVideo saved it and does not say where; it names files after
+        # the prompt
+        path = backend_video_path(request.output_path, request.prompt)
+        if not os.path.exists(path):
+            print(f"Expected video not found: {path}")
+        return path
 
-        if not video_files:
-            print("No video files found in output directory: %s", output_dir)
+    def load_output_video(self, output_dir):
+        """Most recently recorded video under ``output_dir``, or ''"""
+        entry = get_output_manifest(output_dir).latest()
+        if entry is None:
+            print(f"No videos recorded in output directory: {output_dir}")
             return ""
+        return entry["path"]
 
-        video_files.sort()
-        return video_files[0]
-
-    def launch_inference(
+    def prepare_request(
         self,
         prompt,
         output_path,
@@ -201,22 +637,19 @@ class VideoGenerator:
         text_encoder_precision,
         precision,
         inference_args=None,
+        image=None,
         vae_config=None,
         text_encoder_config=None,
         dit_config=None,
         dit_cpu_offload=None,
-    ):
-        print('Running FastVideo inference')
-
-        # Reset interruption flag and event
-        self._generation_interrupted = False
-        self._interrupt_event.clear()
-        self._generation_result = None
-        self._generation_exception = None
-
+        save_video=True,
+        return_frames=False,
+        return_latents=False,
+        encode_config=None,
+    ) -> GenerationRequest:
         # Load pipeline config from model path
-        pipeline_config = PipelineConfig.from_pretrained(model_path)
-        print('pipeline_config', pipeline_config)
+        config_start = time.perf_counter()
+        pipeline_config = load_pipeline_config(model_path)
 
         # Update configs with provided config dictionaries
         if dit_config is not None:
@@ -224,6 +657,9 @@ class VideoGenerator:
 
         if vae_config is not None:
             update_config_from_args(pipeline_config.vae_config, vae_config)
+            if vae_config.get("auto_tune"):
+                autotune_vae_tiling(model_path, pipeline_config.vae_config,
+                                    inference_args)
 
         if text_encoder_config is not None:
             update_config_from_args(pipeline_config.text_encoder_configs,
@@ -247,7 +683,7 @@ class VideoGenerator:
         # Filter out any value explicitly set to -99999 (auto values)
         pipeline_args = {
             k: v
-            for k, v in raw_pipeline_args.items() if str(int(v)) != str(-99999)
+            for k, v in raw_pipeline_args.items() if not is_auto(v)
         }
 
         update_config_from_args(pipeline_config, pipeline_args)
@@ -265,51 +701,190 @@ class VideoGenerator:
         generation_args = {
             k: v
             for k, v in raw_generation_args.items()
-            if str(int(v)) != str(-99999)
+            if not is_auto(v)
         }
 
-        if self.generator is None:
-            print('generation_args', generation_args)
-            print('pipeline_config', pipeline_config)
-            self.generator = FastVideoGenerator.from_pretrained(
-                model_path=model_path,
-                **generation_args,
-                pipeline_config=pipeline_config)
-
-        print('inference_args', inference_args)
-
-        # Start a thread to run the generation
-        self._generation_thread = threading.Thread(target=self._run_generation,
-                                                   args=(prompt, output_path,
-                                                         inference_args),
-                                                   daemon=True)
-        self._generation_thread.start()
-
-        # Start a background thread to monitor for interruptions
-        self._generation_active = True
-        self._interrupt_thread = threading.Thread(
-            target=self._monitor_for_interruption, daemon=True)
-        self._interrupt_thread.start()
-
-        # Wait for either completion or interruption
-        while self._generation_thread.is_alive(
-        ) and not self._interrupt_event.is_set():
-            self._generation_thread.join(timeout=0.5)
-
-        self._generation_active = False
-        if self._interrupt_thread:
-            self._interrupt_thread.join(timeout=1.0)
-            self._interrupt_thread = None
-
-        if self._generation_interrupted:
-            print("Video generation was cancelled by user")
-            raise GenerationCancelledException()
-        elif self._generation_exception:
-            # Re-raise the exception from the generation thread
-            raise self._generation_exception
-        elif self._generation_result:
-            return (self._generation_result, )
-        else:
-            # This shouldn't happen, but just in case
-            print("Generation completed but no result was produced")
-            raise Exception("Generation failed to produce a result")
+        # Let the planner fill in parallelism settings left on auto
+        parallel_keys = ("num_gpus", "sp_size", "tp_size")
+        if any(is_auto(raw_generation_args.get(k)) for k in parallel_keys) \
+                or is_auto(vae_sp):
+            fixed = {k: generation_args[k] for k in parallel_keys
+                     if k in generation_args}
+            if "vae_sp" in pipeline_args:
+                fixed["vae_sp"] = pipeline_args["vae_sp"]
+            plan = auto_plan(model_path, inference_args,
+                             vae_tiling=pipeline_args.get("vae_tiling", True),
+                             fixed=fixed,
+                             max_gpus=get_job_queue().max_partition_size())
+            if plan is not None:
+                generation_args.update(plan.generation_args())
+                if "vae_sp" not in fixed:
+                    update_config_from_args(pipeline_config,
+                                            {"vae_sp": plan.vae_sp})
+
+        if encode_config:
+            # Fail before denoising, not when muxing
+            error = EncodeSettings.from_config(encode_config).validate()
+            if error is not None:
+                raise ValueError(error)
+
+        request = GenerationRequest(model_path=model_path,
+                                    generation_args=generation_args,
+                                    pipeline_config=pipeline_config,
+                                    prompt=prompt,
+                                    output_path=output_path,
+                                    inference_args=dict(inference_args or {}),
+                                    text_encoder_config=dict(
+                                        text_encoder_config or {}),
+                                    encode_config=dict(encode_config or {}),
+                                    save_video=save_video,
+                                    return_frames=return_frames,
+                                    return_latents=return_latents,
+                                    image=image)
+        request.timer.add("config_load", time.perf_counter() - config_start)
+        return request
+
+    def submit(self, priority: int = 0, **kwargs) -> Job:
+        """Queue a generation and return its job handle without waiting."""
+        return self.submit_request(self.prepare_request(**kwargs),
+                                   priority=priority)
+
+    def submit_request(self,
+                       request: GenerationRequest,
+                       priority: int = 0) -> Job:
+        """Queue a prepared request, or return a finished job on a cache hit."""
+        if (RESULT_CACHE_ENABLED and request.save_video
+                and not request.return_frames and not request.return_latents):
+            cached = get_result_cache(request.output_path).lookup(
+                request.fingerprint)
+            if cached is not None:
+                print(f"Reusing cached video {cached}")
+                return get_job_queue().add_completed(
+                    GenerationResult(
+                        video_path=cached,
+                        frame_count=request.inference_args.get(
+                            'num_frames', 0),
+                        fps=float(request.inference_args.get('fps', 24)),
+                        stats={"result_cache": "hit"}),
+                    label=request.prompt[:60])
+        return get_job_queue().submit(
+            functools.partial(self._run_generation, request),
+            priority=priority,
+            label=request.prompt[:60],
+            num_gpus=request.generation_args.get('num_gpus', 0),
+            affinity=generator_fingerprint(request.model_path,
+                                           request.generation_args,
+                                           request.pipeline_config),
+            prepare=functools.partial(self._prepare, request)
+            if PIPELINE_ENABLED else None)
+
+    def _prepare(self, request: GenerationRequest, job: Job,
+                 partition: Partition) -> None:
+        """Encode a queued job's prompt while the job ahead of it denoises"""
+        pool = get_generator_pool()
+        key = generator_fingerprint(request.model_path,
+                                    request.generation_args,
+                                    request.pipeline_config, partition.devices)
+        generator = pool.peek(key, pin=True)
+        if generator is None:
+            return
+        try:
+            with request.timer.stage("text_encode_ahead"):
+                self._prompt_embeddings(generator, request)
+        finally:
+            pool.release(key, generator)
+
+    def launch_inference(self, **kwargs):
+        print('Running FastVideo inference')
+        key = _widget_key(kwargs)
+        # What IS_CHANGED reported for this run
+        state = _video_state(key)
+        job = self.submit(**kwargs)
+        result = wait_for_job(job)
+        if result.video_path:
+            _remember_video(key, result.video_path, state)
+        return (result.video_path, result.frames, result.frame_count,
+                result.fps, json.dumps(result.stats), result.latents)
+
+
+# Video written by the last run per widget values, for IS_CHANGED: its
+# path, size and mtime, and what IS_CHANGED returned for that run
+_last_videos: OrderedDict[str, tuple[str, int, int, str]] = OrderedDict()
+_LAST_VIDEOS_SIZE = 256
+
+
+def _widget_key(kwargs: dict[str, Any]) -> str:
+    """Key of the widget (constant) inputs, the only ones IS_CHANGED gets"""
+    return json.dumps(
+        {
+            k: v
+            for k, v in kwargs.items()
+            if isinstance(v, (str, int, float, bool))
+        },
+        sort_keys=True)
+
+
+def _video_state(key: str) -> str:
+    """
+    IS_CHANGED value for the widget values ``key``.
+
+    Unchanged until the video of the last run goes missing or is replaced,
+    and the same again once that run regenerated it; a different value after
+    the run would make ComfyUI run the node once more.
+    """
+    video = _last_videos.get(key)
+    if video is None:
+        return ""
+    path, size, mtime_ns, state = video
+    try:
+        st = os.stat(path)
+    except OSError:
+        return f"missing:{path}:{mtime_ns}"
+    if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+        return f"changed:{path}:{st.st_mtime_ns}"
+    return state
+
+
+def _remember_video(key: str, path: str, state: str) -> None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    _last_videos[key] = (path, st.st_size, st.st_mtime_ns, state)
+    _last_videos.move_to_end(key)
+    while len(_last_videos) > _LAST_VIDEOS_SIZE:
+        _last_videos.popitem(last=False)
+
+
+def wait_for_job(job: Job) -> GenerationResult:
+    """
+    Block until a queued generation finishes, honouring ComfyUI interrupts.
+
+    Args:
+        job: Handle returned by ``VideoGenerator.submit``
+
+    Returns:
+        The generated video path and, if requested, its frames
+    """
+    # Wait for either completion or interruption
+    while not job.wait(timeout=POLL_INTERVAL):
+        if processing_interrupted():
+            print("Video generation interrupted by user")
+            job.cancel()
+            break
+
+    if job.cancel_requested.is_set() or job.status == JobStatus.CANCELLED:
+        if job.cancel_requested_at is not None:
+            print("Video generation was cancelled by user "
+                  f"({(time.monotonic() - job.cancel_requested_at) * 1000:.0f}"
+                  " ms to return)")
+        raise GenerationCancelledException()
+    elif job.exception:
+        # Re-raise the exception from the generation thread
+        raise job.exception
+    elif job.result:
+        return job.result
+    else:
+        # This shouldn't happen, but just in case
+        print("Generation completed but no result was produced")
+        raise Exception("Generation failed to produce a result")
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import re
+from typing import Any
+
+import numpy as np
+
+CODECS = ["libx264", "libx265", "libvpx-vp9", "prores_ks", "ffv1"]
+CONTAINERS = ["mp4", "mkv", "mov", "webm"]
+PIXEL_FORMATS = [
+    "yuv420p", "yuv422p", "yuv444p", "yuv420p10le", "yuv422p10le", "bgr0"
+]
+
+# What each container can hold and each encoder can take, so a bad
+# combination fails when the graph is validated rather than after denoising
+CONTAINER_CODECS = {
+    "mp4": ("libx264", "libx265", "libvpx-vp9"),
+    "mkv": tuple(CODECS),
+    "mov": ("libx264", "libx265", "prores_ks"),
+    "webm": ("libvpx-vp9", ),
+}
+_YUV = ("yuv420p", "yuv422p", "yuv444p", "yuv420p10le", "yuv422p10le")
+CODEC_PIXEL_FORMATS = {
+    "libx264": _YUV,
+    "libx265": _YUV,
+    "libvpx-vp9": _YUV,
+    "prores_ks": ("yuv422p10le", ),
+    "ffv1": tuple(PIXEL_FORMATS),
+}
+# Highest CRF per encoder; the others have no CRF
+MAX_CRF = {"libx264": 51, "libx265": 51, "libvpx-vp9": 63}
+
+
+@dataclasses.dataclass(frozen=True)
+class EncodeSettings:
+    """How frames are encoded; the defaults match FastVideo's own writer."""
+    codec: str = "libx264"
+    # None keeps imageio's default quality
+    crf: int | None = None
+    pix_fmt: str = "yuv420p"
+    container: str = "mp4"
+    lossless: bool = False
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> EncodeSettings:
+        """Settings from a ``Video Encode Config`` node's output."""
+        fields = {f.name for f in dataclasses.fields(cls)}
+        settings = cls(**{
+            k: v
+            for k, v in (config or {}).items() if k in fields
+        })
+        if settings.lossless:
+            # Lossless intermediate for later grading or re-encoding
+            return cls(codec="ffv1",
+                       crf=None,
+                       pix_fmt="bgr0",
+                       container="mkv",
+                       lossless=True)
+        return settings
+
+    def validate(self) -> str | None:
+        """Why ffmpeg would reject these settings, or None if it would not."""
+        if self.codec not in CODECS:
+            return f"Unsupported codec {self.codec}"
+        if self.codec not in CONTAINER_CODECS.get(self.container, ()):
+            return f"A {self.container} file cannot hold {self.codec} video"
+        if self.pix_fmt not in CODEC_PIXEL_FORMATS[self.codec]:
+            return (f"{self.codec} cannot encode {self.pix_fmt}; use one of "
+                    f"{', '.join(CODEC_PIXEL_FORMATS[self.codec])}")
+        if self.crf is not None:
+            if self.codec not in MAX_CRF:
+                return f"{self.codec} has no CRF setting"
+            if not 0 <= self.crf <= MAX_CRF[self.codec]:
+                return (f"CRF for {self.codec} must be between 0 and "
+                        f"{MAX_CRF[self.codec]}")
+        return None
+
+    def output_params(self) -> list[str]:
+        params = []
+        if self.codec == "libx265":
+            params += ["-x265-params", "log-level=error"]
+        if self.crf is None:
+            return params
+        params += ["-crf", str(self.crf)]
+        if self.codec == "libvpx-vp9":
+            # Constant quality mode needs the bitrate cap removed
+            params += ["-b:v", "0"]
+        return params
+
+
+def writer_available() -> bool:
+    """Whether videos can be written here (imageio with ffmpeg)."""
+    try:
+        import imageio_ffmpeg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def video_path(output_path: str,
+               prompt: str,
+               fingerprint: str,
+               settings: EncodeSettings | None = None) -> str:
+    """
+    Where a video encoded here is written.
+
+    The name keeps a filesystem-safe start of the prompt for browsing and
+    ends in the request fingerprint, so runs that share a prompt (another
+    seed, another codec) never overwrite each other.
+    """
+    container = settings.container if settings else "mp4"
+    stem = re.sub(r"[^\w\- ]+", "_", prompt[:80]).strip(" _") or "video"
+    return os.path.join(output_path,
+                        f"{stem}_{fingerprint[:12]}.{container}")
+
+
+def backend_video_path(output_path: str, prompt: str) -> str:
+    """Where FastVideo writes the video of ``prompt`` when it saves it."""
+    return os.path.join(output_path, f"{prompt[:100]}.mp4")
+
+
+def _rgb24(frame: Any) -> np.ndarray:
+    if hasattr(frame, "numpy"):
+        frame = frame.detach().cpu().numpy()
+    frame = np.asarray(frame)
+    if frame.dtype != np.uint8:
+        frame = (np.clip(frame, 0, 1) * 255).round().astype(np.uint8)
+    return np.ascontiguousarray(frame[..., :3])
+
+
+def write_video(frames: Any,
+                path: str,
+                fps: float,
+                settings: EncodeSettings | None = None) -> str:
+    """
+    Encode frames with ffmpeg, streaming them one at a time.
+
+    Frames are piped to an ffmpeg process as they come, so an iterator of
+    frames is encoded while it is still being produced and the clip is never
+    copied into one buffer.
+
+    Args:
+        frames: Iterable of HxWxC frames (uint8, or floats in [0, 1]), or a
+            (T, H, W, C) array
+        path: Output file; written under a temporary name and renamed
+        fps: Frames per second
+        settings: Codec, CRF, pixel format and container
+
+    Returns:
+        ``path``
+    """
+    import imageio_ffmpeg
+    settings = settings or EncodeSettings()
+    frames = iter(frames)
+    first = _rgb24(next(frames))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.{settings.container}"
+    writer = imageio_ffmpeg.write_frames(
+        tmp_path,
+        (first.shape[1], first.shape[0]),
+        fps=fps,
+        codec=settings.codec,
+        pix_fmt_out=settings.pix_fmt,
+        quality=5 if settings.crf is None and not settings.lossless else None,
+        # 4:2:0 needs even sizes; never rescale otherwise
+        macro_block_size=2 if "420" in settings.pix_fmt else 1,
+        output_params=settings.output_params())
+    writer.send(None)
+    try:
+        writer.send(first)
+        for frame in frames:
+            writer.send(_rgb24(frame))
+        writer.close()
+    except BaseException:
+        writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return path
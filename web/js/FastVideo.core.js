@@ -471,7 +471,7 @@ app.registerExtension({
     name: "FastVideo.AutoWidgets",
 
     async beforeRegisterNodeDef(nodeType, nodeData, app) {
-        if (nodeData?.name == "VideoGenerator" || nodeData?.name === "InferenceArgs" || nodeData?.name === "VAEConfig" ||
+        if (nodeData?.name == "VideoGenerator" || nodeData?.name === "FastVideoSubmit" || nodeData?.name === "FastVideoBatch" || nodeData?.name === "FastVideoLoader" || nodeData?.name === "FastVideoDecode" || nodeData?.name === "InferenceArgs" || nodeData?.name === "VAEConfig" ||
             nodeData?.name === "TextEncoderConfig" || nodeData?.name === "DITConfig") {
             // Add serialization support
             chainCallback(nodeType.prototype, "onSerialize", function (info) {